@@ -0,0 +1,75 @@
+""" Memory and conversion cost of the NumPy arrays of spotipy.analysis compared with the decoded audio analysis
+
+    Usage::
+
+        python -m benchmarks.audio_analysis --count 50
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from spotipy import analysis
+from tests import fake_server
+
+
+def _size(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=50)
+    args = parser.parse_args()
+
+    fixtures = fake_server.Fixtures("http://localhost/v1/")
+    contents = [
+        json.dumps(fixtures.audio_analysis(fake_server.make_id("track {}".format(i)))).encode()
+        for i in range(args.count)
+    ]
+
+    started_at = time.perf_counter()
+    documents = [json.loads(content) for content in contents]
+    decode_time = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    arrays = [analysis.to_arrays(document) for document in documents]
+    convert_time = time.perf_counter() - started_at
+
+    _, dict_size = _size(lambda: [json.loads(content) for content in contents])
+    _, array_size = _size(lambda: [analysis.to_arrays(json.loads(content)) for content in contents])
+
+    started_at = time.perf_counter()
+    for document in documents:
+        [sum(values) / len(values) for values in zip(*(segment["timbre"] for segment in document["segments"]))]
+    loop_time = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for item in arrays:
+        item.timbre.mean(axis=0)
+    vectorized_time = time.perf_counter() - started_at
+
+    segments = sum(len(item.segments) for item in arrays) / args.count
+    print("segments per analysis: {:.0f}".format(segments))
+    print("bytes per analysis: dicts {:.0f}, arrays {:.0f}".format(dict_size / args.count, array_size / args.count))
+    print(
+        "ms per analysis: decode {:.2f}, convert to arrays {:.2f}".format(
+            decode_time / args.count * 1000, convert_time / args.count * 1000
+        )
+    )
+    print(
+        "ms per mean timbre: python {:.3f}, numpy {:.3f}".format(
+            loop_time / args.count * 1000, vectorized_time / args.count * 1000
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
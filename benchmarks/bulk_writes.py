@@ -0,0 +1,49 @@
+""" Wall time of the bulk playlist writes of spotipy.playlists against the fake server with a simulated latency
+
+    Usage::
+
+        python -m benchmarks.bulk_writes --tracks 10000 --latency 0.05
+"""
+
+import argparse
+import time
+
+import spotipy
+from spotipy import auth
+from spotipy import playlists
+from tests import fake_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    track_ids = [fake_server.make_id("track {}".format(i)) for i in range(args.tracks)]
+    with fake_server.FakeSpotifyServer(latency=args.latency, playlist_size=0) as server:
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        sp.base_api_url = server.api_url
+        playlist_id = fake_server.make_id("bulk writes")
+
+        print("{:>34}{:>10}{:>10}".format("write", "requests", "seconds"))
+        runs = [
+            ("replace_tracks", lambda: playlists.replace_tracks(sp, playlist_id, track_ids)),
+            (
+                "remove_all_occurrences, 1 thread",
+                lambda: playlists.remove_all_occurrences(sp, playlist_id, track_ids, max_concurrency=1),
+            ),
+            ("add_tracks", lambda: playlists.add_tracks(sp, playlist_id, track_ids)),
+            ("remove_all_occurrences", lambda: playlists.remove_all_occurrences(sp, playlist_id, track_ids)),
+        ]
+        for name, run in runs:
+            server.reset_counters()
+            started_at = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started_at
+            print("{:>34}{:>10}{:>10.2f}".format(name, sum(server.requests.values()), elapsed))
+        sp.close()
+
+
+if __name__ == "__main__":
+    main()
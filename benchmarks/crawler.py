@@ -0,0 +1,70 @@
+""" Wall time of crawling the related artists graph with spotipy.crawler compared with a sequential BFS loop,
+    against the fake server with a simulated latency
+
+    Usage::
+
+        python -m benchmarks.crawler --artists 2000 --latency 0.02 --concurrency 16
+"""
+
+import argparse
+import collections
+import os
+import tempfile
+import time
+
+import spotipy
+from spotipy import auth
+from spotipy import crawler
+from spotipy import transport
+from tests import fake_server
+
+
+def _sequential_bfs(sp: spotipy.Spotify, seed: str, path: str) -> int:
+    visited = {seed}
+    queue = collections.deque([seed])
+    with open(path, "w") as file:
+        while queue:
+            artist_id = queue.popleft()
+            for artist in sp.artist_related_artists(artist_id)["artists"]:
+                file.write("{}\t{}\n".format(artist_id, artist["id"]))
+                if artist["id"] not in visited:
+                    visited.add(artist["id"])
+                    queue.append(artist["id"])
+    return len(visited)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artists", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    with fake_server.FakeSpotifyServer(latency=args.latency, artist_count=args.artists) as server:
+        with tempfile.TemporaryDirectory() as directory:
+            sp = spotipy.Spotify(
+                auth.PlainAccessToken("token"),
+                transport=transport.Transport(pool_connections=1, pool_maxsize=args.concurrency),
+            )
+            sp.base_api_url = server.api_url
+            seed = fake_server.make_artist_id(0)
+            print("{:>12}{:>10}{:>10}".format("crawl", "artists", "seconds"))
+
+            started_at = time.perf_counter()
+            count = _sequential_bfs(sp, seed, os.path.join(directory, "sequential.tsv"))
+            print("{:>12}{:>10}{:>10.2f}".format("sequential", count, time.perf_counter() - started_at))
+
+            started_at = time.perf_counter()
+            result = crawler.crawl_related_artists(
+                sp,
+                [seed],
+                os.path.join(directory, "edges.tsv"),
+                checkpoint=os.path.join(directory, "crawl.json"),
+                max_concurrency=args.concurrency,
+            )
+            print("{:>12}{:>10}{:>10.2f}".format("crawler", result.artists, time.perf_counter() - started_at))
+            sp.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+""" Time and throughput of the installed JSON decoders on large response bodies
+
+    Usage::
+
+        python -m benchmarks.decoding --repeat 50
+"""
+
+import argparse
+import json
+import time
+
+from spotipy import decoders
+from tests import fake_server
+
+
+def _payloads() -> dict:
+    fixtures = fake_server.Fixtures("http://localhost/v1/")
+    track_ids = [fake_server.make_id("track {}".format(i)) for i in range(100)]
+    return {
+        "audio analysis": fixtures.audio_analysis(fake_server.make_id("track")),
+        "playlist page of 100": fixtures.playlist_tracks(fake_server.make_id("playlist"), 100, 0),
+        "100 audio features": {"audio_features": [fixtures.audio_features(track_id) for track_id in track_ids]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print("{:>24}{:>10}{:>12}{:>12}{:>12}".format("payload", "decoder", "kB", "ms/decode", "MB/s"))
+    for name, payload in _payloads().items():
+        content = json.dumps(payload, separators=(",", ":")).encode()
+        for decoder_name, loads in sorted(decoders.DECODERS.items()):
+            started_at = time.perf_counter()
+            for _ in range(args.repeat):
+                loads(content)
+            elapsed = (time.perf_counter() - started_at) / args.repeat
+            print(
+                "{:>24}{:>10}{:>12.1f}{:>12.3f}{:>12.1f}".format(
+                    name, decoder_name, len(content) / 1000, elapsed * 1000, len(content) / elapsed / 1000000
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
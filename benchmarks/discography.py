@@ -0,0 +1,48 @@
+""" Requests and wall time of fetching the discography of an artist with spotipy.discography compared with
+    requesting album_tracks for every album, against the fake server with a simulated latency
+
+    Usage::
+
+        python -m benchmarks.discography --latency 0.05
+"""
+
+import argparse
+import time
+
+import spotipy
+from spotipy import auth
+from spotipy import discography
+from tests import fake_server
+
+
+def _album_tracks_per_album(sp: spotipy.Spotify, artist_id: str) -> list:
+    albums = sp.fetch_all(sp.artist_albums, artist_id, list(discography.ALBUM_GROUPS))
+    return [dict(album, tracks=sp.fetch_all(sp.album_tracks, album["id"])) for album in albums]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with fake_server.FakeSpotifyServer(latency=args.latency) as server:
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        sp.base_api_url = server.api_url
+        artist_ids = [fake_server.make_id("discography artist {}".format(i)) for i in range(100)]
+        artist_id = max(artist_ids, key=lambda artist_id: len(server.fixtures.artist_album_ids(artist_id)))
+
+        print("{:>14}{:>8}{:>10}{:>10}".format("fetch", "albums", "requests", "seconds"))
+        for name, fetch in [
+            ("per album", lambda: _album_tracks_per_album(sp, artist_id)),
+            ("discography", lambda: discography.fetch_discography(sp, artist_id, dedupe_titles=False)),
+        ]:
+            server.reset_counters()
+            started_at = time.perf_counter()
+            albums = fetch()
+            elapsed = time.perf_counter() - started_at
+            print("{:>14}{:>8}{:>10}{:>10.2f}".format(name, len(albums), sum(server.requests.values()), elapsed))
+        sp.close()
+
+
+if __name__ == "__main__":
+    main()
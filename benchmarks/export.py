@@ -0,0 +1,86 @@
+""" Peak memory and time of exporting a playlist with spotipy.export compared with building the list in memory
+
+    The fake server runs in another process, so only the memory of the client is measured.
+
+    Usage::
+
+        python -m benchmarks.export --sizes 1000 10000 --gzip
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import tracemalloc
+
+import spotipy
+from spotipy import auth
+from spotipy import export
+from tests import fake_server
+
+
+def _serve(connection, playlist_size: int):
+    server = fake_server.FakeSpotifyServer(playlist_size=playlist_size)
+    connection.send(server.url)
+    server.serve_forever()
+
+
+def _dump_list(sp: spotipy.Spotify, playlist_id: str, path: str) -> int:
+    items = sp.fetch_all(sp.playlist_tracks, playlist_id)
+    with open(path, "w") as file:
+        for item in items:
+            file.write(json.dumps(item) + "\n")
+    return len(items)
+
+
+def _measure(function, *args) -> tuple:
+    """ Returns the seconds and the peak bytes function takes
+    """
+    gc.collect()
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+
+    print("{:>10}{:>18}{:>18}{:>14}{:>14}".format("tracks", "list peak KB", "export peak KB", "list s", "export s"))
+    for size in args.sizes:
+        parent_connection, child_connection = multiprocessing.Pipe()
+        server = multiprocessing.Process(target=_serve, args=(child_connection, size), daemon=True)
+        server.start()
+        try:
+            sp = spotipy.Spotify(auth.PlainAccessToken("benchmark"))
+            sp.base_api_url = parent_connection.recv() + "v1/"
+            playlist_id = fake_server.make_id("playlist")
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "tracks.jsonl" + (".gz" if args.gzip else ""))
+                # the server builds and caches its fixtures on the first export
+                export.export_playlist_tracks(sp, playlist_id, path)
+                list_time, list_peak = _measure(_dump_list, sp, playlist_id, os.path.join(directory, "list.jsonl"))
+                export_time, export_peak = _measure(
+                    export.export_playlist_tracks, sp, playlist_id, path, None, None, None, args.max_concurrency
+                )
+        finally:
+            server.terminate()
+        print(
+            "{:>10}{:>18.0f}{:>18.0f}{:>14.2f}{:>14.2f}".format(
+                size, list_peak / 1024, export_peak / 1024, list_time, export_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
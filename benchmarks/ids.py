@@ -0,0 +1,72 @@
+""" Memory of a set of Spotify IDs as strings compared with spotipy.ids.IdSet, and the cost of the bulk functions
+
+    Usage::
+
+        python -m benchmarks.ids --count 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from spotipy import ids
+from tests import fake_server
+
+
+def _size(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, size
+
+
+def _time(function, *args) -> float:
+    gc.collect()
+    started_at = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+
+    track_ids = [fake_server.make_id("track {}".format(i)) for i in range(args.count)]
+    uris = ["spotify:track:{}".format(track_id) for track_id in track_ids]
+
+    # numpy is imported before measuring
+    ids.IdSet(track_ids[:1])
+    # the strings are copies, as if they were decoded from responses
+    _, set_size = _size(lambda: {"".join(track_id) for track_id in track_ids})
+    id_set, id_set_size = _size(lambda: ids.IdSet(track_ids))
+    print("bytes per id: set of str {:.1f}, IdSet {:.1f}".format(set_size / args.count, id_set_size / args.count))
+
+    lookups = track_ids[: min(args.count, 100000)]
+    lookup_time = _time(lambda: [track_id in id_set for track_id in lookups])
+    print("us per IdSet lookup: {:.2f}".format(lookup_time / len(lookups) * 1000000))
+
+    columns = ("", "normalize", "validate", "encode", "decode")
+    print("{:>8}{:>14}{:>14}{:>14}{:>14}".format(*columns))
+    numpy = ids._numpy()
+    for name in ("python", "numpy"):
+        if name == "numpy" and numpy is None:
+            break
+        # the pure python path is what runs without numpy
+        ids._numpy = (lambda: None) if name == "python" else (lambda: numpy)
+        encoded = ids.encode_ids(track_ids)
+        timings = (
+            _time(ids.normalize_ids, uris, "track", False),
+            _time(ids.find_invalid_ids, track_ids),
+            _time(ids.encode_ids, track_ids),
+            _time(ids.decode_ids, encoded),
+        )
+        print("{:>8}".format(name) + "".join("{:>14.3f}".format(t / args.count * 1000000) for t in timings))
+    print("(us per id)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+""" Requests and wall time of resyncing a library with spotipy.library.LibraryMirror compared with reading it all,
+    against the fake server with a simulated latency
+
+    Usage::
+
+        python -m benchmarks.library_mirror --size 5000 --latency 0.05 --new 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import spotipy
+from spotipy import auth
+from spotipy import library
+from tests import fake_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--new", type=int, default=10, help="the number of tracks saved before the resync")
+    parser.add_argument("--check-removals", type=int, default=50)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    with fake_server.FakeSpotifyServer(latency=args.latency, library_size=args.size) as server, directory:
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        sp.base_api_url = server.api_url
+        mirror = library.LibraryMirror(os.path.join(directory.name, "library.db"))
+        mirror.sync_kind(sp, "user", "track")
+        server.save_items("track", [fake_server.make_id("new {}".format(i)) for i in range(args.new)])
+
+        print("{:>12}{:>10}{:>10}".format("sync", "requests", "seconds"))
+        for name, resync in [
+            ("full", lambda: sp.fetch_all(sp.current_user_saved_tracks)),
+            ("mirror", lambda: mirror.sync_kind(sp, "user", "track", args.check_removals)),
+        ]:
+            server.reset_counters()
+            started_at = time.perf_counter()
+            resync()
+            elapsed = time.perf_counter() - started_at
+            print("{:>12}{:>10}{:>10.2f}".format(name, sum(server.requests.values()), elapsed))
+        mirror.close()
+        sp.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+""" Memory per object and construction cost of the models in spotipy.models compared with the raw dicts
+
+    Usage::
+
+        python -m benchmarks.models --count 20000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from spotipy import models
+from tests import fake_server
+
+
+def _documents(count: int) -> dict:
+    fixtures = fake_server.Fixtures("http://localhost/v1/")
+    ids = [fake_server.make_id("item {}".format(i)) for i in range(count)]
+    return {
+        "Track": (models.Track, [fixtures.track(item_id) for item_id in ids]),
+        "PlaylistTrack": (models.PlaylistTrack, [fixtures.playlist_track(item_id) for item_id in ids]),
+        "Album": (models.Album, [fixtures.simplified_album(item_id) for item_id in ids]),
+        "Artist": (models.Artist, [fixtures.artist(item_id) for item_id in ids]),
+        "AudioFeatures": (models.AudioFeatures, [fixtures.audio_features(item_id) for item_id in ids]),
+    }
+
+
+def _size(build) -> tuple:
+    """ Returns the objects built and the bytes they hold
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, size
+
+
+def _time(function, *args) -> float:
+    gc.collect()
+    started_at = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    columns = ("object", "dict bytes", "model bytes", "decode us", "build us", "nested access us")
+    print("{:>14}{:>14}{:>14}{:>14}{:>14}{:>18}".format(*columns))
+    for name, (model, documents) in _documents(args.count).items():
+        # the dicts as decoded from a response, each one its own copy
+        content = json.dumps(documents).encode()
+        _, dict_size = _size(lambda: json.loads(content))
+        # the decoded dicts are freed once the models are built, only what the models keep is counted
+        built, model_size = _size(lambda: model.from_dicts(json.loads(content)))
+
+        decode_time = _time(json.loads, content)
+        build_time = _time(model.from_dicts, json.loads(content))
+        access_time = 0
+        if model._lazy:
+            access_time = _time(lambda: [getattr(item, model._lazy[-1]) for item in built])
+
+        print(
+            "{:>14}{:>14.0f}{:>14.0f}{:>14.2f}{:>14.2f}{:>18.2f}".format(
+                name,
+                dict_size / args.count,
+                model_size / args.count,
+                decode_time / args.count * 1000000,
+                build_time / args.count * 1000000,
+                access_time / args.count * 1000000,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
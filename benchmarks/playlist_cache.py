@@ -0,0 +1,41 @@
+""" Requests and wall time of re-reading an unchanged playlist with and without the playlist_cache of Spotify,
+    against the fake server with a simulated latency
+
+    Usage::
+
+        python -m benchmarks.playlist_cache --tracks 10000 --latency 0.05
+"""
+
+import argparse
+import time
+
+import spotipy
+from spotipy import auth
+from spotipy import cache
+from tests import fake_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--cycles", type=int, default=3)
+    args = parser.parse_args()
+
+    with fake_server.FakeSpotifyServer(latency=args.latency, playlist_size=args.tracks) as server:
+        playlist_id = fake_server.make_id("cached playlist")
+        print("{:>12}{:>8}{:>10}{:>10}".format("cache", "cycle", "requests", "seconds"))
+        for name, playlist_cache in [("none", None), ("memory", cache.MemoryCache())]:
+            sp = spotipy.Spotify(auth.PlainAccessToken("token"), playlist_cache=playlist_cache)
+            sp.base_api_url = server.api_url
+            for cycle in range(args.cycles):
+                server.reset_counters()
+                started_at = time.perf_counter()
+                sp.playlist_all_tracks(playlist_id)
+                elapsed = time.perf_counter() - started_at
+                print("{:>12}{:>8}{:>10}{:>10.2f}".format(name, cycle, sum(server.requests.values()), elapsed))
+            sp.close()
+
+
+if __name__ == "__main__":
+    main()
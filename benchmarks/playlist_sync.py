@@ -0,0 +1,57 @@
+""" Write requests and planning time of spotipy.playlists.plan_sync compared with rewriting the playlist
+
+    Usage::
+
+        python -m benchmarks.playlist_sync --sizes 1000 10000
+"""
+
+import argparse
+import random
+import time
+
+from spotipy import playlists
+from tests import fake_server
+
+
+def _edits(tracks: list, rng: random.Random) -> dict:
+    def new(i):
+        return "spotify:track:{}".format(fake_server.make_id("new {}".format(i)))
+
+    small = list(tracks)
+    del small[len(small) // 2 : len(small) // 2 + 3]
+    small.insert(5, new(0))
+    small.insert(0, small.pop(len(small) - 10))
+
+    moved = list(tracks)
+    for i in range(len(moved) // 100):
+        moved.insert(rng.randrange(len(moved)), moved.pop(rng.randrange(len(moved))))
+
+    shuffled = list(tracks)
+    rng.shuffle(shuffled)
+    return {
+        "3 removed, 1 added, 1 moved": small,
+        "50 appended": tracks + [new(i) for i in range(50)],
+        "1% moved": moved,
+        "shuffled": shuffled,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print("{:>8}{:>30}{:>16}{:>16}{:>12}".format("tracks", "edit", "rewrite calls", "plan calls", "plan ms"))
+    for size in args.sizes:
+        tracks = ["spotify:track:{}".format(fake_server.make_id("track {}".format(i))) for i in range(size)]
+        for name, desired in _edits(tracks, rng).items():
+            rewrite_calls = max(1, -(-len(desired) // playlists.MAX_TRACKS_PER_REQUEST))
+            started_at = time.perf_counter()
+            operations = playlists.plan_sync(tracks, desired)
+            elapsed = time.perf_counter() - started_at
+            print("{:>8}{:>30}{:>16}{:>16}{:>12.1f}".format(size, name, rewrite_calls, len(operations), elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+""" Payload size, decode time and validation cost of a page of playlist tracks with a fields projection
+
+    Usage::
+
+        python -m benchmarks.projection --pages 50
+"""
+
+import argparse
+import json
+import time
+
+from spotipy import decoders
+from spotipy import models
+from spotipy import projection
+from tests import fake_server
+
+PROJECTIONS = {
+    "full page": None,
+    "PlaylistTrack model": projection.Projection.page(models.PlaylistTrack),
+    "ids and added_at": projection.Projection.page(["added_at", "track.id"]),
+}
+
+
+def _time(function, contents: list) -> float:
+    started_at = time.perf_counter()
+    for content in contents:
+        function(content)
+    return (time.perf_counter() - started_at) / len(contents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    fixtures = fake_server.Fixtures("http://localhost/v1/", playlist_size=100)
+    pages = [fixtures.playlist_tracks(fake_server.make_id("playlist {}".format(i)), 100, 0) for i in range(args.pages)]
+    loads = decoders.get_decoder()
+
+    print("{:>22}{:>14}{:>14}{:>14}".format("", "KB per page", "decode ms", "validate ms"))
+    for name, fields in PROJECTIONS.items():
+        if fields is not None:
+            # the filter the API applies
+            tree = fake_server._parse_fields(fields.expression)
+            contents = [json.dumps(fake_server._apply_fields(page, tree)).encode() for page in pages]
+        else:
+            contents = [json.dumps(page).encode() for page in pages]
+        size = sum(len(content) for content in contents) / len(contents)
+        decode_time = _time(loads, contents)
+        validate_time = _time(fields.validate, [loads(content) for content in contents]) if fields is not None else 0
+        print("{:>22}{:>14.1f}{:>14.3f}{:>14.3f}".format(name, size / 1024, decode_time * 1000, validate_time * 1000))
+
+
+if __name__ == "__main__":
+    main()
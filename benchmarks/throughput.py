@@ -0,0 +1,114 @@
+""" End to end throughput of spotipy.Spotify against the local fake Spotify Web API server
+
+    Reports requests per second, client CPU time per call and latency percentiles for each concurrency level.
+    The server runs in its own process so the CPU time measured is the client's only.
+
+    Usage::
+
+        python -m benchmarks.throughput --calls 2000 --concurrency 1 4 16 64 --latency 0.02
+"""
+
+import argparse
+import multiprocessing
+import time
+from concurrent import futures
+
+import spotipy
+from spotipy import auth
+from spotipy import transport
+from tests import fake_server
+
+SCENARIOS = ("track", "tracks", "audio_features", "playlist_tracks")
+
+
+def _serve(connection, latency: float, jitter: float):
+    server = fake_server.FakeSpotifyServer(latency=latency, jitter=jitter)
+    connection.send(server.url)
+    server.serve_forever()
+
+
+def _percentile(sorted_values: list, percent: float) -> float:
+    index = min(int(round(len(sorted_values) * percent / 100)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _make_call(sp: spotipy.Spotify, scenario: str):
+    if scenario == "track":
+        return lambda i: sp.track(fake_server.make_id("track {}".format(i)))
+    if scenario == "tracks":
+        return lambda i: sp.tracks([fake_server.make_id("track {} {}".format(i, j)) for j in range(50)])
+    if scenario == "audio_features":
+        return lambda i: sp.tracks_audio_feature([fake_server.make_id("track {} {}".format(i, j)) for j in range(100)])
+    if scenario == "playlist_tracks":
+        return lambda i: sp.playlist_tracks(fake_server.make_id("playlist"), limit=100, offset=i % 3 * 100)
+    raise ValueError("unknown scenario {}".format(scenario))
+
+
+def run(api_url: str, scenario: str, calls: int, concurrency: int) -> dict:
+    """ Sends calls requests of the scenario from concurrency threads and returns the measurements
+    """
+    sp = spotipy.Spotify(
+        auth.PlainAccessToken("benchmark"), transport=transport.Transport(pool_connections=1, pool_maxsize=concurrency),
+    )
+    sp.base_api_url = api_url
+    call = _make_call(sp, scenario)
+
+    def timed_call(i):
+        started_at = time.perf_counter()
+        call(i)
+        return time.perf_counter() - started_at
+
+    with futures.ThreadPoolExecutor(concurrency) as executor:
+        # open the connections before measuring
+        list(executor.map(timed_call, range(concurrency)))
+
+        cpu_started_at = time.process_time()
+        started_at = time.perf_counter()
+        latencies = sorted(executor.map(timed_call, range(calls)))
+        elapsed = time.perf_counter() - started_at
+        cpu = time.process_time() - cpu_started_at
+
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "calls": calls,
+        "calls_per_second": calls / elapsed,
+        "cpu_ms_per_call": cpu / calls * 1000,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "connections": sp.transport.pool_stats().created,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS, nargs="+", default=["track"])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds the server waits before answering")
+    parser.add_argument("--jitter", type=float, default=0, help="additional random latency of the server, seconds")
+    args = parser.parse_args()
+
+    parent_connection, child_connection = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(child_connection, args.latency, args.jitter), daemon=True)
+    server.start()
+    api_url = parent_connection.recv() + "v1/"
+
+    columns = ("scenario", "concurrency", "calls/s", "cpu ms/call", "p50 ms", "p95 ms", "p99 ms", "max ms", "conns")
+    print(("{:>16}" + "{:>12}" * (len(columns) - 1)).format(*columns))
+    try:
+        for scenario in args.scenario:
+            for concurrency in args.concurrency:
+                result = run(api_url, scenario, args.calls, concurrency)
+                print(
+                    "{scenario:>16}{concurrency:>12}{calls_per_second:>12.1f}{cpu_ms_per_call:>12.3f}{p50_ms:>12.2f}"
+                    "{p95_ms:>12.2f}{p99_ms:>12.2f}{max_ms:>12.2f}{connections:>12}".format(**result)
+                )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import sys
 import spotipy
+import spotipy.discography
 
 """ shows the albums and tracks for a given artist.
 """
@@ -14,34 +15,15 @@ def get_artist(name):
         return None
 
 
-def show_album_tracks(album):
-    tracks = []
-    results = sp.album_tracks(album["id"])
-    tracks.extend(results["items"])
-    while results["next"]:
-        results = sp.next(results)
-        tracks.extend(results["items"])
-    for track in tracks:
-        print("  ", track["name"])
-        print()
-        print(track)
-
-
-def show_artist_albums(id):
-    albums = []
-    results = sp.artist_albums(artist["id"], "album")
-    albums.extend(results["items"])
-    while results["next"]:
-        results = sp.next(results)
-        albums.extend(results["items"])
+def show_artist_albums(artist):
+    albums = spotipy.discography.fetch_discography(sp, artist["id"], include_groups=["album"])
     print("Total albums:", len(albums))
-    unique = set()  # skip duplicate albums
     for album in albums:
-        name = album["name"].lower()
-        if name not in unique:
-            print(name)
-            unique.add(name)
-            show_album_tracks(album)
+        print(album["name"].lower())
+        for track in album["tracks"]["items"]:
+            print("  ", track["name"])
+            print()
+            print(track)
 
 
 def show_artist(artist):
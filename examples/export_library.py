@@ -0,0 +1,20 @@
+import sys
+
+import spotipy
+import spotipy.auth
+import spotipy.export
+import spotipy.ids
+
+""" exports the saved tracks and albums of a user to gzipped JSON Lines files, in constant memory.
+"""
+
+if len(sys.argv) < 2:
+    print("Usage: {} cache_path [playlist_id ...]".format(sys.argv[0]))
+    sys.exit()
+
+sp = spotipy.Spotify(spotipy.auth.AuthorizationCode.load(sys.argv[1]))
+print("saved tracks:", spotipy.export.export_saved_tracks(sp, "saved_tracks.jsonl.gz"))
+print("saved albums:", spotipy.export.export_saved_albums(sp, "saved_albums.jsonl.gz"))
+for playlist_id in sys.argv[2:]:
+    path = "playlist_{}.jsonl.gz".format(spotipy.ids.to_id("playlist", playlist_id))
+    print(playlist_id, spotipy.export.export_playlist_tracks(sp, playlist_id, path))
@@ -8,6 +8,7 @@ setup(
     author_email="paul@echonest.com",
     url="http://spotipy.readthedocs.org/",
     install_requires=["requests>=2.22.0"],
+    extras_require={"async": ["aiohttp>=3.6"], "orjson": ["orjson>=3"], "numpy": ["numpy>=1.16"]},
     license="LICENSE.txt",
     packages=["spotipy"],
 )
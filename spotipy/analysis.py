@@ -0,0 +1,175 @@
+import collections
+import itertools
+import operator
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+""" Compact NumPy arrays of an audio analysis
+
+    Example usage::
+
+        import spotipy.analysis
+        arrays = spotipy.analysis.to_arrays(sp.track_audio_analysis(track_id))
+        loudest = arrays.segments["loudness_max"].argmax()
+        mean_timbre = arrays.timbre.mean(axis=0)
+"""
+
+
+class AudioFeaturesTable(collections.namedtuple("AudioFeaturesTable", ["ids", "matrix", "missing"])):
+    """ The audio features of many tracks as columns
+
+        - ids - the track ids, an array of strings
+        - matrix - a float32 array of shape (len(ids), len(AUDIO_FEATURE_COLUMNS)), the rows of missing tracks are NaN
+        - missing - a boolean array, true for the tracks that have no audio features
+    """
+
+    __slots__ = ()
+
+    def column(self, name: str) -> "np.ndarray":
+        """ Returns the column of a feature, e.g. table.column("tempo")
+        """
+        return self.matrix[:, AUDIO_FEATURE_COLUMNS.index(name)]
+
+
+AudioAnalysisArrays = collections.namedtuple(
+    "AudioAnalysisArrays", ["track", "bars", "beats", "tatums", "sections", "segments", "pitches", "timbre"]
+)
+AudioAnalysisArrays.__doc__ = """ An audio analysis as NumPy arrays
+
+    - track - a dict of the track level fields, without the fingerprint strings
+    - bars, beats, tatums - structured arrays of INTERVAL_FIELDS
+    - sections - a structured array of SECTION_FIELDS, missing floats are NaN and missing integers -1
+    - segments - a structured array of SEGMENT_FIELDS
+    - pitches, timbre - float32 arrays of shape (number of segments, 12)
+"""
+
+INTERVAL_FIELDS = (("start", "f8"), ("duration", "f4"), ("confidence", "f4"))
+SECTION_FIELDS = INTERVAL_FIELDS + (
+    ("loudness", "f4"),
+    ("tempo", "f4"),
+    ("tempo_confidence", "f4"),
+    ("key", "i1"),
+    ("key_confidence", "f4"),
+    ("mode", "i1"),
+    ("mode_confidence", "f4"),
+    ("time_signature", "i1"),
+    ("time_signature_confidence", "f4"),
+)
+SEGMENT_FIELDS = INTERVAL_FIELDS + (
+    ("loudness_start", "f4"),
+    ("loudness_max", "f4"),
+    ("loudness_max_time", "f4"),
+    ("loudness_end", "f4"),
+)
+
+AUDIO_FEATURE_COLUMNS = (
+    "danceability",
+    "energy",
+    "key",
+    "loudness",
+    "mode",
+    "speechiness",
+    "acousticness",
+    "instrumentalness",
+    "liveness",
+    "valence",
+    "tempo",
+    "duration_ms",
+    "time_signature",
+)
+
+# the echo nest fingerprints of the track, large strings that are rarely used
+_TRACK_STRINGS = ("codestring", "echoprintstring", "synchstring", "rhythmstring")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for audio analysis arrays, install it with pip install spotipy[numpy]")
+
+
+def _matrix(items: Sequence[dict], key: str, width: int) -> "np.ndarray":
+    """ Returns the lists items[i][key] as a float32 array of shape (len(items), width), the longer lists are truncated
+        and the shorter or missing ones are padded with NaN
+    """
+    rows = [item.get(key) or () for item in items]
+    if all(len(row) == width for row in rows):
+        values = np.fromiter(itertools.chain.from_iterable(rows), np.float32, len(items) * width)
+        return values.reshape(len(items), width)
+
+    matrix = np.full((len(items), width), np.nan, np.float32)
+    for i, row in enumerate(rows):
+        row = row[:width]
+        matrix[i, : len(row)] = row
+    return matrix
+
+
+def _columns(items: Sequence[dict], names: Sequence[str]) -> "np.ndarray":
+    """ Returns the fields of the items as a float64 array of shape (len(items), len(names)), missing fields are NaN
+    """
+    getter = operator.itemgetter(*names)
+    try:
+        values = np.fromiter(itertools.chain.from_iterable(map(getter, items)), np.float64, len(items) * len(names))
+    except (KeyError, TypeError):
+        # some items miss a field or have a null one
+        values = np.array([[item.get(name) for name in names] for item in items], np.float64)
+    return values.reshape(len(items), len(names))
+
+
+def _structured(items: Sequence[dict], fields: tuple) -> "np.ndarray":
+    names = [name for name, _ in fields]
+    columns = _columns(items, names)
+    result = np.empty(len(items), np.dtype(list(fields)))
+    for i, name in enumerate(names):
+        column = columns[:, i]
+        if result.dtype[name].kind == "i":
+            # NaN has no integer value, the missing integers are -1 like the key of a section without one
+            column = np.where(np.isnan(column), -1, column)
+        result[name] = column
+    return result
+
+
+def to_arrays(analysis: dict) -> AudioAnalysisArrays:
+    """ Converts the result of Spotify.track_audio_analysis to NumPy arrays
+
+        Parameters:
+            - analysis - the audio analysis dict
+    """
+    _require_numpy()
+    segments = analysis.get("segments") or []
+    track = {key: value for key, value in (analysis.get("track") or {}).items() if key not in _TRACK_STRINGS}
+    return AudioAnalysisArrays(
+        track=track,
+        bars=_structured(analysis.get("bars") or [], INTERVAL_FIELDS),
+        beats=_structured(analysis.get("beats") or [], INTERVAL_FIELDS),
+        tatums=_structured(analysis.get("tatums") or [], INTERVAL_FIELDS),
+        sections=_structured(analysis.get("sections") or [], SECTION_FIELDS),
+        segments=_structured(segments, SEGMENT_FIELDS),
+        pitches=_matrix(segments, "pitches", 12),
+        timbre=_matrix(segments, "timbre", 12),
+    )
+
+
+def nbytes(arrays: AudioAnalysisArrays) -> int:
+    """ Returns the number of bytes held by the arrays of an analysis
+    """
+    return sum(getattr(arrays, name).nbytes for name in AudioAnalysisArrays._fields if name != "track")
+
+
+def audio_features_table(track_ids: Sequence[str], audio_features: Sequence[dict]) -> AudioFeaturesTable:
+    """ Converts the result of Spotify.tracks_audio_feature to an AudioFeaturesTable
+
+        Parameters:
+            - track_ids - the ids of the tracks, in the order of audio_features
+            - audio_features - the audio features of the tracks, None for the missing ones
+    """
+    _require_numpy()
+    missing = np.equal(np.array(audio_features, object), None)
+    matrix = np.full((len(audio_features), len(AUDIO_FEATURE_COLUMNS)), np.nan, np.float32)
+    present = [features for features in audio_features if features is not None]
+    if present:
+        matrix[~missing] = _columns(present, AUDIO_FEATURE_COLUMNS)
+    return AudioFeaturesTable(np.array(track_ids, str), matrix, missing)
@@ -0,0 +1,239 @@
+import asyncio
+import base64
+import json
+import logging
+import time
+from http import HTTPStatus
+
+import aiohttp
+
+from spotipy import auth
+from spotipy import exceptions
+
+_logger = logging.getLogger(__name__)
+
+
+async def request_token(
+    payload: dict, client_id: str, client_secret: str, session: aiohttp.ClientSession = None
+) -> dict:
+    auth_header = base64.b64encode("{}:{}".format(client_id, client_secret).encode("ascii"))
+    headers = {"Authorization": "Basic {}".format(auth_header.decode("ascii"))}
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await request_token(payload, client_id, client_secret, session)
+
+    async with session.post(auth.TOKEN_URL, data=payload, headers=headers) as response:
+        content = await response.read()
+        if response.status != HTTPStatus.OK:
+            error_message = ""
+            if content:
+                error = json.loads(content)
+                error_message = "{}. description: {}".format(error["error"], error["error_description"])
+            raise exceptions.AuthorizationError(response.status, error_message)
+        return json.loads(content)
+
+
+class AsyncSpotifyAuthProvider:
+    async def make_authorization_headers(self) -> dict:
+        raise NotImplementedError
+
+    @property
+    def access_token(self):
+        raise NotImplementedError
+
+    @property
+    def cache_scope(self) -> str:
+        """ Identifies whose data the tokens of this provider can access, cached responses are kept per scope
+        """
+        return "provider:{}".format(id(self))
+
+
+class AsyncPlainAccessToken(AsyncSpotifyAuthProvider):
+    def __init__(self, access_token: str):
+        self._access_token = access_token
+        self._headers = {"Authorization": "Bearer {}".format(access_token)}
+
+    async def make_authorization_headers(self) -> dict:
+        return self._headers
+
+    @property
+    def access_token(self):
+        return self._access_token
+
+
+class _AsyncRefreshingAuthProvider(AsyncSpotifyAuthProvider):
+    """
+    Base class of the async providers that request their access token from the token endpoint.
+
+    Only one coroutine requests a new token at a time, the others wait for it and use the same token.
+    With refresh_ahead, the token is refreshed by a background task that many seconds before it expires.
+    The returned headers dict is shared between calls and must not be mutated.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession = None, refresh_ahead: int = None):
+        self._session = session
+        self.refresh_ahead = refresh_ahead
+        # (access token, expires at, headers), replaced as a whole so a reader never mixes two tokens
+        self._token = None
+        self._refresh_lock = None
+        self._refresh_handle = None
+
+    @property
+    def access_token(self):
+        return self._token[0] if self._token is not None else None
+
+    async def make_authorization_headers(self) -> dict:
+        token = self._token
+        if token is None or auth.is_token_expired(token[1]):
+            async with self._get_refresh_lock():
+                # another coroutine might have refreshed the token while we waited for the lock
+                if self._token is None or auth.is_token_expired(self._token[1]):
+                    await self._refresh()
+                token = self._token
+
+        return token[2]
+
+    def close(self):
+        """ Stops refreshing the token in the background
+        """
+        if self._refresh_handle is not None:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
+
+    def _get_refresh_lock(self) -> asyncio.Lock:
+        # created on first use, the lock must be created while the event loop which uses it is running
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        return self._refresh_lock
+
+    async def _request_access_token(self):
+        """ Requests a new access token and returns it with the time it expires at
+        """
+        raise NotImplementedError
+
+    async def _refresh(self):
+        self._set_access_token(*await self._request_access_token())
+
+    def _set_access_token(self, access_token: str, expires_at: int):
+        self._token = (access_token, expires_at, {"Authorization": "Bearer {}".format(access_token)})
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if not self.refresh_ahead:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # not called from a coroutine, the token is refreshed on the first request after it expires
+            return
+        self.close()
+        time_left = self._token[1] - time.time()
+        # never refresh more often than every half of the token's lifetime
+        delay = max(time_left - self.refresh_ahead, time_left / 2, 0)
+        self._refresh_handle = loop.call_later(delay, lambda: loop.create_task(self._refresh_in_background()))
+
+    async def _refresh_in_background(self):
+        try:
+            async with self._get_refresh_lock():
+                await self._refresh()
+        except Exception:
+            _logger.exception("failed to refresh the access token in the background")
+
+
+class AsyncClientCredentials(_AsyncRefreshingAuthProvider):
+    def __init__(
+        self, client_id: str, client_secret: str, session: aiohttp.ClientSession = None, refresh_ahead: int = None
+    ):
+        """
+        The asyncio version of spotipy.auth.ClientCredentials
+
+            Parameters:
+                 - client_id - the client id of your app
+                 - client_secret - the client secret of your app
+                 - session - an aiohttp.ClientSession to request the token with
+                 - refresh_ahead - if set, refresh the token in the background this many seconds before it expires
+        """
+        super().__init__(session, refresh_ahead)
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+    @property
+    def cache_scope(self) -> str:
+        return "client:{}".format(self.client_id)
+
+    async def _request_access_token(self):
+        payload = {"grant_type": "client_credentials"}
+        now = int(time.time())
+        token_info = await request_token(payload, self.client_id, self.client_secret, self._session)
+        return token_info["access_token"], now + token_info["expires_in"]
+
+
+class AsyncAuthorizationCode(_AsyncRefreshingAuthProvider):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        refresh_token: str,
+        access_token: str = None,
+        access_token_expires_at: int = None,
+        persist_file_path=None,
+        session: aiohttp.ClientSession = None,
+        refresh_ahead: int = None,
+    ):
+        """
+        The asyncio version of spotipy.auth.AuthorizationCode
+
+            Parameters:
+                 - client_id - the client id of your app
+                 - client_secret - the client secret of your app
+                 - refresh_token - the refresh token of the user
+                 - access_token - optional current access token
+                 - access_token_expires_at - when the access token expires, required with access_token
+                 - persist_file_path - path to location to save tokens
+                 - session - an aiohttp.ClientSession to request the token with
+                 - refresh_ahead - if set, refresh the token in the background this many seconds before it expires
+        """
+        super().__init__(session, refresh_ahead)
+        if (access_token is not None) != (access_token_expires_at is not None):
+            raise ValueError("when supplying access_token, access_token_expires_at must be supplied as well")
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._refresh_token = refresh_token
+        self._persist_file_path = persist_file_path
+        if access_token is not None:
+            self._set_access_token(access_token, access_token_expires_at)
+
+    @property
+    def cache_scope(self) -> str:
+        return auth._user_cache_scope(self._client_id, self._refresh_token)
+
+    def save(self):
+        data = {
+            "client_id": self._client_id,
+            "client_secret": self._client_secret,
+            "refresh_token": self._refresh_token,
+        }
+        with open(self._persist_file_path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, persist_file_path: str, session: aiohttp.ClientSession = None, refresh_ahead: int = None):
+        with open(persist_file_path) as f:
+            data = json.load(f)
+
+        return cls(
+            data["client_id"],
+            data["client_secret"],
+            data["refresh_token"],
+            persist_file_path=persist_file_path,
+            session=session,
+            refresh_ahead=refresh_ahead,
+        )
+
+    async def _request_access_token(self):
+        payload = {"refresh_token": self._refresh_token, "grant_type": "refresh_token"}
+        now = int(time.time())
+        token_info = await request_token(payload, self._client_id, self._client_secret, self._session)
+        if self._persist_file_path:
+            self.save()
+        return token_info["access_token"], token_info["expires_in"] + now
@@ -0,0 +1,337 @@
+import asyncio
+import collections
+import inspect
+import itertools
+import threading
+from http import HTTPStatus
+from typing import AsyncIterator
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+import aiohttp
+
+from spotipy import cache
+from spotipy import client
+from spotipy import decoders
+from spotipy import metrics
+from spotipy import projection
+from spotipy import rate_limit
+from spotipy.client import _assert_ids_length
+from spotipy.client import _get_id
+
+""" An asyncio version of the Spotify client
+"""
+
+_RETRY_AFTER_STATUS_CODES = (
+    HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+)
+
+
+class AsyncSpotify(client.Spotify):
+    """
+        The asyncio version of spotipy.Spotify, every public method of Spotify is a coroutine.
+
+        Example usage::
+
+            import spotipy.async_auth
+            import spotipy.async_client
+
+            auth_provider = spotipy.async_auth.AsyncClientCredentials(client_id, client_secret)
+            async with spotipy.async_client.AsyncSpotify(auth_provider) as sp:
+                artist = await sp.artist("spotify:artist:3jOstUTkEu2JkjvRdBA5Gu")
+    """
+
+    def __init__(
+        self,
+        auth_provider,
+        session: aiohttp.ClientSession = None,
+        default_timeout: Union[int, float] = None,
+        max_concurrency: int = 100,
+        etag_cache: cache.ETagCache = None,
+        catalog_cache: cache.CacheBackend = None,
+        cache_ttls: dict = None,
+        rate_limiter: rate_limit.RateLimiter = None,
+        hooks: Sequence[metrics.RequestHook] = None,
+        json_decoder: Union[str, Callable[[bytes], object]] = None,
+        playlist_cache: cache.CacheBackend = None,
+    ):
+        """
+        Create an AsyncSpotify API object.
+
+        :param auth_provider:
+            AsyncSpotifyAuthProvider or SpotifyAuthProvider object to use to authenticate
+        :param session:
+            An aiohttp.ClientSession to send the requests with, created on first use if not supplied.
+        :param default_timeout:
+            Stop waiting for a response after a given number of seconds
+        :param max_concurrency:
+            The maximum number of requests in flight at the same time
+        :param etag_cache:
+            ETagCache object to revalidate GET responses with If-None-Match
+        :param catalog_cache:
+            CacheBackend object to cache tracks, albums, artists, audio features and audio analysis in
+        :param cache_ttls:
+            Time to live in seconds of the cached items per endpoint, overrides DEFAULT_CACHE_TTLS
+        :param rate_limiter:
+            RateLimiter object to pace the requests with, a 429 response pauses all the requests for its Retry-After
+        :param hooks:
+            RequestHook objects to call before every request and after every response
+        :param json_decoder:
+            'orjson', 'ujson', 'json' or a function that decodes the response bodies from bytes
+        :param playlist_cache:
+            CacheBackend object to cache the tracks read by playlist_all_tracks in, keyed by the playlist's snapshot id
+        """
+        self.auth_provider = auth_provider
+        self.timeout = default_timeout
+        self.max_concurrency = max_concurrency
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+        self._coalescer = None
+        self.etag_cache = etag_cache
+        self.catalog_cache = catalog_cache
+        self.playlist_cache = playlist_cache
+        self._playlist_cache_lock = threading.Lock()
+        self.rate_limiter = rate_limiter
+        self.cache_ttls = dict(client.DEFAULT_CACHE_TTLS, **(cache_ttls or {}))
+        self.hooks = list(hooks or [])
+        self.json_loads = decoders.get_decoder(json_decoder)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """ Closes the underlying aiohttp session if it was created by this object
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_concurrency))
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # created lazily so it's bound to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _make_authorization_headers(self) -> dict:
+        headers = self.auth_provider.make_authorization_headers()
+        if inspect.isawaitable(headers):
+            headers = await headers
+        return headers
+
+    async def _internal_call(self, method: str, url: str, params: dict = None, payload: dict = None):
+        url, params = self._prepare_call(url, params)
+        timeout = aiohttp.ClientTimeout(total=self.timeout) if self.timeout else None
+
+        endpoint, started_at = self._before_request(method, url)
+
+        retries = 0
+        try:
+            async with self._get_semaphore():
+                while True:
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.acquire_async()
+                    headers = await self._make_authorization_headers()
+                    etag_key, etag_entry, headers = self._lookup_etag(method, url, params, headers)
+                    try:
+                        async with self._get_session().request(
+                            method, url, params=params, headers=headers, json=payload, timeout=timeout
+                        ) as response:
+                            content = await response.read()
+                    except aiohttp.ClientConnectionError:
+                        if retries >= self.max_retries:
+                            raise
+                        retries += 1
+                        continue
+
+                    retry_after = response.headers.get("Retry-After")
+                    if response.status in _RETRY_AFTER_STATUS_CODES and retry_after and retries < self.max_retries:
+                        retries += 1
+                        if self.rate_limiter is not None and response.status == HTTPStatus.TOO_MANY_REQUESTS:
+                            self.rate_limiter.pause(rate_limit.parse_retry_after(retry_after))
+                        else:
+                            await asyncio.sleep(rate_limit.parse_retry_after(retry_after))
+                        continue
+                    break
+        except BaseException:
+            # BaseException so a cancelled or interrupted request is reported too
+            self._after_response(method, endpoint, started_at, None, None, retries, False)
+            raise
+
+        cache_hit = etag_entry is not None and response.status == HTTPStatus.NOT_MODIFIED
+        self._after_response(method, endpoint, started_at, response.status, content, retries, cache_hit)
+        if cache_hit:
+            return etag_entry.value
+
+        result = self._decode_response(response.status, content)
+        self._raise_for_error(response.status, response.headers, result, params)
+        response.raise_for_status()
+        self._store_etag(etag_key, response.headers, result)
+        return result
+
+    async def _get_projected(self, url: str, fields: Union[str, projection.Projection], **params):
+        if not isinstance(fields, projection.Projection):
+            return await self._get(url, fields=fields, **params)
+        return fields.validate(await self._get(url, fields=fields.expression, **params))
+
+    async def _get_item(self, endpoint: str, item_id: str, **params) -> dict:
+        cached = self._read_catalog_cache(endpoint, [item_id], params)
+        if cached:
+            return cached[item_id]
+
+        item = await self._get("{}/{}".format(endpoint, item_id), **params)
+        self._write_catalog_cache(endpoint, {item_id: item}, params)
+        return item
+
+    async def _get_many(self, endpoint: str, key: str, ids: List[str], max_ids: int, **params) -> List[dict]:
+        if self.catalog_cache is None:
+            return await self._fetch_many(endpoint, key, ids, max_ids, **params)
+
+        cached = self._read_catalog_cache(endpoint, ids, params)
+        missing = list(collections.OrderedDict.fromkeys(item_id for item_id in ids if item_id not in cached))
+        fetched = dict(zip(missing, await self._fetch_many(endpoint, key, missing, max_ids, **params)))
+        self._write_catalog_cache(endpoint, fetched, params)
+        return [cached[item_id] if item_id in cached else fetched[item_id] for item_id in ids]
+
+    async def _fetch_many(self, endpoint: str, key: str, ids: List[str], max_ids: int, **params) -> List[dict]:
+        chunks = [ids[i : i + max_ids] for i in range(0, len(ids), max_ids)]
+        pages = await asyncio.gather(*(self._get(endpoint, ids=chunk, **params) for chunk in chunks))
+        return [item for page in pages for item in page[key]]
+
+    async def tracks_audio_feature_table(self, tracks: Sequence[str]):
+        from spotipy import analysis
+
+        track_ids = [_get_id("track", track) for track in tracks]
+        return analysis.audio_features_table(track_ids, await self.tracks_audio_feature(track_ids))
+
+    async def iter_all(
+        self, method: Callable[..., dict], *args, page_size: int = None, max_concurrency: int = None, **kwargs
+    ) -> AsyncIterator[dict]:
+        limit = page_size or client._PAGE_SIZES.get(getattr(method, "__name__", None), 50)
+        page = await method(*args, limit=limit, offset=0, **kwargs)
+        for item in page["items"]:
+            yield item
+        if "total" not in page:
+            offset = 0
+            while page["next"] if "next" in page else len(page["items"]) == limit:
+                offset += limit
+                if "next" in page:
+                    page = await self.next(page)
+                else:
+                    page = await method(*args, limit=limit, offset=offset, **kwargs)
+                for item in page["items"]:
+                    yield item
+            return
+
+        offsets = iter(range(limit, page["total"], limit))
+        pending = collections.deque(
+            asyncio.ensure_future(method(*args, limit=limit, offset=offset, **kwargs))
+            for offset in itertools.islice(offsets, max_concurrency or self.max_concurrency)
+        )
+        try:
+            while pending:
+                page = await pending.popleft()
+                for offset in itertools.islice(offsets, 1):
+                    pending.append(asyncio.ensure_future(method(*args, limit=limit, offset=offset, **kwargs)))
+                for item in page["items"]:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def fetch_all(self, method: Callable[..., dict], *args, **kwargs) -> List[dict]:
+        return [item async for item in self.iter_all(method, *args, **kwargs)]
+
+    async def next(self, result):
+        """ returns the next result given a paged result
+
+            Parameters:
+                - result - a previously returned paged result
+        """
+        if result["next"]:
+            return await self._get(result["next"])
+        else:
+            return None
+
+    async def previous(self, result):
+        """ returns the previous result given a paged result
+
+            Parameters:
+                - result - a previously returned paged result
+        """
+        if result["previous"]:
+            return await self._get(result["previous"])
+        else:
+            return None
+
+    async def playlist_all_tracks(self, playlist_id: str, market: str = None) -> List[dict]:
+        if self.playlist_cache is None:
+            return await self.fetch_all(self.playlist_tracks, playlist_id, market=market)
+
+        playlist_id = _get_id("playlist", playlist_id)
+        snapshot_id = (await self.playlist(playlist_id, fields="snapshot_id"))["snapshot_id"]
+        entry = self._read_playlist_cache(playlist_id)
+        cache_market = self._cache_market(market)
+        if entry is not None and entry["snapshot_id"] == snapshot_id and entry["market"] == cache_market:
+            return entry["items"]
+        items = await self.fetch_all(self.playlist_tracks, playlist_id, market=market)
+        self._write_playlist_cache(playlist_id, snapshot_id, cache_market, items)
+        return items
+
+    async def _write_playlist_tracks(
+        self, method: str, playlist_id: str, payload: dict, change: Callable[[list], Optional[list]] = None
+    ) -> str:
+        url = "playlists/{}/tracks".format(playlist_id)
+        new_snapshot_id = (await self._internal_call(method, url, {}, payload))["snapshot_id"]
+        self._update_playlist_cache(playlist_id, new_snapshot_id, payload.get("snapshot_id"), change)
+        return new_snapshot_id
+
+    async def is_users_follow_playlist(self, playlist_id: str, users: Sequence[str]) -> bool:
+        _assert_ids_length(users, "users", 5)
+        url = "playlists/{}/followers/contains".format(_get_id("playlist", playlist_id))
+        return (await self._get(url, ids=users))[0]
+
+    async def is_current_user_following_artists(self, artists: Sequence[str]) -> bool:
+        if isinstance(artists, str):
+            raise ValueError("artists must be a sequence of strings")
+
+        if len(artists) > 50 or len(artists) < 0:
+            raise ValueError("artists cannot be larger than 50")
+
+        response = await self._get(
+            "me/following/contains", type="artist", ids=[_get_id("artist", artist) for artist in artists]
+        )
+        return response[0]
+
+    async def is_current_user_following_users(self, users: Sequence[str]) -> bool:
+        if isinstance(users, str):
+            raise ValueError("users must be a list")
+
+        if len(users) > 50 or len(users) < 0:
+            raise ValueError("users cannot be larger than 50")
+
+        response = await self._get("me/following/contains", type="user", ids=[_get_id("user", user) for user in users])
+        return response[0]
+
+    async def devices(self) -> List[dict]:
+        return (await self._get("me/player/devices"))["devices"]
+
+
+# the inherited methods return the coroutine of _get/_post/_put/_delete, the overridden ones share their docs
+for _name, _method in vars(AsyncSpotify).items():
+    if not _name.startswith("_") and _method.__doc__ is None:
+        _method.__doc__ = getattr(client.Spotify, _name).__doc__
+del _name, _method
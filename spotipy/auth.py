@@ -1,23 +1,27 @@
 import base64
+import hashlib
 import json
 import logging
+import threading
 import time
 from http import HTTPStatus
 
 import requests
-import requests.adapters
 
 from spotipy import exceptions
+from spotipy import transport as transport_module
 
 _logger = logging.getLogger(__name__)
 
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+
 
 def request_token(payload: dict, client_id: str, client_secret: str, requests_session: requests.Session = None) -> dict:
     auth_header = base64.b64encode("{}:{}".format(client_id, client_secret).encode("ascii"))
     headers = {"Authorization": "Basic {}".format(auth_header.decode("ascii"))}
     if not requests_session:
         requests_session = requests.Session()
-    response = requests_session.post("https://accounts.spotify.com/api/token", data=payload, headers=headers)
+    response = requests_session.post(TOKEN_URL, data=payload, headers=headers)
     if response.status_code != HTTPStatus.OK:
         error_message = ""
         if response.content:
@@ -27,11 +31,22 @@ def request_token(payload: dict, client_id: str, client_secret: str, requests_se
     return response.json()
 
 
+def _user_cache_scope(client_id: str, refresh_token: str) -> str:
+    # the refresh token is a secret, the cache keys only hold its digest
+    return "user:{}:{}".format(client_id, hashlib.sha256(refresh_token.encode("utf-8")).hexdigest())
+
+
 def is_token_expired(expires_at: int):
     now = int(time.time())
     return expires_at - now < 30
 
 
+def _make_transport(transport: transport_module.Transport, requests_session: requests.Session):
+    if transport is not None:
+        return transport
+    return transport_module.Transport(max_retries=3, requests_session=requests_session)
+
+
 class SpotifyAuthProvider:
     def make_authorization_headers(self) -> dict:
         raise NotImplementedError
@@ -40,9 +55,21 @@ class SpotifyAuthProvider:
     def access_token(self):
         raise NotImplementedError
 
+    @property
+    def cache_scope(self) -> str:
+        """ Identifies whose data the tokens of this provider can access, cached responses are kept per scope.
+            The scope is stored in the cache keys, it must not contain a secret.
+        """
+        return "provider:{}".format(id(self))
+
 
 class PlainAccessToken(SpotifyAuthProvider):
-    def __init__(self, access_token: str, requests_session: requests.Session = None):
+    def __init__(
+        self,
+        access_token: str,
+        requests_session: requests.Session = None,
+        transport: transport_module.Transport = None,
+    ):
         """
         You can either provide a client_id and client_secret to the
         constructor or set SPOTIPY_CLIENT_ID and SPOTIPY_CLIENT_SECRET
@@ -50,51 +77,115 @@ class PlainAccessToken(SpotifyAuthProvider):
         """
 
         self._access_token = access_token
+        self._headers = {"Authorization": "Bearer {}".format(access_token)}
 
-        if isinstance(requests_session, requests.Session):
-            self._session = requests_session
-        else:
-            self._session = requests.Session()
-
-        self._session.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
+        self.transport = _make_transport(transport, requests_session)
+        self._session = self.transport.session
 
     def make_authorization_headers(self) -> dict:
-        return {"Authorization": "Bearer {}".format(self._access_token)}
+        return self._headers
 
     @property
     def access_token(self):
         return self._access_token
 
 
-class ClientCredentials(SpotifyAuthProvider):
-    def __init__(self, client_id: str, client_secret: str, requests_session: requests.Session = None):
+class _RefreshingAuthProvider(SpotifyAuthProvider):
+    """
+    Base class of the providers that request their access token from the token endpoint.
+
+    Only one thread requests a new token at a time, the others wait for it and use the same token.
+    With refresh_ahead, the token is refreshed by a background thread that many seconds before it expires,
+    so requests don't wait for the token endpoint.
+    The returned headers dict is shared between calls and must not be mutated.
+    """
+
+    def __init__(self, transport: transport_module.Transport, refresh_ahead: int = None):
+        self.transport = transport
+        self.refresh_ahead = refresh_ahead
+        # (access token, expires at, headers), replaced as a whole so a reader never mixes two tokens
+        self._token = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_timer = None
+
+    @property
+    def access_token(self):
+        return self._token[0] if self._token is not None else None
+
+    def make_authorization_headers(self) -> dict:
+        token = self._token
+        if token is None or is_token_expired(token[1]):
+            with self._refresh_lock:
+                # another thread might have refreshed the token while we waited for the lock
+                if self._token is None or is_token_expired(self._token[1]):
+                    self._refresh()
+                token = self._token
+
+        return token[2]
+
+    def close(self):
+        """ Stops refreshing the token in the background
+        """
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+    def _request_access_token(self):
+        """ Requests a new access token and returns it with the time it expires at
+        """
+        raise NotImplementedError
+
+    def _refresh(self):
+        self._set_access_token(*self._request_access_token())
+
+    def _set_access_token(self, access_token: str, expires_at: int):
+        self._token = (access_token, expires_at, {"Authorization": "Bearer {}".format(access_token)})
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if not self.refresh_ahead:
+            return
+        self.close()
+        time_left = self._token[1] - time.time()
+        # never refresh more often than every half of the token's lifetime
+        delay = max(time_left - self.refresh_ahead, time_left / 2, 0)
+        self._refresh_timer = threading.Timer(delay, self._refresh_in_background)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_in_background(self):
+        try:
+            with self._refresh_lock:
+                self._refresh()
+        except Exception:
+            _logger.exception("failed to refresh the access token in the background")
+
+
+class ClientCredentials(_RefreshingAuthProvider):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        requests_session: requests.Session = None,
+        transport: transport_module.Transport = None,
+        refresh_ahead: int = None,
+    ):
         """
         You can either provide a client_id and client_secret to the
         constructor or set SPOTIPY_CLIENT_ID and SPOTIPY_CLIENT_SECRET
         environment variables
-        """
 
+            Parameters:
+                 - refresh_ahead - if set, refresh the token in the background this many seconds before it expires
+        """
+        super().__init__(_make_transport(transport, requests_session), refresh_ahead)
         self.client_id = client_id
         self.client_secret = client_secret
-        self._access_token = None
-        self._access_token_expires = None
-
-        if isinstance(requests_session, requests.Session):
-            self._session = requests_session
-        else:
-            self._session = requests.Session()
-
-        self._session.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
-
-    def make_authorization_headers(self) -> dict:
-        if not self._access_token or is_token_expired(self._access_token_expires):
-            self._request_access_token()
-
-        return {"Authorization": "Bearer {}".format(self._access_token)}
+        self._session = self.transport.session
 
     @property
-    def access_token(self):
-        return self._access_token
+    def cache_scope(self) -> str:
+        return "client:{}".format(self.client_id)
 
     def _request_access_token(self):
         """Gets client credentials access token """
@@ -102,11 +193,10 @@ class ClientCredentials(SpotifyAuthProvider):
 
         now = int(time.time())
         token_info = request_token(payload, self.client_id, self.client_secret, self._session)
-        self._access_token = token_info["access_token"]
-        self._access_token_expires = now + token_info["expires_in"]
+        return token_info["access_token"], now + token_info["expires_in"]
 
 
-class AuthorizationCode(SpotifyAuthProvider):
+class AuthorizationCode(_RefreshingAuthProvider):
     """
     Implements Authorization Code Flow for Spotify's OAuth implementation.
     """
@@ -120,6 +210,8 @@ class AuthorizationCode(SpotifyAuthProvider):
         access_token_expires_at: int = None,
         persist_file_path=None,
         requests_session: requests.Session = None,
+        transport: transport_module.Transport = None,
+        refresh_ahead: int = None,
     ):
         """
             Creates a SpotifyOAuth object
@@ -131,23 +223,24 @@ class AuthorizationCode(SpotifyAuthProvider):
                  - state - security state
                  - scope - the desired scope of the request
                  - cache_path - path to location to save tokens
+                 - requests_session - a request.Session object
+                 - transport - a Transport object, overrides requests_session
+                 - refresh_ahead - if set, refresh the token in the background this many seconds before it expires
         """
-
+        super().__init__(_make_transport(transport, requests_session), refresh_ahead)
         self._client_id = client_id
         self._client_secret = client_secret
         self._refresh_token = refresh_token
-        self._access_token = access_token
-        self._access_token_expires_at = access_token_expires_at
         if (access_token is not None) != (access_token_expires_at is not None):
             raise ValueError("when supplying access_token, access_token_expires_at must be supplied as well")
         self._persist_file_path = persist_file_path
-
-        if not requests_session:
-            self.session = requests.Session()
+        self.session = self.transport.session
+        if access_token is not None:
+            self._set_access_token(access_token, access_token_expires_at)
 
     @property
-    def access_token(self):
-        return self._access_token
+    def cache_scope(self) -> str:
+        return _user_cache_scope(self._client_id, self._refresh_token)
 
     def save(self):
         data = {
@@ -159,7 +252,13 @@ class AuthorizationCode(SpotifyAuthProvider):
             json.dump(data, f)
 
     @classmethod
-    def load(cls, persist_file_path: str, requests_session: requests.Session = None):
+    def load(
+        cls,
+        persist_file_path: str,
+        requests_session: requests.Session = None,
+        transport: transport_module.Transport = None,
+        refresh_ahead: int = None,
+    ):
         with open(persist_file_path) as f:
             data = json.load(f)
 
@@ -169,19 +268,14 @@ class AuthorizationCode(SpotifyAuthProvider):
             data["refresh_token"],
             persist_file_path=persist_file_path,
             requests_session=requests_session,
+            transport=transport,
+            refresh_ahead=refresh_ahead,
         )
 
-    def make_authorization_headers(self) -> dict:
-        if not self._access_token or is_token_expired(self._access_token_expires_at):
-            self._request_access_token()
-
-        return {"Authorization": "Bearer {}".format(self._access_token)}
-
     def _request_access_token(self):
         payload = {"refresh_token": self._refresh_token, "grant_type": "refresh_token"}
         now = int(time.time())
         token_info = request_token(payload, self._client_id, self._client_secret, self.session)
-        self._access_token = token_info["access_token"]
-        self._access_token_expires_at = token_info["expires_in"] + now
         if self._persist_file_path:
             self.save()
+        return token_info["access_token"], token_info["expires_in"] + now
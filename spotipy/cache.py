@@ -0,0 +1,192 @@
+import collections
+import json
+import sqlite3
+import threading
+import time
+from typing import Sequence
+
+ETagEntry = collections.namedtuple("ETagEntry", ["etag", "value"])
+
+
+class ETagCache:
+    """
+    A thread safe LRU cache of decoded GET responses and their ETag.
+
+    Spotify sends If-None-Match with the stored ETag and returns the stored object when the API answers
+    304 Not Modified. The same object is returned for every hit, so it should not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+            Parameters:
+                - max_entries - the maximum number of responses to keep, the least recently used are evicted first
+        """
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str, params: dict, scope: str) -> tuple:
+        return url, tuple(sorted(params.items())) if params else (), scope
+
+    def get(self, key: tuple) -> ETagEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: tuple, etag: str, value):
+        with self._lock:
+            self._entries[key] = ETagEntry(etag, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CacheBackend:
+    """
+    The interface of the catalog cache used by Spotify, keys are strings and values are decoded JSON objects.
+    """
+
+    def get_many(self, keys: Sequence[str]) -> dict:
+        """ Returns a dict of the keys that are in the cache and not expired, to their value
+        """
+        raise NotImplementedError
+
+    def set_many(self, items: dict, ttl: float):
+        """ Stores the items, a dict of key to value, for ttl seconds
+        """
+        raise NotImplementedError
+
+    def delete_many(self, keys: Sequence[str]):
+        """ Removes the keys from the cache
+        """
+        raise NotImplementedError
+
+    def get(self, key: str):
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value, ttl: float):
+        self.set_many({key: value}, ttl)
+
+    def delete(self, key: str):
+        self.delete_many([key])
+
+
+class MemoryCache(CacheBackend):
+    """
+    A thread safe in process cache backend
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> dict:
+        now = time.time()
+        result = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at > now:
+                    result[key] = value
+                else:
+                    del self._entries[key]
+        return result
+
+    def set_many(self, items: dict, ttl: float):
+        expires_at = time.time() + ttl
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (value, expires_at)
+
+    def delete_many(self, keys: Sequence[str]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    A cache backend stored in a SQLite database file.
+
+    The database is opened in WAL mode, so many threads and processes can share the same file:
+    readers don't block each other or the writer.
+    """
+
+    # SQLite limits the number of variables in a statement
+    _max_variables = 500
+
+    def __init__(self, path: str, timeout: float = 30):
+        """
+            Parameters:
+                - path - the path of the database file, created if it doesn't exist
+                - timeout - how many seconds to wait for another connection to release a lock
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, every thread opens its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, keys: Sequence[str]) -> dict:
+        keys = list(keys)
+        connection = self._connection()
+        now = time.time()
+        result = {}
+        for i in range(0, len(keys), self._max_variables):
+            chunk = keys[i : i + self._max_variables]
+            rows = connection.execute(
+                "SELECT key, value FROM cache WHERE key IN ({}) AND expires_at > ?".format(",".join("?" * len(chunk))),
+                chunk + [now],
+            )
+            for key, value in rows:
+                result[key] = json.loads(value)
+        return result
+
+    def set_many(self, items: dict, ttl: float):
+        expires_at = time.time() + ttl
+        rows = [(key, json.dumps(value, separators=(",", ":")), expires_at) for key, value in items.items()]
+        with self._connection() as connection:
+            connection.executemany("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", rows)
+
+    def delete_many(self, keys: Sequence[str]):
+        with self._connection() as connection:
+            connection.executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in keys])
+
+    def purge_expired(self):
+        """ Deletes the expired entries from the database file
+        """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def close(self):
+        """ Closes the connection of the calling thread
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -1,21 +1,65 @@
+import collections
+import hashlib
+import itertools
+import threading
+import time
+from concurrent import futures
 from http import HTTPStatus
+from typing import Callable
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Sequence
 from typing import Tuple
 from typing import Union
 
 import requests
-import requests.adapters
 from urllib3.util import retry
 
+from spotipy import cache
+from spotipy import coalescer
+from spotipy import decoders
 from spotipy import exceptions
+from spotipy import ids as ids_module
+from spotipy import metrics
 from spotipy import params_encoder
+from spotipy import projection
+from spotipy import rate_limit
+from spotipy import transport as transport_module
 from spotipy.auth import SpotifyAuthProvider
 
 """ A simple and thin Python library for the Spotify Web API
 """
 
 
+# the default time to live in seconds of the cached catalog items, per endpoint, and of the cached playlist tracks
+DEFAULT_CACHE_TTLS = {
+    "albums": 7 * 24 * 60 * 60,
+    "artists": 24 * 60 * 60,
+    "audio-analysis": 30 * 24 * 60 * 60,
+    "audio-features": 30 * 24 * 60 * 60,
+    "tracks": 7 * 24 * 60 * 60,
+    "playlist_tracks": 30 * 24 * 60 * 60,
+}
+
+# the maximum page size of the offset-paged endpoints
+_PAGE_SIZES = {
+    "album_tracks": 50,
+    "artist_albums": 50,
+    "current_user_playlists": 50,
+    "current_user_saved_albums": 50,
+    "current_user_saved_tracks": 50,
+    "playlist_tracks": 100,
+    "user_playlists": 50,
+}
+
+
+class _RateLimitedRetry(retry.Retry):
+    """ A Retry that leaves the 429 responses to the RateLimiter of the client """
+
+    RETRY_AFTER_STATUS_CODES = retry.Retry.RETRY_AFTER_STATUS_CODES - {HTTPStatus.TOO_MANY_REQUESTS}
+
+
 def _quota_search_term(term: str):
     if ":" not in term:
         return '"{}"'.format(term) if " " in term else term
@@ -48,22 +92,41 @@ def _assert_ids_length(ids: Sequence, parameter_name: str, max_length=50):
 
 
 def _get_id(spotify_type: str, spotify_id: str):
-    fields = spotify_id.split(":", maxsplit=2)
-    if len(fields) == 3:
-        if spotify_type != fields[-2]:
-            raise ValueError("expected id of type {} but found type {} {}".format(spotify_type, fields[-2], spotify_id))
-        return fields[-1]
-    fields = spotify_id.split("/", maxsplit=2)
-    if len(fields) == 3:
-        itype = fields[-2]
-        if spotify_type != itype:
-            raise ValueError("expected id of type {} but found type {} {}".format(spotify_type, itype, spotify_id))
-        return fields[-1]
-    return spotify_id
+    return ids_module.to_id(spotify_type, spotify_id)
 
 
 def _get_uri(spotify_type: str, spotify_id: str):
-    return "spotify:{}:{}".format(spotify_type, _get_id(spotify_type, spotify_id))
+    return ids_module.to_uri(spotify_type, spotify_id)
+
+
+def _item_uri(item: dict) -> Optional[str]:
+    track = item.get("track")
+    return track.get("uri") if track else None
+
+
+def _reordered_items(items: list, range_start: int, insert_before: int, range_length: int = None) -> list:
+    range_length = 1 if range_length is None else range_length
+    items = list(items)
+    moved = items[range_start : range_start + range_length]
+    del items[range_start : range_start + range_length]
+    if insert_before > range_start:
+        insert_before -= len(moved)
+    items[insert_before:insert_before] = moved
+    return items
+
+
+def _items_without_positions(items: list, tracks: Sequence[dict]) -> Optional[list]:
+    """ Returns the items without the positions of the tracks, or None if the items at the positions are not the
+        tracks, which means the items are stale
+    """
+    positions = set()
+    for track in tracks:
+        uri = _get_uri("track", track["uri"])
+        for position in track["positions"]:
+            if position >= len(items) or _item_uri(items[position]) != uri:
+                return None
+            positions.add(position)
+    return [item for i, item in enumerate(items) if i not in positions]
 
 
 class Spotify(object):
@@ -93,6 +156,16 @@ class Spotify(object):
         auth_provider: SpotifyAuthProvider,
         requests_session: requests.Session = None,
         default_timeout: Union[int, Tuple[int, int]] = None,
+        transport: transport_module.Transport = None,
+        max_workers: int = None,
+        coalesce_window: float = None,
+        etag_cache: cache.ETagCache = None,
+        catalog_cache: cache.CacheBackend = None,
+        cache_ttls: dict = None,
+        rate_limiter: rate_limit.RateLimiter = None,
+        hooks: Sequence[metrics.RequestHook] = None,
+        json_decoder: Union[str, Callable[[bytes], object]] = None,
+        playlist_cache: cache.CacheBackend = None,
     ):
         """
         Create a Spotify API object.
@@ -106,46 +179,199 @@ class Spotify(object):
             for performance reasons (connection pooling).
         :param default_timeout:
             Tell Requests to stop waiting for a response after a given number of seconds
+        :param transport:
+            Transport object to send the requests with, overrides requests_session.
+            Share it with the auth provider to use one connection pool for both.
+            Its max_retries replaces the retries of 5xx and 429 responses the client sets up otherwise.
+            With a rate_limiter, its max_retries must not retry 429 responses, they're retried by the client.
+        :param max_workers:
+            The number of threads used to send the chunks of batch lookups concurrently.
+            Defaults to the connection pool size of the transport.
+        :param coalesce_window:
+            When set, single track, artist, album and audio features lookups made within this many seconds of
+            each other are sent as one request to the batch endpoint.
+        :param etag_cache:
+            ETagCache object to revalidate GET responses with If-None-Match.
+            A 304 Not Modified response returns the cached object without downloading it again.
+        :param catalog_cache:
+            CacheBackend object to cache tracks, albums, artists, audio features and audio analysis in.
+            Batch lookups only request the ids that are missing from the cache.
+        :param cache_ttls:
+            Time to live in seconds of the cached items per endpoint, overrides DEFAULT_CACHE_TTLS.
+            e.g. {"artists": 3600}
+        :param rate_limiter:
+            RateLimiter object shared by all the threads using this object. Every request waits for a token,
+            and a 429 response pauses all the requests for its Retry-After and is then retried.
+        :param hooks:
+            RequestHook objects to call before every request and after every response,
+            e.g. a metrics.MetricsCollector to aggregate latencies and sizes per endpoint.
+        :param json_decoder:
+            'orjson', 'ujson', 'json' or a function that decodes the response bodies from bytes.
+            Defaults to the fastest one installed.
+        :param playlist_cache:
+            CacheBackend object to cache the tracks read by playlist_all_tracks in, keyed by the playlist's snapshot
+            id. The reorder and remove methods of this object update the cached tracks when they're given the cached
+            snapshot id, the other changes remove them.
         """
         self.auth_provider = auth_provider
         self.timeout = default_timeout
-        if requests_session:
-            self._session = requests_session
-        else:
-            self._session = requests.Session()
-
-        rate_limit_retry = retry.Retry(self.max_retries, read=False, method_whitelist=["POST", "GET", "PUT", "DELETE"])
-        self._session.mount("https://", requests.adapters.HTTPAdapter(max_retries=rate_limit_retry))
-
-    def _internal_call(self, method: str, url: str, params: dict = None, payload: dict = None):
+        self.rate_limiter = rate_limiter
+        if transport is None:
+            retry_class = _RateLimitedRetry if rate_limiter is not None else retry.Retry
+            rate_limit_retry = retry_class(
+                self.max_retries, read=False, method_whitelist=["POST", "GET", "PUT", "DELETE"]
+            )
+            transport = transport_module.Transport(max_retries=rate_limit_retry, requests_session=requests_session)
+        elif rate_limiter is not None and transport.adapter.max_retries.is_retry(
+            "GET", HTTPStatus.TOO_MANY_REQUESTS, has_retry_after=True
+        ):
+            # urllib3 would retry the 429 responses before the rate limiter could pause for them
+            raise ValueError("the max_retries of a transport used with a rate_limiter must not retry 429 responses")
+        self.transport = transport
+        self._session = transport.session
+        self.max_workers = max_workers or transport.pool_maxsize
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._coalescer = coalescer.RequestCoalescer(self, coalesce_window) if coalesce_window else None
+        self.etag_cache = etag_cache
+        self.catalog_cache = catalog_cache
+        self.playlist_cache = playlist_cache
+        self._playlist_cache_lock = threading.Lock()
+        self.cache_ttls = dict(DEFAULT_CACHE_TTLS, **(cache_ttls or {}))
+        self.hooks = list(hooks or [])
+        self.json_loads = decoders.get_decoder(json_decoder)
+
+    def close(self):
+        """ Shuts down the threads used for concurrent requests
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _get_executor(self) -> futures.ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="spotipy")
+            return self._executor
+
+    def _prepare_call(self, url: str, params: dict = None) -> Tuple[str, dict]:
         if params:
             params = params_encoder.encode_params(params)
         if not url.startswith("http"):
             url = self.base_api_url + url
-        headers = self.auth_provider.make_authorization_headers()
-
-        response = self._session.request(method, url, params, headers=headers, json=payload, timeout=self.timeout)
-        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
-            raise exceptions.RateLimitReached(response.headers.get("Retry-After"))
-
-        if 400 <= response.status_code < 500:
-            if response.content:
-                error = response.json()["error"]
+        return url, params
+
+    @staticmethod
+    def _raise_for_error(status_code: int, headers, body, params: dict = None):
+        if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            retry_after = headers.get("Retry-After")
+            raise exceptions.RateLimitReached(
+                int(retry_after) if retry_after and retry_after.isdigit() else retry_after
+            )
+
+        if 400 <= status_code < 500:
+            error = body.get("error") if isinstance(body, dict) else None
+            if isinstance(error, dict):
                 if (
-                    response.status_code == HTTPStatus.NOT_FOUND
+                    status_code == HTTPStatus.NOT_FOUND
+                    and params
                     and "device_id" in params
                     or error.get("reason") == "NO_ACTIVE_DEVICE"
                 ):
                     raise exceptions.DeviceNotFoundError(error["message"])
-                raise exceptions.SpotifyRequestError(response.status_code, error["message"])
-            raise exceptions.SpotifyRequestError(response.status_code, "")
+                raise exceptions.SpotifyRequestError(status_code, error["message"])
+            raise exceptions.SpotifyRequestError(status_code, "")
 
-        response.raise_for_status()
-
-        if response.status_code == HTTPStatus.NO_CONTENT:
+    def _decode_response(self, status_code: int, content: bytes):
+        if status_code == HTTPStatus.NO_CONTENT or not content:
+            return None
+        try:
+            return self.json_loads(content)
+        except ValueError:
+            if status_code < 400:
+                raise
+            # error bodies that aren't JSON, e.g. the html page of a proxy
             return None
-        if response.content:
-            return response.json()
+
+    def _lookup_etag(self, method: str, url: str, params: dict, headers: dict) -> Tuple[tuple, cache.ETagEntry, dict]:
+        if self.etag_cache is None or method != "GET":
+            return None, None, headers
+        key = self.etag_cache.make_key(url, params, self.auth_provider.cache_scope)
+        entry = self.etag_cache.get(key)
+        if entry is not None:
+            headers = dict(headers, **{"If-None-Match": entry.etag})
+        return key, entry, headers
+
+    def _store_etag(self, key: tuple, response_headers, result):
+        etag = response_headers.get("ETag")
+        if key is not None and etag:
+            self.etag_cache.set(key, etag, result)
+
+    def _before_request(self, method: str, url: str) -> Tuple[str, float]:
+        if not self.hooks:
+            return None, None
+        endpoint = metrics.normalize_endpoint(url)
+        for hook in self.hooks:
+            hook.before_request(method, endpoint)
+        return endpoint, time.monotonic()
+
+    def _after_response(
+        self, method: str, endpoint: str, started_at: float, status: int, content: bytes, retries: int, cache_hit: bool
+    ):
+        if endpoint is None:
+            return
+        event = metrics.RequestEvent(
+            method, endpoint, status, time.monotonic() - started_at, len(content or b""), retries, cache_hit
+        )
+        for hook in self.hooks:
+            hook.after_response(event)
+
+    def _internal_call(self, method: str, url: str, params: dict = None, payload: dict = None):
+        url, params = self._prepare_call(url, params)
+        endpoint, started_at = self._before_request(method, url)
+
+        retries = 0
+        try:
+            while True:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                headers = self.auth_provider.make_authorization_headers()
+                etag_key, etag_entry, headers = self._lookup_etag(method, url, params, headers)
+                response = self._session.request(
+                    method, url, params, headers=headers, json=payload, timeout=self.timeout
+                )
+                if (
+                    response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+                    or self.rate_limiter is None
+                    or retries >= self.max_retries
+                ):
+                    break
+                retries += 1
+                self.rate_limiter.pause(rate_limit.parse_retry_after(response.headers.get("Retry-After")))
+        except BaseException:
+            # BaseException so an interrupted request is reported too
+            self._after_response(method, endpoint, started_at, None, None, retries, False)
+            raise
+
+        cache_hit = etag_entry is not None and response.status_code == HTTPStatus.NOT_MODIFIED
+        if endpoint is not None:
+            # the retries urllib3 made inside the transport
+            urllib3_retries = getattr(response.raw, "retries", None)
+            if urllib3_retries is not None:
+                retries += len(urllib3_retries.history)
+            self._after_response(
+                method, endpoint, started_at, response.status_code, response.content, retries, cache_hit
+            )
+
+        if cache_hit:
+            return etag_entry.value
+
+        result = self._decode_response(response.status_code, response.content)
+        self._raise_for_error(response.status_code, response.headers, result, params)
+        response.raise_for_status()
+        self._store_etag(etag_key, response.headers, result)
+        return result
 
     def _get(self, url: str, **params):
         return self._internal_call("GET", url, params)
@@ -159,6 +385,123 @@ class Spotify(object):
     def _put(self, url: str, payload: dict = None, **params):
         return self._internal_call("PUT", url, params, payload)
 
+    def _get_projected(self, url: str, fields: Union[str, projection.Projection], **params):
+        """ GETs the url with the fields filter, the response is validated when fields is a Projection
+        """
+        if not isinstance(fields, projection.Projection):
+            return self._get(url, fields=fields, **params)
+        return fields.validate(self._get(url, fields=fields.expression, **params))
+
+    def _cache_market(self, market: Optional[str]) -> Optional[str]:
+        """ Returns the market the cached items are kept under. from_token is the market of the user of the token,
+            so its items are kept per auth provider scope, hashed to keep the tokens out of the cache.
+        """
+        if market != "from_token":
+            return market
+        return "from_token:{}".format(hashlib.sha256(self.auth_provider.cache_scope.encode("utf-8")).hexdigest())
+
+    def _catalog_cache_key(self, endpoint: str, item_id: str, params: dict) -> str:
+        market = self._cache_market(params.get("market"))
+        return "{}:{}:{}".format(endpoint, market, item_id) if market else "{}:{}".format(endpoint, item_id)
+
+    def _read_catalog_cache(self, endpoint: str, ids: Sequence[str], params: dict) -> dict:
+        if self.catalog_cache is None or endpoint not in self.cache_ttls:
+            return {}
+        keys = {self._catalog_cache_key(endpoint, item_id, params): item_id for item_id in ids}
+        return {keys[key]: item for key, item in self.catalog_cache.get_many(list(keys)).items()}
+
+    def _write_catalog_cache(self, endpoint: str, items: dict, params: dict):
+        if self.catalog_cache is None or endpoint not in self.cache_ttls:
+            return
+        items = {
+            self._catalog_cache_key(endpoint, item_id, params): item
+            for item_id, item in items.items()
+            if item is not None
+        }
+        if items:
+            self.catalog_cache.set_many(items, self.cache_ttls[endpoint])
+
+    def _read_playlist_cache(self, playlist_id: str) -> Optional[dict]:
+        if self.playlist_cache is None:
+            return None
+        return self.playlist_cache.get("playlist_tracks:{}".format(playlist_id))
+
+    def _write_playlist_cache(self, playlist_id: str, snapshot_id: str, market: Optional[str], items: list):
+        entry = {"snapshot_id": snapshot_id, "market": market, "items": items}
+        self.playlist_cache.set("playlist_tracks:{}".format(playlist_id), entry, self.cache_ttls["playlist_tracks"])
+
+    def _update_playlist_cache(
+        self,
+        playlist_id: str,
+        snapshot_id: str,
+        expected_snapshot_id: Optional[str],
+        change: Optional[Callable[[list], Optional[list]]],
+    ):
+        """ Stores the cached tracks of a playlist changed by change(items) with the snapshot id of the change.
+            The change is only applied when it was made against the cached snapshot, expected_snapshot_id. Otherwise,
+            or when change is None or returns None, the entry is removed: another change may have been made since it
+            was cached, and storing it under the new snapshot id would make it look current.
+        """
+        if self.playlist_cache is None:
+            return
+        key = "playlist_tracks:{}".format(playlist_id)
+        # the read and the write of concurrent changes of the same playlist must not interleave
+        with self._playlist_cache_lock:
+            entry = self.playlist_cache.get(key)
+            if entry is None:
+                return
+            items = None
+            if change is not None and expected_snapshot_id is not None and expected_snapshot_id == entry["snapshot_id"]:
+                items = change(entry["items"])
+            if items is None:
+                self.playlist_cache.delete(key)
+            else:
+                self._write_playlist_cache(playlist_id, snapshot_id, entry["market"], items)
+
+    def _write_playlist_tracks(
+        self, method: str, playlist_id: str, payload: dict, change: Callable[[list], Optional[list]] = None
+    ) -> str:
+        """ Sends a change of the tracks of a playlist and returns its new snapshot id, the change is made against
+            the snapshot_id of the payload, see _update_playlist_cache
+        """
+        url = "playlists/{}/tracks".format(playlist_id)
+        new_snapshot_id = self._internal_call(method, url, {}, payload)["snapshot_id"]
+        self._update_playlist_cache(playlist_id, new_snapshot_id, payload.get("snapshot_id"), change)
+        return new_snapshot_id
+
+    def _get_item(self, endpoint: str, item_id: str, **params) -> dict:
+        cached = self._read_catalog_cache(endpoint, [item_id], params)
+        if cached:
+            return cached[item_id]
+
+        if self._coalescer is not None and endpoint in coalescer.BATCH_ENDPOINTS:
+            item = self._coalescer.get(endpoint, item_id, **params)
+        else:
+            item = self._get("{}/{}".format(endpoint, item_id), **params)
+        self._write_catalog_cache(endpoint, {item_id: item}, params)
+        return item
+
+    def _get_many(self, endpoint: str, key: str, ids: List[str], max_ids: int, **params) -> List[dict]:
+        """ Gets any number of ids from a batch endpoint, max_ids at a time, with the chunks sent concurrently.
+            The items are returned in the order of the ids, with None for ids that were not found.
+        """
+        if self.catalog_cache is None:
+            return self._fetch_many(endpoint, key, ids, max_ids, **params)
+
+        cached = self._read_catalog_cache(endpoint, ids, params)
+        missing = list(collections.OrderedDict.fromkeys(item_id for item_id in ids if item_id not in cached))
+        fetched = dict(zip(missing, self._fetch_many(endpoint, key, missing, max_ids, **params)))
+        self._write_catalog_cache(endpoint, fetched, params)
+        return [cached[item_id] if item_id in cached else fetched[item_id] for item_id in ids]
+
+    def _fetch_many(self, endpoint: str, key: str, ids: List[str], max_ids: int, **params) -> List[dict]:
+        chunks = [ids[i : i + max_ids] for i in range(0, len(ids), max_ids)]
+        if len(chunks) <= 1:
+            return [item for chunk in chunks for item in self._get(endpoint, ids=chunk, **params)[key]]
+
+        pages = self._get_executor().map(lambda chunk: self._get(endpoint, ids=chunk, **params)[key], chunks)
+        return [item for page in pages for item in page]
+
     def next(self, result):
         """ returns the next result given a paged result
 
@@ -181,6 +524,59 @@ class Spotify(object):
         else:
             return None
 
+    def iter_all(
+        self, method: Callable[..., dict], *args, page_size: int = None, max_concurrency: int = None, **kwargs
+    ) -> Iterator[dict]:
+        """ Yields the items of all the pages of an offset-paged endpoint, in order.
+
+            The first page tells the total number of items, the rest of the pages are fetched concurrently,
+            at most max_concurrency pages ahead of the item being yielded.
+
+            Example usage::
+
+                for item in sp.iter_all(sp.playlist_tracks, playlist_id):
+                    print(item["track"]["name"])
+
+            Parameters:
+                - method - a paged method of this object which accepts limit and offset, e.g. sp.playlist_tracks
+                - args - the positional arguments of the method
+                - page_size - the number of items to request per page. Default: the maximum of the endpoint.
+                - max_concurrency - the maximum number of pages requested at the same time. Default: max_workers.
+                - kwargs - the keyword arguments of the method
+        """
+        limit = page_size or _PAGE_SIZES.get(getattr(method, "__name__", None), 50)
+        page = method(*args, limit=limit, offset=0, **kwargs)
+        yield from page["items"]
+        if "total" not in page:
+            # a cursor-paged endpoint, or a fields filter without the paging keys which is read until a short page
+            offset = 0
+            while page["next"] if "next" in page else len(page["items"]) == limit:
+                offset += limit
+                page = self.next(page) if "next" in page else method(*args, limit=limit, offset=offset, **kwargs)
+                yield from page["items"]
+            return
+
+        offsets = iter(range(limit, page["total"], limit))
+        executor = self._get_executor()
+        pending = collections.deque(
+            executor.submit(method, *args, limit=limit, offset=offset, **kwargs)
+            for offset in itertools.islice(offsets, max_concurrency or self.max_workers)
+        )
+        try:
+            while pending:
+                page = pending.popleft().result()
+                for offset in itertools.islice(offsets, 1):
+                    pending.append(executor.submit(method, *args, limit=limit, offset=offset, **kwargs))
+                yield from page["items"]
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def fetch_all(self, method: Callable[..., dict], *args, **kwargs) -> List[dict]:
+        """ Returns the items of all the pages of an offset-paged endpoint, see iter_all
+        """
+        return list(self.iter_all(method, *args, **kwargs))
+
     def track(self, track_id: str, market: str = None) -> dict:
         """ Get Spotify catalog information for a single track.
 
@@ -188,18 +584,17 @@ class Spotify(object):
                 - track_id - a spotify URI, URL or ID.
         """
 
-        return self._get("tracks/" + _get_id("track", track_id), market=market)
+        return self._get_item("tracks", _get_id("track", track_id), market=market)
 
     def tracks(self, tracks: Sequence[str], market: str = None) -> List[dict]:
         """ Get Spotify catalog information for multiple tracks.
 
             Parameters:
-                - tracks - a list of spotify IDs, URIs or URLs. Maximum items: 50.
+                - tracks - a list of spotify IDs, URIs or URLs.
+                  Requested 50 at a time, tracks that were not found are None.
                 - market - An ISO 3166-1 alpha-2 country code or the string from_token.
         """
-        _assert_ids_length(tracks, "tracks")
-
-        return self._get("tracks/", ids=[_get_id("track", track) for track in tracks], market=market)["tracks"]
+        return self._get_many("tracks", "tracks", [_get_id("track", track) for track in tracks], 50, market=market)
 
     def track_audio_analysis(self, track_id: str) -> dict:
         """ Get a detailed audio analysis for a single track
@@ -217,7 +612,7 @@ class Spotify(object):
                 - track_id - a spotify ID, URI or URL.
         """
 
-        return self._get("audio-analysis/" + _get_id("track", track_id))
+        return self._get_item("audio-analysis", _get_id("track", track_id))
 
     def track_audio_feature(self, track_id: str) -> dict:
         """ Get audio feature information for a single track.
@@ -226,17 +621,29 @@ class Spotify(object):
                 - track_id - a spotify ID, URI or URL.
         """
 
-        return self._get("audio-features/{}".format(_get_id("track", track_id)))
+        return self._get_item("audio-features", _get_id("track", track_id))
 
     def tracks_audio_feature(self, tracks: Sequence[str]) -> List[dict]:
         """ Get audio features for multiple tracks.
 
             Parameters:
-                - tracks - a list of spotify IDs, URIs or URLs. Maximum items: 50.
+                - tracks - a list of spotify IDs, URIs or URLs.
+                  Requested 100 at a time, tracks that were not found are None.
+        """
+        return self._get_many("audio-features", "audio_features", [_get_id("track", track) for track in tracks], 100)
+
+    def tracks_audio_feature_table(self, tracks: Sequence[str]):
+        """ Get audio features for any number of tracks as an analysis.AudioFeaturesTable, requires numpy.
+
+            Parameters:
+                - tracks - a list of spotify IDs, URIs or URLs.
+                  Requested 100 at a time, the rows of tracks that were not found are masked as missing.
         """
-        _assert_ids_length(tracks, "tracks")
+        # imported here so importing spotipy doesn't import numpy
+        from spotipy import analysis
 
-        return self._get("audio-features", ids=[_get_id("track", track) for track in tracks])["audio_features"]
+        track_ids = [_get_id("track", track) for track in tracks]
+        return analysis.audio_features_table(track_ids, self.tracks_audio_feature(track_ids))
 
     def artist(self, artist_id: str) -> dict:
         """ Get Spotify catalog information for a single artist.
@@ -245,17 +652,16 @@ class Spotify(object):
                 - artist_id - an artist ID, URI or URL.
         """
 
-        artist_id = _get_id("artist", artist_id)
-        return self._get("artists/" + artist_id)
+        return self._get_item("artists", _get_id("artist", artist_id))
 
     def artists(self, artists: List[str]) -> List[dict]:
         """ Get Spotify catalog information for several artists.
 
             Parameters:
-                - artists - a list of  artist IDs, URIs or URLs.
+                - artists - a list of artist IDs, URIs or URLs.
+                  Requested 50 at a time, artists that were not found are None.
         """
-        _assert_ids_length(artists, "artists")
-        return self._get("artists/", ids=[_get_id("artist", artists) for artists in artists])["artists"]
+        return self._get_many("artists", "artists", [_get_id("artist", artist) for artist in artists], 50)
 
     def artist_albums(
         self,
@@ -310,8 +716,7 @@ class Spotify(object):
                 - album_id - the album ID, URI or URL
         """
 
-        album_id = _get_id("album", album_id)
-        return self._get("albums/" + album_id)
+        return self._get_item("albums", _get_id("album", album_id))
 
     def album_tracks(self, album_id: str, limit: int = None, offset: int = None):
         """ Get Spotify catalog information about an album's tracks
@@ -330,11 +735,10 @@ class Spotify(object):
         """ Get Spotify catalog information for multiple albums
 
             Parameters:
-                - albums - a list of  album IDs, URIs or URLs
+                - albums - a list of album IDs, URIs or URLs.
+                  Requested 20 at a time, albums that were not found are None.
         """
-
-        _assert_ids_length(albums, "albums", 20)
-        return self._get("albums/", ids=[_get_id("album", album) for album in albums])["albums"]
+        return self._get_many("albums", "albums", [_get_id("album", album) for album in albums], 20)
 
     def search(
         self,
@@ -445,23 +849,30 @@ class Spotify(object):
         _assert_offset(offset)
         return self._get("users/{}/playlists".format(_get_id("user", user_id)), limit=limit, offset=offset)
 
-    def playlist(self, playlist_id: str, fields: str = None, market: str = None) -> dict:
+    def playlist(self, playlist_id: str, fields: Union[str, projection.Projection] = None, market: str = None) -> dict:
         """ Get a playlist owned by a Spotify user
 
             Parameters:
                 - playlist_id - the id of the playlist
                 - fields - which fields to return, see https://developer.spotify.com/documentation/web-api/reference/playlists/get-playlist/
+                  or a spotipy.projection.Projection, the playlist is validated against it
         """
-        return self._get("playlists/" + _get_id("playlist", playlist_id), fields=fields, market=market)
+        return self._get_projected("playlists/" + _get_id("playlist", playlist_id), fields, market=market)
 
     def playlist_tracks(
-        self, playlist_id: str, fields: str = None, limit: int = None, offset: int = None, market: str = None
+        self,
+        playlist_id: str,
+        fields: Union[str, projection.Projection] = None,
+        limit: int = None,
+        offset: int = None,
+        market: str = None,
     ) -> dict:
         """ Get full details of the tracks of a playlist owned by a user.
 
             Parameters:
                 - playlist_id - the id of the playlist.
                 - fields - which fields to return. see https://developer.spotify.com/documentation/web-api/reference/playlists/get-playlists-tracks/
+                  or a spotipy.projection.Projection of the page, the page is validated against it
                 - limit - The maximum number of tracks to return. Default: 100. Minimum: 1. Maximum: 100.
                 - offset - The index of the first track to return. Default: 0.
                 - market - An ISO 3166-1 alpha-2 country code or the string from_token.
@@ -469,7 +880,32 @@ class Spotify(object):
         _assert_limit(limit, 100)
         _assert_offset(offset)
         url = "playlists/{}/tracks".format(_get_id("playlist", playlist_id))
-        return self._get(url, limit=limit, offset=offset, fields=fields, market=market)
+        return self._get_projected(url, fields, limit=limit, offset=offset, market=market)
+
+    def playlist_all_tracks(self, playlist_id: str, market: str = None) -> List[dict]:
+        """ Get all the tracks of a playlist, see playlist_tracks.
+
+            With a playlist_cache, the snapshot id of the playlist is requested first and the tracks are only
+            requested if it's not the snapshot id of the cached tracks. The cached items are shared, they should not
+            be mutated.
+
+            Parameters:
+                - playlist_id - the id of the playlist.
+                - market - An ISO 3166-1 alpha-2 country code or the string from_token.
+        """
+        if self.playlist_cache is None:
+            return self.fetch_all(self.playlist_tracks, playlist_id, market=market)
+
+        playlist_id = _get_id("playlist", playlist_id)
+        snapshot_id = self.playlist(playlist_id, fields="snapshot_id")["snapshot_id"]
+        entry = self._read_playlist_cache(playlist_id)
+        cache_market = self._cache_market(market)
+        if entry is not None and entry["snapshot_id"] == snapshot_id and entry["market"] == cache_market:
+            return entry["items"]
+        # a change made while the pages are read gives a new snapshot id, so the items are read again next time
+        items = self.fetch_all(self.playlist_tracks, playlist_id, market=market)
+        self._write_playlist_cache(playlist_id, snapshot_id, cache_market, items)
+        return items
 
     def user_playlist_create(
         self, user_id: str, name: str, public: bool = None, collaborative: bool = None, description: str = None
@@ -548,8 +984,8 @@ class Spotify(object):
         payload = {"uris": [_get_uri("track", track_id) for track_id in tracks]}
         if position is not None:
             payload["position"] = position
-        url = "playlists/{}/tracks".format(_get_id("playlist", playlist_id))
-        return self._post(url, payload)["snapshot_id"]
+        # the snapshot the tracks were added to isn't known, nor the added_at of the added tracks
+        return self._write_playlist_tracks("POST", _get_id("playlist", playlist_id), payload)
 
     def playlist_replace_tracks(self, playlist_id: str, tracks: List[str]) -> str:
         """ Replace all the tracks in a playlist, overwriting its existing tracks.
@@ -561,7 +997,7 @@ class Spotify(object):
         """
         _assert_ids_length(tracks, "tracks", 100)
         payload = {"uris": [_get_uri("track", track) for track in tracks]}
-        return self._put("playlists/{}/tracks".format(_get_id("playlist", playlist_id)), payload)["snapshot_id"]
+        return self._write_playlist_tracks("PUT", _get_id("playlist", playlist_id), payload)
 
     def playlist_reorder_tracks(
         self, playlist_id: str, range_start: int, insert_before: int, range_length: int = None, snapshot_id: str = None
@@ -580,7 +1016,12 @@ class Spotify(object):
             payload["snapshot_id"] = snapshot_id
         if range_length is not None:
             payload["range_length"] = range_length
-        return self._put("playlists/{}/tracks".format(_get_id("playlist", playlist_id)), payload)["snapshot_id"]
+        return self._write_playlist_tracks(
+            "PUT",
+            _get_id("playlist", playlist_id),
+            payload,
+            lambda items: _reordered_items(items, range_start, insert_before, range_length),
+        )
 
     def playlist_remove_all_occurrences_of_tracks(
         self, playlist_id: str, tracks: Sequence[str], snapshot_id: str = None
@@ -597,7 +1038,13 @@ class Spotify(object):
         payload = {"tracks": [{"uri": _get_uri("track", track)} for track in tracks]}
         if snapshot_id:
             payload["snapshot_id"] = snapshot_id
-        return self._delete("playlists/{}/tracks".format(_get_id("playlist", playlist_id)), payload)["snapshot_id"]
+        uris = {track["uri"] for track in payload["tracks"]}
+        return self._write_playlist_tracks(
+            "DELETE",
+            _get_id("playlist", playlist_id),
+            payload,
+            lambda items: [item for item in items if _item_uri(item) not in uris],
+        )
 
     def playlist_remove_specific_occurrences_of_tracks(
         self, playlist_id: str, tracks: Sequence[dict], snapshot_id: str = None
@@ -619,7 +1066,12 @@ class Spotify(object):
 
         if snapshot_id:
             payload["snapshot_id"] = snapshot_id
-        return self._delete("playlists/{}/tracks".format(_get_id("playlist", playlist_id)), payload)["snapshot_id"]
+        return self._write_playlist_tracks(
+            "DELETE",
+            _get_id("playlist", playlist_id),
+            payload,
+            lambda items: _items_without_positions(items, tracks),
+        )
 
     def follow_playlist(self, playlist_id: str) -> None:
         """
@@ -1141,7 +1593,7 @@ class Spotify(object):
         """
         if state not in ("track", "context", "off"):
             raise ValueError("invalid state")
-        self._put("me/player/repeat", state=state, device_id=device_id)
+        return self._put("me/player/repeat", state=state, device_id=device_id)
 
     def volume(self, volume_percent: int, device_id: str = None) -> None:
         """ Set playback volume.
@@ -1155,7 +1607,7 @@ class Spotify(object):
         if volume_percent < 0 or volume_percent > 100:
             raise ValueError("volume must be between 0 and 100, inclusive")
 
-        self._put("me/player/volume", volume_percent=volume_percent, device_id=device_id)
+        return self._put("me/player/volume", volume_percent=volume_percent, device_id=device_id)
 
     def shuffle(self, state: bool, device_id: str = None) -> None:
         """ Toggle shuffle on or off for user’s playback.
@@ -1167,4 +1619,4 @@ class Spotify(object):
         if not isinstance(state, bool):
             raise TypeError("state must be a boolean")
 
-        self._put("me/player/shuffle", state=state, device_id=device_id)
+        return self._put("me/player/shuffle", state=state, device_id=device_id)
@@ -0,0 +1,118 @@
+import threading
+from concurrent import futures
+from http import HTTPStatus
+
+from spotipy import exceptions
+
+# batch endpoint -> (key of the items in the response, maximum ids per request)
+BATCH_ENDPOINTS = {
+    "tracks": ("tracks", 50),
+    "artists": ("artists", 50),
+    "albums": ("albums", 20),
+    "audio-features": ("audio_features", 100),
+}
+
+
+class _PendingBatch:
+    def __init__(self, endpoint: str, params: dict):
+        self.endpoint = endpoint
+        self.params = params
+        self.futures = {}
+        self.full = threading.Event()
+
+    def add(self, item_id: str) -> futures.Future:
+        future = futures.Future()
+        self.futures.setdefault(item_id, []).append(future)
+        return future
+
+    def set_result(self, item_id: str, item: dict):
+        for future in self.futures[item_id]:
+            future.set_result(item)
+
+    def set_exception(self, item_id: str, exception: Exception):
+        for future in self.futures[item_id]:
+            future.set_exception(exception)
+
+
+class RequestCoalescer:
+    """
+    Merges single item lookups made within a short window into one request to the batch endpoint.
+
+    The first caller of a batch waits for the window to pass (or for the batch to fill up) and sends the request,
+    the other callers wait for their own item. An id the batch endpoint doesn't find raises the same 404
+    SpotifyRequestError the single item endpoint does, and when the API rejects a batch with 400 (an invalid id)
+    the ids are looked up one by one so every caller gets its own result or error.
+    """
+
+    def __init__(self, spotify, window: float = 0.005):
+        """
+            Parameters:
+                - spotify - the Spotify object to send the requests with
+                - window - how many seconds to wait for more lookups before sending a batch
+        """
+        self._spotify = spotify
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def get(self, endpoint: str, item_id: str, **params) -> dict:
+        """ Gets a single item through the batch endpoint
+
+            Parameters:
+                - endpoint - 'tracks', 'artists', 'albums' or 'audio-features'
+                - item_id - the spotify ID of the item
+                - params - additional query parameters, only lookups with the same parameters are merged
+        """
+        _, max_ids = BATCH_ENDPOINTS[endpoint]
+        batch_key = (endpoint, tuple(sorted((k, v) for k, v in params.items() if v is not None)))
+        with self._lock:
+            batch = self._pending.get(batch_key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[batch_key] = _PendingBatch(endpoint, params)
+            future = batch.add(item_id)
+            if len(batch.futures) >= max_ids:
+                # the next lookups start a new batch, this one can't take more ids
+                del self._pending[batch_key]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._pending.get(batch_key) is batch:
+                    del self._pending[batch_key]
+            self._send(batch)
+
+        return future.result()
+
+    def _send(self, batch: _PendingBatch):
+        key, _ = BATCH_ENDPOINTS[batch.endpoint]
+        ids = list(batch.futures)
+        try:
+            items = self._spotify._get(batch.endpoint, ids=ids, **batch.params)[key]
+        except exceptions.SpotifyRequestError as e:
+            if len(ids) > 1 and e.status == HTTPStatus.BAD_REQUEST:
+                self._send_one_by_one(batch)
+            else:
+                for item_id in ids:
+                    batch.set_exception(item_id, e)
+            return
+        except Exception as e:
+            for item_id in ids:
+                batch.set_exception(item_id, e)
+            return
+
+        for item_id, item in zip(ids, items):
+            if item is None:
+                batch.set_exception(item_id, exceptions.SpotifyRequestError(HTTPStatus.NOT_FOUND, "non existing id"))
+            else:
+                batch.set_result(item_id, item)
+
+    def _send_one_by_one(self, batch: _PendingBatch):
+        for item_id in batch.futures:
+            try:
+                item = self._spotify._get("{}/{}".format(batch.endpoint, item_id), **batch.params)
+            except Exception as e:
+                batch.set_exception(item_id, e)
+            else:
+                batch.set_result(item_id, item)
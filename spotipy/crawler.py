@@ -0,0 +1,286 @@
+import collections
+import hashlib
+import json
+import os
+from concurrent import futures
+from http import HTTPStatus
+from typing import Iterable
+from typing import Optional
+from typing import Union
+
+from spotipy import exceptions
+from spotipy import ids
+
+""" Crawls the graph of related artists breadth first, writing its edges and the artists while it runs
+
+    The related artists of up to max_concurrency artists of the same depth are requested at the same time, and the
+    discovered artists are hydrated 50 at a time with Spotify.artists. The visited artists are kept in a set of their
+    128-bit numbers, and in a log of 17 byte records of their id and depth which is also the frontier, so neither the
+    artist objects nor their id strings are held for the whole crawl.
+
+    With a checkpoint, the log is appended to a file next to it and the progress is saved after every response,
+    so a crawl which was killed resumes where it stopped: only the requests in flight are sent again.
+
+    Example usage::
+
+        import spotipy.crawler
+        result = spotipy.crawler.crawl_related_artists(
+            sp, [artist_id], "edges.tsv", artists_path="artists.jsonl", checkpoint="crawl.json", max_depth=3
+        )
+        print(result.artists, result.edges)
+"""
+
+CrawlResult = collections.namedtuple("CrawlResult", ["artists", "expanded", "edges"])
+
+# the maximum number of ids of a request to the artists endpoint
+HYDRATE_BATCH_SIZE = 50
+
+# a log record is the 16 bytes of an artist id and its depth
+_RECORD_SIZE = ids.BYTES_LENGTH + 1
+_MAX_DEPTH = 255
+
+Path = Union[str, os.PathLike]
+
+
+class _Crawl:
+    """
+    The state of a crawl: the log of the visited artists, the index of the next one to expand and to hydrate, and
+    the ones whose requests are in flight.
+    """
+
+    def __init__(self, job: str, edges_path: Path, artists_path: Optional[Path], checkpoint: Optional[Path]):
+        self.job = job
+        self.log = bytearray()
+        self.visited = set()
+        self.expand_index = 0
+        self.hydrate_index = 0
+        # the log indexes being expanded, and the start -> end log indexes being hydrated
+        self.expanding = set()
+        self.hydrating = {}
+        self.expanded = 0
+        self.edges = 0
+        self.checkpoint = os.fspath(checkpoint) if checkpoint is not None else None
+        self.log_path = self.checkpoint + ".log" if checkpoint is not None else None
+
+        state = None
+        if self.checkpoint is not None and os.path.exists(self.checkpoint):
+            with open(self.checkpoint, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            if state["job"] != job:
+                raise ValueError("{} is the checkpoint of another crawl".format(self.checkpoint))
+
+        self.edges_file = _open(edges_path, state["edges_offset"] if state else 0)
+        self.artists_file = _open(artists_path, state["artists_offset"] if state else 0) if artists_path else None
+        self.log_file = _open(self.log_path, state["log_offset"] if state else 0) if self.log_path else None
+        if state is None:
+            return
+
+        with open(self.log_path, "rb") as file:
+            self.log = bytearray(file.read(state["log_offset"]))
+        self.visited = {
+            int.from_bytes(self.log[i : i + ids.BYTES_LENGTH], "big") for i in range(0, len(self.log), _RECORD_SIZE)
+        }
+        self.expand_index = state["expand_index"]
+        self.hydrate_index = state["hydrate_index"]
+        self.expanding = set(state["expanding"])
+        self.hydrating = {start: end for start, end in state["hydrating"]}
+        self.expanded = state["expanded"]
+        self.edges = state["edges"]
+
+    def __len__(self):
+        return len(self.log) // _RECORD_SIZE
+
+    def artist_id(self, index: int) -> str:
+        start = index * _RECORD_SIZE
+        return ids.from_bytes(bytes(self.log[start : start + ids.BYTES_LENGTH]))
+
+    def depth(self, index: int) -> int:
+        return self.log[index * _RECORD_SIZE + ids.BYTES_LENGTH]
+
+    def expanding_depth(self) -> Optional[int]:
+        """ Returns the depth of the artists being expanded, None if there are none
+        """
+        # the log is in depth order, the first artist being expanded has the lowest depth
+        return self.depth(min(self.expanding)) if self.expanding else None
+
+    def visit(self, artist_id: str, depth: int) -> bool:
+        """ Appends an artist to the log, returns False if it was already visited
+        """
+        number = ids.encode(artist_id)
+        if number in self.visited:
+            return False
+        self.visited.add(number)
+        record = number.to_bytes(ids.BYTES_LENGTH, "big") + bytes([min(depth, _MAX_DEPTH)])
+        self.log += record
+        if self.log_file is not None:
+            self.log_file.write(record)
+        return True
+
+    def write_edges(self, source_id: str, target_ids: list):
+        if target_ids:
+            self.edges_file.write("".join("{}\t{}\n".format(source_id, target) for target in target_ids).encode())
+            self.edges += len(target_ids)
+
+    def write_artists(self, artists: list):
+        if self.artists_file is not None:
+            lines = [json.dumps(artist, separators=(",", ":")) + "\n" for artist in artists if artist is not None]
+            self.artists_file.write("".join(lines).encode("utf-8"))
+
+    def save(self):
+        """ Flushes the output files and saves the progress, the files are truncated to it on resume
+        """
+        files = [self.edges_file, self.artists_file, self.log_file]
+        for file in files:
+            if file is not None:
+                file.flush()
+        if self.checkpoint is None:
+            return
+        state = {
+            "job": self.job,
+            "edges_offset": self.edges_file.tell(),
+            "artists_offset": self.artists_file.tell() if self.artists_file is not None else 0,
+            "log_offset": len(self.log),
+            "expand_index": self.expand_index,
+            "hydrate_index": self.hydrate_index,
+            "expanding": sorted(self.expanding),
+            "hydrating": sorted(self.hydrating.items()),
+            "expanded": self.expanded,
+            "edges": self.edges,
+        }
+        temp_path = self.checkpoint + ".part"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.checkpoint)
+
+    def close(self, completed: bool):
+        for file in (self.edges_file, self.artists_file, self.log_file):
+            if file is not None:
+                file.close()
+        if completed and self.checkpoint is not None:
+            for path in (self.checkpoint, self.log_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def _open(path: Path, offset: int):
+    """ Opens a file for appending after offset, the bytes written after the last checkpoint are dropped
+    """
+    file = open(path, "r+b" if offset else "wb")
+    file.truncate(offset)
+    file.seek(offset)
+    return file
+
+
+def _related_artist_ids(sp, artist_id: str) -> list:
+    try:
+        return [artist["id"] for artist in sp.artist_related_artists(artist_id)["artists"]]
+    except exceptions.SpotifyRequestError as e:
+        if e.status == HTTPStatus.NOT_FOUND:
+            return []
+        raise
+
+
+def crawl_related_artists(
+    sp,
+    seeds: Iterable[str],
+    edges_path: Path,
+    artists_path: Path = None,
+    checkpoint: Path = None,
+    max_depth: int = None,
+    max_artists: int = None,
+    max_concurrency: int = None,
+) -> CrawlResult:
+    """ Crawls the related artists of the seeds breadth first and returns the number of artists, expanded artists
+        and edges
+
+        Every expanded artist writes a line of its id and a related artist's id, separated by a tab, per related
+        artist to edges_path. The related artists are visited once, in the order they were discovered.
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - seeds - artist IDs, URIs or URLs, visited at depth 0
+            - edges_path - the path of the edge list
+            - artists_path - the path of a JSON Lines file to write the full artist object of every visited artist
+            - checkpoint - the path of a file where the progress is saved after every response. If the file exists
+              the crawl resumes from it, and it's removed once the crawl is complete.
+            - max_depth - the artists at this depth are visited but not expanded. Default: no limit
+            - max_artists - stop discovering artists once this many were visited. Default: no limit
+            - max_concurrency - the maximum number of requests in flight. Default: max_workers of sp
+    """
+    if max_depth is not None and max_depth > _MAX_DEPTH:
+        raise ValueError("max_depth can't be larger than {}".format(_MAX_DEPTH))
+    seeds = ids.normalize_ids(seeds, "artist")
+    max_concurrency = max_concurrency or sp.max_workers
+    job = json.dumps([seeds, max_depth, max_artists])
+    crawl = _Crawl(hashlib.sha1(job.encode("utf-8")).hexdigest(), edges_path, artists_path, checkpoint)
+    if not len(crawl):
+        for seed in seeds:
+            crawl.visit(seed, 0)
+
+    executor = sp._get_executor()
+    pending = {}
+    # the requests which were in flight when the crawl stopped are sent first
+    resumed_expansions = sorted(crawl.expanding, reverse=True)
+    resumed_hydrations = sorted(crawl.hydrating.items(), reverse=True)
+
+    def submit_expansion(index: int):
+        crawl.expanding.add(index)
+        pending[executor.submit(_related_artist_ids, sp, crawl.artist_id(index))] = ("expand", index)
+
+    def submit_hydration(start: int, end: int):
+        crawl.hydrating[start] = end
+        artist_ids = [crawl.artist_id(index) for index in range(start, end)]
+        pending[executor.submit(sp.artists, artist_ids)] = ("hydrate", start)
+
+    def submit_next() -> bool:
+        if resumed_hydrations:
+            submit_hydration(*resumed_hydrations.pop())
+        elif resumed_expansions:
+            submit_expansion(resumed_expansions.pop())
+        elif crawl.artists_file is not None and len(crawl) - crawl.hydrate_index >= HYDRATE_BATCH_SIZE:
+            crawl.hydrate_index += HYDRATE_BATCH_SIZE
+            submit_hydration(crawl.hydrate_index - HYDRATE_BATCH_SIZE, crawl.hydrate_index)
+        elif crawl.expand_index < len(crawl) and crawl.expanding_depth() in (None, crawl.depth(crawl.expand_index)):
+            # a depth is expanded once the previous one is done, so every artist is visited at its shortest depth
+            index = crawl.expand_index
+            crawl.expand_index += 1
+            if max_depth is None or crawl.depth(index) < max_depth:
+                submit_expansion(index)
+        elif crawl.artists_file is not None and crawl.hydrate_index < len(crawl) and not crawl.expanding:
+            # no artist can be discovered anymore, the last batch is not full
+            start, crawl.hydrate_index = crawl.hydrate_index, len(crawl)
+            submit_hydration(start, crawl.hydrate_index)
+        else:
+            return False
+        return True
+
+    completed = False
+    try:
+        while True:
+            while len(pending) < max_concurrency and submit_next():
+                pass
+            if not pending:
+                break
+            done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                kind, index = pending.pop(future)
+                if kind == "hydrate":
+                    crawl.write_artists(future.result())
+                    del crawl.hydrating[index]
+                    continue
+                related_ids = future.result()
+                crawl.write_edges(crawl.artist_id(index), related_ids)
+                depth = crawl.depth(index) + 1
+                for related_id in related_ids:
+                    if max_artists is not None and len(crawl) >= max_artists:
+                        break
+                    crawl.visit(related_id, depth)
+                crawl.expanding.discard(index)
+                crawl.expanded += 1
+            crawl.save()
+        completed = True
+    finally:
+        for future in pending:
+            future.cancel()
+        crawl.close(completed)
+    return CrawlResult(len(crawl), crawl.expanded, crawl.edges)
@@ -0,0 +1,46 @@
+import json
+from typing import Callable
+from typing import Union
+
+""" JSON decoders for the response bodies
+
+    orjson and ujson are used when installed, they parse the raw bytes of the body directly
+    and are several times faster than the json module on large payloads such as audio analysis.
+"""
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+DECODERS = {"json": json.loads}
+if ujson is not None:
+    DECODERS["ujson"] = ujson.loads
+if orjson is not None:
+    DECODERS["orjson"] = orjson.loads
+
+# the order decoders are picked in when none is given
+_PREFERRED = ("orjson", "ujson", "json")
+
+
+def get_decoder(decoder: Union[str, Callable[[bytes], object]] = None) -> Callable[[bytes], object]:
+    """ Returns a function that decodes a JSON document from bytes
+
+        Parameters:
+            - decoder - 'orjson', 'ujson', 'json' or a function that takes bytes.
+                        Default: the fastest installed one
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is None:
+        return next(DECODERS[name] for name in _PREFERRED if name in DECODERS)
+    if decoder not in DECODERS:
+        raise ValueError(
+            "unknown or not installed decoder {}, available: {}".format(decoder, ", ".join(sorted(DECODERS)))
+        )
+    return DECODERS[decoder]
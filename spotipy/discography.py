@@ -0,0 +1,133 @@
+import collections
+import re
+import unicodedata
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Sequence
+
+""" Fetches the discography of an artist, full albums with all their tracks, in a few requests
+
+    The albums are paged from artist_albums, deduplicated, and fetched 20 at a time with Spotify.albums, whose albums
+    embed their first 50 tracks. album_tracks is only requested for the rest of the tracks of the longer albums,
+    so an artist with 200 albums takes about 15 requests instead of one album_tracks request per album.
+
+    Example usage::
+
+        import spotipy.discography
+        for album in spotipy.discography.fetch_discography(sp, artist_id):
+            print(album["name"], album["album_group"], len(album["tracks"]["items"]))
+"""
+
+ALBUM_GROUPS = ("album", "single", "compilation", "appears_on")
+
+# the maximum page size of the album tracks endpoint
+TRACKS_PAGE_SIZE = 50
+
+# a bracketed or dashed qualifier with one of these words names another edition of the same album
+_EDITION_WORDS = (
+    "anniversary",
+    "bonus",
+    "clean",
+    "deluxe",
+    "edition",
+    "expanded",
+    "explicit",
+    "remaster",
+    "remastered",
+    "version",
+)
+_EDITION = "[^()\\[\\]]*\\b(?:{})\\b[^()\\[\\]]*".format("|".join(_EDITION_WORDS))
+_QUALIFIER_PATTERN = re.compile("\\(({0})\\)|\\[({0})\\]|\\s-\\s({0})$".format(_EDITION))
+_SEPARATOR_PATTERN = re.compile("[\\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    """ Returns the title without case, accents, punctuation and edition qualifiers, e.g. 'Abbey Road (Remastered)',
+        'abbey road - 2019 Mix Deluxe Edition' and 'Abbey Road' are 'abbey road'
+    """
+    title = unicodedata.normalize("NFKD", title.casefold())
+    title = "".join(char for char in title if not unicodedata.combining(char))
+    title = _QUALIFIER_PATTERN.sub(" ", title)
+    return _SEPARATOR_PATTERN.sub(" ", title).strip()
+
+
+def dedupe_albums(albums: Iterable[dict], by_title: bool = True) -> List[dict]:
+    """ Returns the albums without the repeated IDs, and without the other editions of an album with the same
+        normalized title and album group, keeping the one with the most tracks at the position of the first one
+
+        Parameters:
+            - albums - album or simplified album objects, None items are skipped
+            - by_title - dedupe by normalized title too, else only by ID
+    """
+    by_id = collections.OrderedDict()
+    for album in albums:
+        if album is not None:
+            by_id.setdefault(album["id"], album)
+    if not by_title:
+        return list(by_id.values())
+
+    unique = collections.OrderedDict()
+    for album in by_id.values():
+        key = (album.get("album_group") or album.get("album_type"), normalize_title(album["name"]))
+        kept = unique.get(key)
+        if kept is None or album.get("total_tracks", 0) > kept.get("total_tracks", 0):
+            unique[key] = album
+    return list(unique.values())
+
+
+def _complete_tracks(sp, albums: Sequence[dict]) -> Dict[str, list]:
+    """ Returns the remaining tracks of the albums whose embedded page of tracks is truncated, by album ID
+    """
+    calls = [
+        (album["id"], offset)
+        for album in albums
+        if album["tracks"].get("next")
+        for offset in range(len(album["tracks"]["items"]), album["tracks"]["total"], TRACKS_PAGE_SIZE)
+    ]
+    if not calls:
+        return {}
+
+    def fetch(call):
+        return sp.album_tracks(call[0], limit=TRACKS_PAGE_SIZE, offset=call[1])["items"]
+
+    pages = sp._get_executor().map(fetch, calls) if len(calls) > 1 else map(fetch, calls)
+    remaining = collections.defaultdict(list)
+    for (album_id, _), items in zip(calls, pages):
+        remaining[album_id].extend(items)
+    return remaining
+
+
+def fetch_discography(
+    sp,
+    artist_id: str,
+    include_groups: Sequence[str] = ALBUM_GROUPS,
+    market: str = None,
+    dedupe_titles: bool = True,
+) -> List[dict]:
+    """ Returns the full album objects of an artist with all their tracks, in the order of artist_albums
+
+        Every album has the album_group of artist_albums. The returned albums are copies, the cached ones of a
+        catalog_cache are not changed.
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - artist_id - the artist ID, URI or URL
+            - include_groups - the album groups to include, see ALBUM_GROUPS
+            - market - an ISO 3166-1 alpha-2 country code or 'from_token', filters the albums of artist_albums
+            - dedupe_titles - keep only one edition of the albums with the same normalized title, see dedupe_albums
+    """
+    simplified = sp.fetch_all(sp.artist_albums, artist_id, include_groups=list(include_groups), market=market)
+    simplified = dedupe_albums(simplified, by_title=dedupe_titles)
+    full_albums = sp.albums([album["id"] for album in simplified])
+    groups = {album["id"]: album.get("album_group") for album in simplified}
+    full_albums = [album for album in full_albums if album is not None]
+
+    remaining = _complete_tracks(sp, full_albums)
+    discography = []
+    for album in full_albums:
+        tracks = album["tracks"]
+        if album["id"] in remaining:
+            tracks = dict(tracks, items=tracks["items"] + remaining[album["id"]], next=None)
+        discography.append(dict(album, album_group=groups[album["id"]], tracks=tracks))
+    return discography
@@ -20,3 +20,11 @@ class AuthorizationError(SpotifyRequestError):
 class RateLimitReached(SpotifyError):
     def __init__(self, retry_after: int):
         super().__init__("rate limit reached, retry after: {}".format(retry_after))
+        self.retry_after = retry_after
+
+
+class ProjectionError(SpotifyError):
+    def __init__(self, expression: str, errors: list):
+        super().__init__("response doesn't match the fields {}: {}".format(expression, ", ".join(errors[:10])))
+        self.expression = expression
+        self.errors = errors
@@ -0,0 +1,187 @@
+import functools
+import gzip
+import json
+import os
+from typing import BinaryIO
+from typing import Iterable
+from typing import Iterator
+from typing import Sequence
+from typing import Union
+
+from spotipy import decoders
+
+""" Streams paged endpoints to JSON Lines files, one item per line
+
+    The pages are fetched by Spotify.iter_all while the items are written, so at most max_concurrency pages are held
+    in memory however many items the source has. Paths ending with .gz are gzipped.
+
+    Example usage::
+
+        import spotipy.export
+        spotipy.export.export_saved_tracks(sp, "saved_tracks.jsonl.gz")
+        for item in spotipy.export.read_jsonl("saved_tracks.jsonl.gz"):
+            print(item["track"]["name"])
+"""
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# the lines are written in chunks of about this many bytes, so the writes and the gzip calls stay large
+_CHUNK_SIZE = 1 << 16
+
+if orjson is not None:
+    _dumps = orjson.dumps
+else:
+    _dumps = functools.partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+
+Destination = Union[str, os.PathLike, BinaryIO]
+
+
+def _encode(item) -> bytes:
+    line = _dumps(item)
+    return line if isinstance(line, bytes) else line.encode("utf-8")
+
+
+def _write_lines(items: Iterable, file: BinaryIO) -> int:
+    count = 0
+    chunk = []
+    size = 0
+    for item in items:
+        line = _encode(item)
+        chunk.append(line)
+        size += len(line) + 1
+        count += 1
+        if size >= _CHUNK_SIZE:
+            chunk.append(b"")
+            file.write(b"\n".join(chunk))
+            chunk = []
+            size = 0
+    if chunk:
+        chunk.append(b"")
+        file.write(b"\n".join(chunk))
+    return count
+
+
+def write_jsonl(items: Iterable, destination: Destination, compress: bool = None) -> int:
+    """ Writes every item as a line of JSON and returns the number of items
+
+        A path is written to a temporary file next to it which replaces the path once all the items were written,
+        so a failed export leaves no partial file.
+
+        Parameters:
+            - items - JSON serializable objects, consumed lazily
+            - destination - a path, or a binary file object which is left open
+            - compress - gzip the output. Default: when the path ends with .gz
+    """
+    if not isinstance(destination, (str, os.PathLike)):
+        if not compress:
+            return _write_lines(items, destination)
+        # closing the GzipFile writes the trailer, but leaves the file object open
+        with gzip.GzipFile(fileobj=destination, mode="wb") as file:
+            return _write_lines(items, file)
+
+    path = os.fspath(destination)
+    if compress is None:
+        compress = path.endswith(".gz")
+    temp_path = path + ".part"
+    try:
+        with open(temp_path, "wb") as file:
+            count = write_jsonl(items, file, compress)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
+
+
+def read_jsonl(source: Union[str, os.PathLike], compress: bool = None) -> Iterator:
+    """ Yields the items of a JSON Lines file, one line at a time
+
+        Parameters:
+            - source - a path
+            - compress - the file is gzipped. Default: when the path ends with .gz
+    """
+    path = os.fspath(source)
+    if compress is None:
+        compress = path.endswith(".gz")
+    loads = decoders.get_decoder()
+    with (gzip.open(path, "rb") if compress else open(path, "rb")) as file:
+        for line in file:
+            if line.strip():
+                yield loads(line)
+
+
+def export_saved_tracks(sp, destination: Destination, compress: bool = None, max_concurrency: int = None) -> int:
+    """ Writes the saved tracks of the current user and returns their number
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - destination - a path, or a binary file object
+            - compress - gzip the output. Default: when the path ends with .gz
+            - max_concurrency - the maximum number of pages requested and held at the same time
+    """
+    items = sp.iter_all(sp.current_user_saved_tracks, max_concurrency=max_concurrency)
+    return write_jsonl(items, destination, compress)
+
+
+def export_saved_albums(sp, destination: Destination, compress: bool = None, max_concurrency: int = None) -> int:
+    """ Writes the saved albums of the current user and returns their number, see export_saved_tracks
+    """
+    items = sp.iter_all(sp.current_user_saved_albums, max_concurrency=max_concurrency)
+    return write_jsonl(items, destination, compress)
+
+
+def export_playlist_tracks(
+    sp,
+    playlist_id: str,
+    destination: Destination,
+    fields: str = None,
+    market: str = None,
+    compress: bool = None,
+    max_concurrency: int = None,
+) -> int:
+    """ Writes the tracks of a playlist and returns their number
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - playlist_id - the playlist ID, URI or URL
+            - destination - a path, or a binary file object
+            - fields - which fields of the playlist tracks to return, see Spotify.playlist_tracks
+            - market - an ISO 3166-1 alpha-2 country code or 'from_token'
+            - compress - gzip the output. Default: when the path ends with .gz
+            - max_concurrency - the maximum number of pages requested and held at the same time
+    """
+    if isinstance(fields, str):
+        # the total of the first page lets iter_all request the other pages concurrently
+        fields = "{},total".format(fields)
+    items = sp.iter_all(sp.playlist_tracks, playlist_id, fields=fields, market=market, max_concurrency=max_concurrency)
+    return write_jsonl(items, destination, compress)
+
+
+def export_artist_albums(
+    sp,
+    artist_id: str,
+    destination: Destination,
+    include_groups: Union[str, Sequence[str]] = None,
+    market: str = None,
+    compress: bool = None,
+    max_concurrency: int = None,
+) -> int:
+    """ Writes the albums of an artist and returns their number
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - artist_id - the artist ID, URI or URL
+            - destination - a path, or a binary file object
+            - include_groups - 'album', 'single', 'appears_on', 'compilation'. Default: all of them
+            - market - an ISO 3166-1 alpha-2 country code or 'from_token'
+            - compress - gzip the output. Default: when the path ends with .gz
+            - max_concurrency - the maximum number of pages requested and held at the same time
+    """
+    items = sp.iter_all(
+        sp.artist_albums, artist_id, include_groups=include_groups, market=market, max_concurrency=max_concurrency
+    )
+    return write_jsonl(items, destination, compress)
@@ -0,0 +1,299 @@
+import bisect
+import functools
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+""" Parsing, validation and a compact 128-bit encoding of Spotify IDs
+
+    A Spotify ID is a 128-bit number written in 22 base62 characters. Stored as 16 bytes instead of a string,
+    an ID takes about a quarter of the memory, e.g. in an IdSet::
+
+        seen = spotipy.ids.IdSet(track_ids, "track")
+        if "spotify:track:4iV5W9uYEdYUVa79Axb7Rh" in seen:
+            ...
+
+    The bulk functions use NumPy when it's installed, it's imported on first use so importing spotipy doesn't.
+"""
+
+BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+ID_LENGTH = 22
+BYTES_LENGTH = 16
+
+# the types whose IDs are base62, user IDs are any string
+BASE62_TYPES = ("album", "artist", "episode", "playlist", "show", "track")
+
+_DIGITS = {char: digit for digit, char in enumerate(BASE62)}
+_MAX_VALUE = 1 << 128
+
+
+def parse(value: str) -> Tuple[Optional[str], str]:
+    """ Returns the type and the ID of a Spotify URI or URL, the type is None for an ID
+
+        Parameters:
+            - value - a Spotify URI (spotify:track:ID), URL (https://open.spotify.com/track/ID?si=...) or ID
+    """
+    fields = value.split(":")
+    if len(fields) < 3:
+        fields = value.split("?", 1)[0].rstrip("/").split("/")
+        if len(fields) < 3:
+            return None, value
+    return fields[-2], fields[-1]
+
+
+def to_id(spotify_type: str, value: str) -> str:
+    """ Returns the ID of a Spotify URI, URL or ID
+
+        Parameters:
+            - spotify_type - the expected type, e.g. 'track'. A URI or URL of another type raises ValueError
+            - value - a Spotify URI (spotify:track:ID), URL (https://open.spotify.com/track/ID?si=...) or ID
+    """
+    item_type, item_id = parse(value)
+    if item_type is not None and spotify_type != item_type:
+        raise ValueError("expected id of type {} but found type {} {}".format(spotify_type, item_type, value))
+    return item_id
+
+
+def to_uri(spotify_type: str, value: str) -> str:
+    """ Returns the Spotify URI of a URI, URL or ID
+    """
+    return "spotify:{}:{}".format(spotify_type, to_id(spotify_type, value))
+
+
+def is_valid_id(spotify_id: str) -> bool:
+    """ Returns whether the ID is 22 base62 characters of a 128-bit number
+    """
+    if len(spotify_id) != ID_LENGTH:
+        return False
+    number = 0
+    for char in spotify_id:
+        digit = _DIGITS.get(char)
+        if digit is None:
+            return False
+        number = number * 62 + digit
+    return number < _MAX_VALUE
+
+
+def encode(spotify_id: str) -> int:
+    """ Returns the 128-bit number of an ID, raises ValueError if it's not a valid ID
+    """
+    if len(spotify_id) != ID_LENGTH:
+        raise ValueError("invalid id {}".format(spotify_id))
+    number = 0
+    for char in spotify_id:
+        digit = _DIGITS.get(char)
+        if digit is None:
+            raise ValueError("invalid id {}".format(spotify_id))
+        number = number * 62 + digit
+    if number >= _MAX_VALUE:
+        raise ValueError("invalid id {}".format(spotify_id))
+    return number
+
+
+def decode(number: int) -> str:
+    """ Returns the ID of a 128-bit number
+    """
+    if not 0 <= number < _MAX_VALUE:
+        raise ValueError("{} is not a 128-bit number".format(number))
+    chars = []
+    for _ in range(ID_LENGTH):
+        number, digit = divmod(number, 62)
+        chars.append(BASE62[digit])
+    return "".join(reversed(chars))
+
+
+def to_bytes(spotify_id: str) -> bytes:
+    """ Returns the 16 bytes of an ID
+    """
+    return encode(spotify_id).to_bytes(BYTES_LENGTH, "big")
+
+
+def from_bytes(data: bytes) -> str:
+    """ Returns the ID of 16 bytes
+    """
+    return decode(int.from_bytes(data, "big"))
+
+
+def normalize_ids(values: Iterable[str], spotify_type: str, validate: bool = True) -> List[str]:
+    """ Returns the IDs of Spotify URIs, URLs or IDs
+
+        Parameters:
+            - values - the URIs, URLs or IDs
+            - spotify_type - the expected type, e.g. 'track'
+            - validate - raise ValueError listing the invalid IDs, for the types whose IDs are base62
+    """
+    result = []
+    for value in values:
+        # plain ids are the common case
+        if ":" in value or "/" in value:
+            value = to_id(spotify_type, value)
+        result.append(value)
+    if validate and spotify_type in BASE62_TYPES:
+        invalid = find_invalid_ids(result)
+        if invalid:
+            raise ValueError("invalid {} ids: {}".format(spotify_type, ", ".join(invalid[:10])))
+    return result
+
+
+def find_invalid_ids(spotify_ids: Sequence[str]) -> List[str]:
+    """ Returns the IDs that aren't 22 base62 characters of a 128-bit number
+    """
+    np = _numpy()
+    if np is None:
+        return [spotify_id for spotify_id in spotify_ids if not is_valid_id(spotify_id)]
+    _, valid = _encode_array(np, spotify_ids)
+    return [spotify_id for spotify_id, is_valid in zip(spotify_ids, valid) if not is_valid]
+
+
+def encode_ids(spotify_ids: Sequence[str]) -> bytes:
+    """ Returns the 16 bytes of every ID, concatenated. Raises ValueError if an ID is invalid
+    """
+    np = _numpy()
+    if np is None:
+        return b"".join(to_bytes(spotify_id) for spotify_id in spotify_ids)
+    encoded, valid = _encode_array(np, spotify_ids)
+    if not valid.all():
+        invalid = [spotify_id for spotify_id, is_valid in zip(spotify_ids, valid) if not is_valid]
+        raise ValueError("invalid ids: {}".format(", ".join(invalid[:10])))
+    return encoded.tobytes()
+
+
+def decode_ids(data: bytes) -> List[str]:
+    """ Returns the IDs of the result of encode_ids
+    """
+    if len(data) % BYTES_LENGTH:
+        raise ValueError("the length of data must be a multiple of {}".format(BYTES_LENGTH))
+    np = _numpy()
+    if np is None:
+        return [from_bytes(data[i : i + BYTES_LENGTH]) for i in range(0, len(data), BYTES_LENGTH)]
+    return _decode_array(np, np.frombuffer(data, np.uint8).reshape(-1, BYTES_LENGTH))
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """ Returns the numpy module, or None if it's not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.lru_cache(maxsize=None)
+def _tables() -> tuple:
+    """ Returns the arrays of ascii code -> base62 digit (255 for the other characters) and base62 digit -> ascii code
+    """
+    np = _numpy()
+    chars = np.frombuffer(BASE62.encode("ascii"), np.uint8)
+    digits = np.full(256, 255, np.uint8)
+    digits[chars] = np.arange(62, dtype=np.uint8)
+    return digits, chars
+
+
+def _encode_array(np, spotify_ids: Sequence[str]) -> tuple:
+    """ Returns the IDs as an (N, 16) uint8 array of big endian numbers, and a boolean array of the valid ones
+
+        The base62 digits are accumulated into four 32-bit limbs held in uint64, so the carry fits.
+    """
+    count = len(spotify_ids)
+    valid = np.fromiter((len(spotify_id) == ID_LENGTH for spotify_id in spotify_ids), bool, count)
+    padded = [spotify_id if is_valid else "0" * ID_LENGTH for spotify_id, is_valid in zip(spotify_ids, valid)]
+    chars = np.frombuffer("".join(padded).encode("ascii", "replace"), np.uint8).reshape(count, ID_LENGTH)
+    digits = _tables()[0][chars]
+    valid &= (digits != 255).all(axis=1)
+
+    limbs = np.zeros((count, 4), np.uint64)
+    overflow = np.zeros(count, bool)
+    for position in range(ID_LENGTH):
+        carry = digits[:, position].astype(np.uint64)
+        for limb in range(3, -1, -1):
+            value = limbs[:, limb] * np.uint64(62) + carry
+            limbs[:, limb] = value & np.uint64(0xFFFFFFFF)
+            carry = value >> np.uint64(32)
+        overflow |= carry != 0
+    valid &= ~overflow
+    return limbs.astype(">u4").view(np.uint8).reshape(count, BYTES_LENGTH), valid
+
+
+def _decode_array(np, encoded: "np.ndarray") -> List[str]:
+    count = len(encoded)
+    limbs = np.ascontiguousarray(encoded).view(">u4").reshape(count, 4).astype(np.uint64)
+    digits = np.empty((count, ID_LENGTH), np.uint8)
+    for position in range(ID_LENGTH - 1, -1, -1):
+        remainder = np.zeros(count, np.uint64)
+        for limb in range(4):
+            value = (remainder << np.uint64(32)) | limbs[:, limb]
+            limbs[:, limb] = value // np.uint64(62)
+            remainder = value % np.uint64(62)
+        digits[:, position] = remainder
+    text = _tables()[1][digits].tobytes().decode("ascii")
+    return [text[i : i + ID_LENGTH] for i in range(0, len(text), ID_LENGTH)]
+
+
+class _Keys:
+    """ The 16 bytes keys of a sorted blob, as a sequence bisect can search
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data) // BYTES_LENGTH
+
+    def __getitem__(self, index: int) -> bytes:
+        start = index * BYTES_LENGTH
+        return self.data[start : start + BYTES_LENGTH]
+
+
+class IdSet:
+    """
+    An immutable set of IDs of one type, stored as 16 sorted bytes per ID.
+
+    Membership takes a binary search, and takes IDs, URIs or URLs.
+    """
+
+    def __init__(self, values: Iterable[str] = (), spotify_type: str = "track"):
+        """
+            Parameters:
+                - values - Spotify IDs, URIs or URLs
+                - spotify_type - the type of the IDs, one of BASE62_TYPES
+        """
+        self.spotify_type = spotify_type
+        encoded = encode_ids(normalize_ids(values, spotify_type, validate=False))
+        np = _numpy()
+        if np is not None:
+            self._data = np.unique(np.frombuffer(encoded, "S16")).tobytes()
+            # NumPy's binary search is several times faster than bisect over _Keys
+            self._keys = np.frombuffer(self._data, "S16")
+        else:
+            keys = sorted({encoded[i : i + BYTES_LENGTH] for i in range(0, len(encoded), BYTES_LENGTH)})
+            self._data = b"".join(keys)
+            self._keys = _Keys(self._data)
+
+    def __len__(self):
+        return len(self._data) // BYTES_LENGTH
+
+    def __contains__(self, value: str) -> bool:
+        try:
+            key = to_bytes(to_id(self.spotify_type, value))
+        except ValueError:
+            return False
+        if isinstance(self._keys, _Keys):
+            index = bisect.bisect_left(self._keys, key)
+        else:
+            index = int(self._keys.searchsorted(key))
+        # compared on the blob, the items of an S16 array drop their trailing zero bytes
+        start = index * BYTES_LENGTH
+        return self._data[start : start + BYTES_LENGTH] == key
+
+    def __iter__(self):
+        return iter(decode_ids(self._data))
+
+    @property
+    def nbytes(self) -> int:
+        """ The number of bytes the IDs take
+        """
+        return len(self._data)
@@ -0,0 +1,263 @@
+import collections
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Sequence
+
+""" Mirrors the saved tracks and albums of users to a SQLite database, reading only what changed since the last sync
+
+    The saved items are listed newest first, so a sync reads pages until it reaches an item it already has, usually
+    on the first page. The removed items are found with the contains endpoints: all of them when the total of the
+    first page disagrees with the mirror, and a rotating sample of check_removals items otherwise.
+
+    Example usage::
+
+        import spotipy.library
+        mirror = spotipy.library.LibraryMirror("/var/lib/spotipy/library.db")
+        results = mirror.sync(sp, user_id)
+        print(results["track"].added, results["track"].removed, results["track"].requests)
+        for item in mirror.items(user_id, "track"):
+            print(item["added_at"], item["track"]["name"])
+"""
+
+SavedKind = collections.namedtuple("SavedKind", ["method", "contains", "max_contains_ids"])
+
+# kind -> the paged method of the client, its contains method and the maximum number of ids of a contains request
+SAVED_KINDS = {
+    "track": SavedKind("current_user_saved_tracks", "current_user_saved_tracks_contains", 50),
+    "album": SavedKind("current_user_saved_albums", "current_user_saved_albums_contains", 20),
+}
+
+# the maximum page size of the saved tracks and albums endpoints
+PAGE_SIZE = 50
+
+SyncResult = collections.namedtuple("SyncResult", ["added", "removed", "requests"])
+
+
+def _pages(count: int) -> int:
+    return max(-(-count // PAGE_SIZE), 1)
+
+
+def _unique(items: Iterable[dict], kind: str) -> List[dict]:
+    """ Returns the first item of every id, an item is listed twice when an item was saved between two pages
+    """
+    unique = collections.OrderedDict()
+    for item in items:
+        unique.setdefault(item[kind]["id"], item)
+    return list(unique.values())
+
+
+class LibraryMirror:
+    """
+    The saved items of users, stored in a SQLite database file in WAL mode, so other processes can read it while it's
+    synced. Every sync is written in a single transaction, an interrupted sync leaves the mirror as it was.
+    """
+
+    def __init__(self, path: str, timeout: float = 30):
+        """
+            Parameters:
+                - path - the path of the database file, created if it doesn't exist
+                - timeout - how many seconds to wait for another connection to release a lock
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS saved ("
+                "user_id TEXT NOT NULL, kind TEXT NOT NULL, id TEXT NOT NULL, added_at TEXT NOT NULL, "
+                "sequence INTEGER NOT NULL, checked_at REAL NOT NULL, item TEXT NOT NULL, "
+                "PRIMARY KEY (user_id, kind, id))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS saved_sequence ON saved (user_id, kind, sequence)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, every thread opens its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """ Closes the connection of the calling thread
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def items(self, user_id: str, kind: str) -> Iterator[dict]:
+        """ Yields the saved items of a user as returned by the API, newest first
+
+            Parameters:
+                - user_id - the id of the user
+                - kind - 'track' or 'album'
+        """
+        rows = self._connection().execute(
+            "SELECT item FROM saved WHERE user_id = ? AND kind = ? ORDER BY sequence DESC", (user_id, kind)
+        )
+        for (item,) in rows:
+            yield json.loads(item)
+
+    def ids(self, user_id: str, kind: str) -> List[str]:
+        """ Returns the ids of the saved items of a user, newest first, see items
+        """
+        rows = self._connection().execute(
+            "SELECT id FROM saved WHERE user_id = ? AND kind = ? ORDER BY sequence DESC", (user_id, kind)
+        )
+        return [item_id for (item_id,) in rows]
+
+    def count(self, user_id: str, kind: str) -> int:
+        """ Returns the number of saved items of a user, see items
+        """
+        query = "SELECT COUNT(*) FROM saved WHERE user_id = ? AND kind = ?"
+        return self._connection().execute(query, (user_id, kind)).fetchone()[0]
+
+    def sync(
+        self, sp, user_id: str, kinds: Iterable[str] = tuple(SAVED_KINDS), check_removals: int = 0
+    ) -> Dict[str, SyncResult]:
+        """ Syncs the saved items of the current user of sp, and returns the SyncResult of every kind
+
+            An unchanged library takes one request per kind.
+
+            Parameters:
+                - sp - a spotipy.Spotify object authorized by the user
+                - user_id - the id of the user, the items are stored under it
+                - kinds - 'track', 'album' or both
+                - check_removals - the number of items, least recently checked first, whose removal is checked
+                  with the contains endpoint even when the total shows no removal
+        """
+        return {kind: self.sync_kind(sp, user_id, kind, check_removals) for kind in kinds}
+
+    def sync_kind(self, sp, user_id: str, kind: str, check_removals: int = 0) -> SyncResult:
+        """ Syncs the saved items of one kind, see sync
+        """
+        saved_kind = SAVED_KINDS[kind]
+        method = getattr(sp, saved_kind.method)
+        connection = self._connection()
+        stored = dict(
+            connection.execute("SELECT id, added_at FROM saved WHERE user_id = ? AND kind = ?", (user_id, kind))
+        )
+        if not stored:
+            return self._resync(sp, user_id, kind, stored, 0)
+
+        # newest first, the items after the first known one were already mirrored
+        new_items = []
+        requests = 0
+        offset = 0
+        total = None
+        while True:
+            page = method(limit=PAGE_SIZE, offset=offset)
+            requests += 1
+            if total is None:
+                total = page["total"]
+            known = False
+            for item in page["items"]:
+                if stored.get(item[kind]["id"]) == item["added_at"]:
+                    known = True
+                    break
+                new_items.append(item)
+            if known or not page.get("next"):
+                break
+            offset += PAGE_SIZE
+
+        new_items = _unique(new_items, kind)
+        new_ids = {item[kind]["id"] for item in new_items}
+        candidates = [item_id for item_id in stored if item_id not in new_ids]
+        if total != len(candidates) + len(new_ids):
+            checked = candidates
+        elif check_removals:
+            checked = self._least_recently_checked(user_id, kind, new_ids, check_removals)
+        else:
+            checked = []
+        removed, contains_requests = self._find_removed(sp, saved_kind, checked)
+        requests += contains_requests
+
+        if total != len(candidates) - len(removed) + len(new_ids):
+            # the mirror is missing older items, e.g. the library changed while the previous sync read it
+            return self._resync(sp, user_id, kind, stored, requests)
+
+        self._update(user_id, kind, new_items, removed, checked)
+        return SyncResult(len(new_ids), len(removed), requests)
+
+    def _resync(self, sp, user_id: str, kind: str, stored: dict, requests: int) -> SyncResult:
+        items = _unique(sp.iter_all(getattr(sp, SAVED_KINDS[kind].method)), kind)
+        self._replace(user_id, kind, items)
+        item_ids = {item[kind]["id"] for item in items}
+        added = sum(1 for item in items if stored.get(item[kind]["id"]) != item["added_at"])
+        removed = sum(1 for item_id in stored if item_id not in item_ids)
+        return SyncResult(added, removed, requests + _pages(len(items)))
+
+    def _least_recently_checked(self, user_id: str, kind: str, excluded: set, limit: int) -> List[str]:
+        rows = self._connection().execute(
+            "SELECT id FROM saved WHERE user_id = ? AND kind = ? ORDER BY checked_at LIMIT ?",
+            (user_id, kind, limit + len(excluded)),
+        )
+        return [item_id for (item_id,) in rows if item_id not in excluded][:limit]
+
+    @staticmethod
+    def _find_removed(sp, saved_kind: SavedKind, item_ids: Sequence[str]) -> tuple:
+        """ Returns the item ids which are no longer saved, and the number of requests it took
+        """
+        contains = getattr(sp, saved_kind.contains)
+        size = saved_kind.max_contains_ids
+        chunks = [item_ids[i : i + size] for i in range(0, len(item_ids), size)]
+        if len(chunks) > 1:
+            results = sp._get_executor().map(contains, chunks)
+        else:
+            results = map(contains, chunks)
+        removed = [
+            item_id for chunk, result in zip(chunks, results) for item_id, saved in zip(chunk, result) if not saved
+        ]
+        return removed, len(chunks)
+
+    @staticmethod
+    def _rows(user_id: str, kind: str, items: Sequence[dict], first_sequence: int, now: float) -> list:
+        # the items are newest first, the newest gets the highest sequence
+        return [
+            (
+                user_id,
+                kind,
+                item[kind]["id"],
+                item["added_at"],
+                first_sequence + len(items) - i,
+                now,
+                json.dumps(item, separators=(",", ":")),
+            )
+            for i, item in enumerate(items)
+        ]
+
+    def _replace(self, user_id: str, kind: str, items: Sequence[dict]):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM saved WHERE user_id = ? AND kind = ?", (user_id, kind))
+            connection.executemany(
+                "INSERT INTO saved VALUES (?, ?, ?, ?, ?, ?, ?)", self._rows(user_id, kind, items, 0, time.time())
+            )
+
+    def _update(self, user_id: str, kind: str, new_items: Sequence[dict], removed: Sequence[str], checked: list):
+        now = time.time()
+        with self._connection() as connection:
+            connection.executemany(
+                "DELETE FROM saved WHERE user_id = ? AND kind = ? AND id = ?",
+                [(user_id, kind, item_id) for item_id in removed],
+            )
+            connection.executemany(
+                "UPDATE saved SET checked_at = ? WHERE user_id = ? AND kind = ? AND id = ?",
+                [(now, user_id, kind, item_id) for item_id in checked],
+            )
+            if new_items:
+                last_sequence = connection.execute(
+                    "SELECT COALESCE(MAX(sequence), 0) FROM saved WHERE user_id = ? AND kind = ?", (user_id, kind)
+                ).fetchone()[0]
+                connection.executemany(
+                    "INSERT OR REPLACE INTO saved VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._rows(user_id, kind, new_items, last_sequence, now),
+                )
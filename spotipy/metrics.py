@@ -0,0 +1,173 @@
+import bisect
+import collections
+import threading
+from urllib.parse import urlparse
+
+RequestEvent = collections.namedtuple(
+    "RequestEvent", ["method", "endpoint", "status", "latency", "response_bytes", "retries", "cache_hit"]
+)
+RequestEvent.__doc__ = """ Describes a finished request, passed to RequestHook.after_response
+
+    - method - the HTTP method
+    - endpoint - the normalized endpoint template, e.g. playlists/{id}/tracks
+    - status - the HTTP status code, None if no response was received
+    - latency - seconds from the first attempt until the final response, including retries
+    - response_bytes - the size of the response body
+    - retries - the number of times the request was retried
+    - cache_hit - true when the API answered 304 Not Modified and the cached response was returned
+"""
+
+EndpointStats = collections.namedtuple(
+    "EndpointStats", ["requests", "errors", "cache_hits", "retries", "response_bytes", "p50", "p95", "p99", "max"]
+)
+
+# the path segments that are followed by an id, except under me/
+_ID_COLLECTIONS = {
+    "albums",
+    "artists",
+    "audio-analysis",
+    "audio-features",
+    "categories",
+    "playlists",
+    "tracks",
+    "users",
+}
+
+
+def normalize_endpoint(url: str) -> str:
+    """ Returns the endpoint template of a request url, with the ids replaced by {id}
+
+        e.g. https://api.spotify.com/v1/playlists/37i9dQZF1DXcBWIGoYBM5M/tracks?offset=100 -> playlists/{id}/tracks
+    """
+    path = urlparse(url).path.strip("/")
+    if path.startswith("v1/"):
+        path = path[3:]
+    segments = path.split("/")
+    if segments[0] != "me":
+        for i in range(1, len(segments)):
+            if segments[i - 1] in _ID_COLLECTIONS:
+                segments[i] = "{id}"
+    return "/".join(segments)
+
+
+class RequestHook:
+    """
+    Base class of the objects that observe the requests of a Spotify object, passed with its hooks parameter.
+    The hooks are called on the thread (or event loop) that sends the request, so they should be quick.
+    """
+
+    def before_request(self, method: str, endpoint: str):
+        """ Called before a request is sent, with the HTTP method and the normalized endpoint template
+        """
+
+    def after_response(self, event: RequestEvent):
+        """ Called once a request is done, including requests that failed or raised
+        """
+
+
+class LatencyHistogram:
+    """
+    A thread safe histogram of latencies with logarithmic buckets, each bucket is 20% wider than the previous one.
+    Percentiles are estimated by the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self, min_latency: float = 0.0005, max_latency: float = 120, growth: float = 1.2):
+        bounds = [min_latency]
+        while bounds[-1] < max_latency:
+            bounds.append(bounds[-1] * growth)
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._total = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, latency: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self._bounds, latency)] += 1
+            self._total += 1
+            if latency > self._max:
+                self._max = latency
+
+    def percentile(self, percent: float) -> float:
+        with self._lock:
+            if not self._total:
+                return 0.0
+            rank = self._total * percent / 100
+            count = 0
+            for i, bucket_count in enumerate(self._counts):
+                count += bucket_count
+                if count >= rank:
+                    return min(self._bounds[i], self._max) if i < len(self._bounds) else self._max
+            return self._max
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    def __len__(self):
+        return self._total
+
+
+class _EndpointMetrics:
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.response_bytes = 0
+
+
+class MetricsCollector(RequestHook):
+    """
+    A RequestHook that aggregates the requests per method and endpoint:
+    request, error, cache hit and retry counts, response bytes and a latency histogram.
+
+    Example usage::
+
+        collector = spotipy.metrics.MetricsCollector()
+        sp = spotipy.Spotify(auth_provider, hooks=[collector])
+        ...
+        for (method, endpoint), stats in collector.snapshot().items():
+            print(method, endpoint, stats.requests, stats.p95)
+    """
+
+    def __init__(self):
+        self._endpoints = collections.defaultdict(_EndpointMetrics)
+        self._lock = threading.Lock()
+
+    def after_response(self, event: RequestEvent):
+        with self._lock:
+            metrics = self._endpoints[event.method, event.endpoint]
+            metrics.requests += 1
+            if event.status is None or event.status >= 400:
+                metrics.errors += 1
+            if event.cache_hit:
+                metrics.cache_hits += 1
+            metrics.retries += event.retries
+            metrics.response_bytes += event.response_bytes
+        metrics.histogram.add(event.latency)
+
+    def snapshot(self) -> dict:
+        """ Returns a dict of (method, endpoint) to EndpointStats, latencies are in seconds
+        """
+        with self._lock:
+            endpoints = list(self._endpoints.items())
+        return {
+            key: EndpointStats(
+                metrics.requests,
+                metrics.errors,
+                metrics.cache_hits,
+                metrics.retries,
+                metrics.response_bytes,
+                metrics.histogram.percentile(50),
+                metrics.histogram.percentile(95),
+                metrics.histogram.percentile(99),
+                metrics.histogram.max,
+            )
+            for key, metrics in endpoints
+        }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
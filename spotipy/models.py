@@ -0,0 +1,380 @@
+import collections
+import sys
+import threading
+from typing import Sequence
+
+""" Lightweight typed models of the main objects returned by Spotify
+
+    The models are opt-in, build them from the dicts the Spotify methods return::
+
+        track = spotipy.models.Track.from_dict(sp.track(track_id))
+        page = spotipy.models.Paging.from_dict(sp.playlist_tracks(playlist_id), spotipy.models.PlaylistTrack)
+
+    They use __slots__ instead of a dict per object, intern the repeated strings (types, market codes, genres)
+    and share the identical tuples of markets and genres between objects, up to the 4096 most recently used tuples.
+    Nested objects (the album of a track, the artists of an album...) are kept as dicts until they're first accessed.
+"""
+
+_ABSENT = object()
+
+# identical tuples of interned strings, e.g. available markets, shared by all the models. The least recently used
+# ones are dropped past _MAX_SHARED_TUPLES, the models keep theirs.
+_shared_tuples = collections.OrderedDict()
+_shared_tuples_lock = threading.Lock()
+_MAX_SHARED_TUPLES = 4096
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        values = tuple(value)
+        with _shared_tuples_lock:
+            shared = _shared_tuples.get(values)
+            if shared is None:
+                shared = tuple(sys.intern(item) if isinstance(item, str) else item for item in values)
+                _shared_tuples[shared] = shared
+                while len(_shared_tuples) > _MAX_SHARED_TUPLES:
+                    _shared_tuples.popitem(last=False)
+            else:
+                _shared_tuples.move_to_end(values)
+        return shared
+    return value
+
+
+def _to_raw(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_to_raw(item) for item in value]
+    return value
+
+
+class _Lazy:
+    """ A nested model field, converted from its dict on first access
+    """
+
+    def __init__(self, model: str, many: bool = False, item_model: str = None):
+        self.model = model
+        self.many = many
+        self.item_model = item_model
+        self.slot = None
+
+    def __set_name__(self, owner, name):
+        self.slot = "_" + name
+
+    def _convert(self, value):
+        model = globals()[self.model]
+        if self.item_model is not None:
+            return model.from_dict(value, globals()[self.item_model])
+        return model.from_dict(value)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if self.many and isinstance(value, list):
+            value = tuple(self._convert(item) for item in value)
+            setattr(instance, self.slot, value)
+        elif not self.many and isinstance(value, dict):
+            value = self._convert(value)
+            setattr(instance, self.slot, value)
+        return value
+
+
+class Model:
+    """
+    Base class of the models.
+
+    - _fields - the keys copied as is
+    - _interned - the keys whose strings, or lists of strings, are interned
+    - _lazy - the keys of the nested objects, converted on first access by a _Lazy attribute of the same name
+    """
+
+    __slots__ = ("_absent",)
+    _fields = ()
+    _interned = ()
+    _lazy = ()
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """ Returns a model of the object, or None if data is None
+        """
+        if data is None:
+            return None
+        model = cls.__new__(cls)
+        get = data.get
+        absent = []
+        for name in cls._fields:
+            value = get(name, _ABSENT)
+            if value is _ABSENT:
+                absent.append(name)
+                value = None
+            setattr(model, name, value)
+        for name in cls._interned:
+            value = get(name, _ABSENT)
+            if value is _ABSENT:
+                absent.append(name)
+                value = None
+            setattr(model, name, _intern(value))
+        for name in cls._lazy:
+            value = get(name, _ABSENT)
+            if value is _ABSENT:
+                absent.append(name)
+                value = None
+            setattr(model, "_" + name, value)
+        # the keys the object didn't have, so to_dict returns the same keys
+        model._absent = _intern(absent)
+        return model
+
+    @classmethod
+    def from_dicts(cls, items: Sequence[dict]) -> list:
+        return [cls.from_dict(item) for item in items]
+
+    def to_dict(self) -> dict:
+        """ Returns the object as the dict the API returned
+        """
+        result = {}
+        for name in self._fields:
+            result[name] = getattr(self, name)
+        for name in self._interned:
+            value = getattr(self, name)
+            result[name] = list(value) if isinstance(value, tuple) else value
+        for name in self._lazy:
+            result[name] = _to_raw(getattr(self, "_" + name))
+        for name in self._absent:
+            del result[name]
+        return result
+
+    def __repr__(self):
+        name = getattr(self, "name", None)
+        if name is not None:
+            return "{}(id={!r}, name={!r})".format(type(self).__name__, getattr(self, "id", None), name)
+        return "{}(id={!r})".format(type(self).__name__, getattr(self, "id", None))
+
+
+class Artist(Model):
+    """ A full or simplified artist, the fields a simplified artist doesn't have are None
+    """
+
+    __slots__ = ("id", "name", "uri", "href", "external_urls", "followers", "images", "popularity", "type", "genres")
+    _fields = ("id", "name", "uri", "href", "external_urls", "followers", "images", "popularity")
+    _interned = ("type", "genres")
+
+
+class SimplifiedTrack(Model):
+    __slots__ = (
+        "id",
+        "name",
+        "uri",
+        "href",
+        "disc_number",
+        "duration_ms",
+        "explicit",
+        "external_urls",
+        "is_local",
+        "is_playable",
+        "linked_from",
+        "preview_url",
+        "restrictions",
+        "track_number",
+        "type",
+        "available_markets",
+        "_artists",
+    )
+    _fields = (
+        "id",
+        "name",
+        "uri",
+        "href",
+        "disc_number",
+        "duration_ms",
+        "explicit",
+        "external_urls",
+        "is_local",
+        "is_playable",
+        "linked_from",
+        "preview_url",
+        "restrictions",
+        "track_number",
+    )
+    _interned = ("type", "available_markets")
+    _lazy = ("artists",)
+
+    artists = _Lazy("Artist", many=True)
+
+
+class Track(SimplifiedTrack):
+    __slots__ = ("external_ids", "popularity", "_album")
+    _fields = SimplifiedTrack._fields + ("external_ids", "popularity")
+    _lazy = SimplifiedTrack._lazy + ("album",)
+
+    album = _Lazy("Album")
+
+
+class Album(Model):
+    """ A full or simplified album, the fields a simplified album doesn't have are None
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "uri",
+        "href",
+        "copyrights",
+        "external_ids",
+        "external_urls",
+        "images",
+        "label",
+        "popularity",
+        "release_date",
+        "total_tracks",
+        "type",
+        "album_type",
+        "album_group",
+        "release_date_precision",
+        "available_markets",
+        "genres",
+        "_artists",
+        "_tracks",
+    )
+    _fields = (
+        "id",
+        "name",
+        "uri",
+        "href",
+        "copyrights",
+        "external_ids",
+        "external_urls",
+        "images",
+        "label",
+        "popularity",
+        "release_date",
+        "total_tracks",
+    )
+    _interned = ("type", "album_type", "album_group", "release_date_precision", "available_markets", "genres")
+    _lazy = ("artists", "tracks")
+
+    artists = _Lazy("Artist", many=True)
+    tracks = _Lazy("Paging", item_model="SimplifiedTrack")
+
+
+class PlaylistTrack(Model):
+    __slots__ = ("added_at", "added_by", "is_local", "_track")
+    _fields = ("added_at", "added_by", "is_local")
+    _lazy = ("track",)
+
+    track = _Lazy("Track")
+
+
+class Playlist(Model):
+    """ A full or simplified playlist, the tracks of a simplified playlist is a Paging without items
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "uri",
+        "href",
+        "collaborative",
+        "description",
+        "external_urls",
+        "followers",
+        "images",
+        "owner",
+        "public",
+        "snapshot_id",
+        "type",
+        "_tracks",
+    )
+    _fields = (
+        "id",
+        "name",
+        "uri",
+        "href",
+        "collaborative",
+        "description",
+        "external_urls",
+        "followers",
+        "images",
+        "owner",
+        "public",
+        "snapshot_id",
+    )
+    _interned = ("type",)
+    _lazy = ("tracks",)
+
+    tracks = _Lazy("Paging", item_model="PlaylistTrack")
+
+
+class Paging(Model):
+    """ A page of items, the items are models of item_model, or dicts if it's None
+    """
+
+    __slots__ = ("href", "limit", "offset", "total", "next", "previous", "item_model", "_items")
+    _fields = ("href", "limit", "offset", "total", "next", "previous")
+    _lazy = ("items",)
+
+    @classmethod
+    def from_dict(cls, data: dict, item_model: type = None):
+        model = super().from_dict(data)
+        if model is not None:
+            model.item_model = item_model
+        return model
+
+    @property
+    def items(self) -> tuple:
+        items = self._items
+        if isinstance(items, list):
+            if self.item_model is not None:
+                items = tuple(self.item_model.from_dict(item) for item in items)
+            else:
+                items = tuple(items)
+            self._items = items
+        return items or ()
+
+    def __repr__(self):
+        return "Paging(offset={!r}, limit={!r}, total={!r})".format(self.offset, self.limit, self.total)
+
+
+class AudioFeatures(Model):
+    __slots__ = (
+        "id",
+        "uri",
+        "track_href",
+        "analysis_url",
+        "duration_ms",
+        "acousticness",
+        "danceability",
+        "energy",
+        "instrumentalness",
+        "key",
+        "liveness",
+        "loudness",
+        "mode",
+        "speechiness",
+        "tempo",
+        "time_signature",
+        "valence",
+        "type",
+    )
+    _fields = (
+        "id",
+        "uri",
+        "track_href",
+        "analysis_url",
+        "duration_ms",
+        "acousticness",
+        "danceability",
+        "energy",
+        "instrumentalness",
+        "key",
+        "liveness",
+        "loudness",
+        "mode",
+        "speechiness",
+        "tempo",
+        "time_signature",
+        "valence",
+    )
+    _interned = ("type",)
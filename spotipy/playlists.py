@@ -0,0 +1,493 @@
+import collections
+import difflib
+import hashlib
+import itertools
+import json
+import os
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from spotipy import exceptions
+from spotipy import ids
+from spotipy import projection
+
+""" Synchronizes a playlist with a list of tracks in a few writes
+
+    The plan removes, moves and adds only the tracks that differ from the longest common subsequence of the
+    current and the desired tracks, so a small edit of a large playlist takes a few requests instead of
+    rewriting it, and the tracks that stay keep their added_at.
+
+    Example usage::
+
+        import spotipy.playlists
+        result = spotipy.playlists.sync_playlist(sp, playlist_id, track_uris)
+        print(len(result.operations), result.snapshot_id)
+
+    add_tracks, replace_tracks, remove_all_occurrences and remove_specific_occurrences write any number of tracks
+    in chunks of 100, and resume an interrupted write from a checkpoint file::
+
+        spotipy.playlists.add_tracks(sp, playlist_id, track_uris, checkpoint="add_tracks.json")
+"""
+
+# the maximum number of tracks of a request that adds, replaces or removes tracks
+MAX_TRACKS_PER_REQUEST = 100
+
+# above this number of differences the diff falls back to difflib, which is faster but not always minimal
+MAX_EDIT_DISTANCE = 1000
+
+# removes the tracks at the positions, tracks is a list of {"uri": uri, "positions": [...]}
+Remove = collections.namedtuple("Remove", ["tracks"])
+# moves range_length tracks from range_start to before insert_before
+Move = collections.namedtuple("Move", ["range_start", "range_length", "insert_before"])
+# inserts the tracks at the position, or appends them if it's None
+Add = collections.namedtuple("Add", ["uris", "position"])
+# replaces all the tracks
+Replace = collections.namedtuple("Replace", ["uris"])
+# removes all the occurrences of the tracks
+RemoveAll = collections.namedtuple("RemoveAll", ["uris"])
+
+SyncResult = collections.namedtuple("SyncResult", ["snapshot_id", "operations"])
+
+_PLAYLIST_STATE = projection.Projection(["snapshot_id"])
+_TRACK_URIS = projection.Projection.page(["track.uri"])
+
+
+def _chunks(items: Sequence, size: int = MAX_TRACKS_PER_REQUEST) -> List[Sequence]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _myers(a: Sequence, b: Sequence, max_distance: int) -> Optional[List[Tuple[int, int]]]:
+    """ Returns the matched (index in a, index in b) pairs of a longest common subsequence, in O((N+M)D),
+        or None if more than max_distance insertions and deletions are needed
+    """
+    n, m = len(a), len(b)
+    v = {1: 0}
+    trace = []
+    for distance in range(max_distance + 1):
+        trace.append(dict(v))
+        for k in range(-distance, distance + 1, 2):
+            if k == -distance or (k != distance and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace: List[Dict[int, int]], x: int, y: int) -> List[Tuple[int, int]]:
+    pairs = []
+    for distance in range(len(trace) - 1, -1, -1):
+        v = trace[distance]
+        k = x - y
+        if k == -distance or (k != distance and v[k - 1] < v[k + 1]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[previous_k]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            pairs.append((x, y))
+        x, y = previous_x, previous_y
+    pairs.reverse()
+    return pairs
+
+
+def longest_common_subsequence(
+    a: Sequence, b: Sequence, max_distance: int = MAX_EDIT_DISTANCE
+) -> List[Tuple[int, int]]:
+    """ Returns the (index in a, index in b) pairs of the items a and b have in common, in order
+
+        The common prefix and suffix are trimmed first. The rest is diffed with Myers' algorithm when it takes
+        at most max_distance insertions and deletions, and with difflib otherwise.
+    """
+    prefix = 0
+    while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < len(a) - prefix and suffix < len(b) - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    middle_a = a[prefix : len(a) - suffix]
+    middle_b = b[prefix : len(b) - suffix]
+
+    middle = _myers(middle_a, middle_b, max_distance)
+    if middle is None:
+        matcher = difflib.SequenceMatcher(None, middle_a, middle_b, autojunk=False)
+        middle = [(i + offset, j + offset) for i, j, size in matcher.get_matching_blocks() for offset in range(size)]
+
+    pairs = [(i, i) for i in range(prefix)]
+    pairs.extend((i + prefix, j + prefix) for i, j in middle)
+    pairs.extend((len(a) - suffix + i, len(b) - suffix + i) for i in range(suffix))
+    return pairs
+
+
+def _removals(occurrences: Iterable[Tuple[int, str]]) -> List[Remove]:
+    """ Returns the Remove operations of the (position, uri) pairs, from the last position, so the positions of
+        the next operations don't change
+    """
+    operations = []
+    for chunk in _chunks(sorted(occurrences, reverse=True)):
+        tracks = collections.OrderedDict()
+        for position, uri in chunk:
+            tracks.setdefault(uri, []).append(position)
+        operations.append(Remove([{"uri": uri, "positions": positions} for uri, positions in tracks.items()]))
+    return operations
+
+
+def _move(state: list, operation: Move):
+    start, length, insert_before = operation
+    moved = state[start : start + length]
+    del state[start : start + length]
+    if insert_before > start:
+        insert_before -= length
+    state[insert_before:insert_before] = moved
+
+
+def plan_sync(current: Sequence[str], desired: Sequence[str], max_distance: int = MAX_EDIT_DISTANCE) -> list:
+    """ Returns the operations which turn the current tracks into the desired ones
+
+        The tracks of the longest common subsequence stay, the others are removed, moved or added. The plan
+        rewrites the playlist with a Replace and Adds instead when that takes fewer requests.
+
+        Parameters:
+            - current - the URIs of the tracks of the playlist
+            - desired - the URIs of the tracks the playlist should have
+            - max_distance - see longest_common_subsequence
+    """
+    current, desired = list(current), list(desired)
+    pairs = longest_common_subsequence(current, desired, max_distance)
+    # the tokens of the tracks are their index in current, additions have none
+    target = [None] * len(desired)
+    for i, j in pairs:
+        target[j] = i
+
+    # a track which is both removed and added is moved instead
+    kept = {i for i, _ in pairs}
+    removed = collections.defaultdict(collections.deque)
+    for i, uri in enumerate(current):
+        if i not in kept:
+            removed[uri].append(i)
+    moved = set()
+    for j, uri in enumerate(desired):
+        if target[j] is None and removed.get(uri):
+            target[j] = removed[uri].popleft()
+            moved.add(target[j])
+
+    rewrite = [Replace(desired[:MAX_TRACKS_PER_REQUEST])]
+    rewrite.extend(Add(uris, None) for uris in _chunks(desired[MAX_TRACKS_PER_REQUEST:]))
+    # a rewrite can't write local files and unavailable tracks, the pinned items must stay where they are
+    rewrite_cost = float("inf") if any(map(_is_pinned, itertools.chain(current, desired))) else len(rewrite)
+    operations = _removals((i, current[i]) for positions in removed.values() for i in positions)
+    if len(operations) > rewrite_cost:
+        return rewrite
+
+    # every moved track is put right after its predecessor in the desired order, which is already in place
+    state = [i for i in range(len(current)) if i in kept or i in moved]
+    order = [token for token in target if token is not None]
+    placed = set()
+    for index, token in enumerate(order):
+        if token not in moved or token in placed:
+            continue
+        start = state.index(token)
+        length = 1
+        while (
+            index + length < len(order)
+            and order[index + length] in moved
+            and start + length < len(state)
+            and state[start + length] == order[index + length]
+        ):
+            length += 1
+        insert_before = state.index(order[index - 1]) + 1 if index > 0 else 0
+        placed.update(order[index : index + length])
+        if not start <= insert_before <= start + length:
+            operation = Move(start, length, insert_before)
+            _move(state, operation)
+            operations.append(operation)
+            if len(operations) > rewrite_cost:
+                # every moved track costs a request, rewriting is cheaper
+                return rewrite
+
+    # the added tracks are inserted from the first, the tracks before them are in place
+    j = 0
+    while j < len(desired):
+        if target[j] is not None:
+            j += 1
+            continue
+        end = j
+        while end < len(desired) and target[end] is None:
+            end += 1
+        for offset in range(j, end, MAX_TRACKS_PER_REQUEST):
+            operations.append(Add(desired[offset : min(offset + MAX_TRACKS_PER_REQUEST, end)], offset))
+        if len(operations) > rewrite_cost:
+            return rewrite
+        j = end
+
+    return rewrite if rewrite_cost < len(operations) else operations
+
+
+def apply_plan(sp, playlist_id: str, operations: list, snapshot_id: str = None) -> str:
+    """ Runs the operations of plan_sync in order and returns the snapshot id of the playlist after them.
+        The snapshot id of every request is passed to the next one.
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - playlist_id - the playlist ID, URI or URL
+            - operations - the operations returned by plan_sync
+            - snapshot_id - the snapshot id of the playlist the plan was made for
+    """
+    for operation in operations:
+        if isinstance(operation, Remove):
+            snapshot_id = sp.playlist_remove_specific_occurrences_of_tracks(playlist_id, operation.tracks, snapshot_id)
+        elif isinstance(operation, Move):
+            snapshot_id = sp.playlist_reorder_tracks(
+                playlist_id, operation.range_start, operation.insert_before, operation.range_length, snapshot_id
+            )
+        elif isinstance(operation, Add):
+            snapshot_id = sp.playlist_add_tracks(playlist_id, operation.uris, operation.position)
+        elif isinstance(operation, Replace):
+            snapshot_id = sp.playlist_replace_tracks(playlist_id, operation.uris)
+        elif isinstance(operation, RemoveAll):
+            snapshot_id = sp.playlist_remove_all_occurrences_of_tracks(playlist_id, operation.uris, snapshot_id)
+        else:
+            raise ValueError("unknown operation {!r}".format(operation))
+    return snapshot_id
+
+
+def read_playlist(sp, playlist_id: str, attempts: int = 3) -> Tuple[str, List[Optional[str]]]:
+    """ Returns the snapshot id and the track URIs of a playlist, None for the items without a track.
+        The tracks are read again if the playlist changed while they were read.
+    """
+    snapshot_id = sp.playlist(playlist_id, fields=_PLAYLIST_STATE)["snapshot_id"]
+    for _ in range(attempts):
+        uris = [
+            item["track"]["uri"] if item.get("track") else None
+            for item in sp.iter_all(sp.playlist_tracks, playlist_id, fields=_TRACK_URIS)
+        ]
+        current_snapshot_id = sp.playlist(playlist_id, fields=_PLAYLIST_STATE)["snapshot_id"]
+        if current_snapshot_id == snapshot_id:
+            return snapshot_id, uris
+        snapshot_id = current_snapshot_id
+    raise exceptions.SpotifyError("playlist {} kept changing while it was read".format(playlist_id))
+
+
+def _is_pinned(uri: Optional[str]) -> bool:
+    """ Returns True for the items which can't be written by URI, local files and unavailable tracks
+    """
+    return uri is None or not uri.startswith("spotify:track:")
+
+
+def _pin(current: List[Optional[str]], desired: List[str]) -> List[str]:
+    """ Returns desired with the pinned items of current kept at their positions, see _is_pinned
+    """
+    desired = list(desired)
+    for i, uri in enumerate(current):
+        if _is_pinned(uri):
+            desired.insert(min(i, len(desired)), uri)
+    return desired
+
+
+def sync_playlist(
+    sp, playlist_id: str, tracks: Sequence[str], dry_run: bool = False, max_distance: int = MAX_EDIT_DISTANCE
+) -> SyncResult:
+    """ Makes the tracks of a playlist match the given ones with the fewest writes, see plan_sync
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - playlist_id - the playlist ID, URI or URL
+            - tracks - the track IDs, URIs or URLs the playlist should have, in order
+            - dry_run - only return the operations, without running them
+            - max_distance - see longest_common_subsequence
+    """
+    desired = [ids.to_uri("track", track) for track in tracks]
+    snapshot_id, current = read_playlist(sp, playlist_id)
+    operations = plan_sync(current, _pin(current, desired), max_distance)
+    if not dry_run and operations:
+        snapshot_id = apply_plan(sp, playlist_id, operations, snapshot_id)
+    return SyncResult(snapshot_id, operations)
+
+
+class _Checkpoint:
+    """
+    The chunks of a bulk write which were applied and the snapshot id after the last one, saved to a JSON file
+    after every chunk.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], playlist_id: str, operations: list):
+        self.path = os.fspath(path)
+        job = json.dumps([playlist_id, [[type(operation).__name__, operation] for operation in operations]])
+        self.job = hashlib.sha1(job.encode("utf-8")).hexdigest()
+        self.applied = set()
+        self.snapshot_id = None
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            if state["job"] != self.job:
+                raise ValueError("{} is the checkpoint of another write".format(self.path))
+            self.applied = set(state["applied"])
+            self.snapshot_id = state["snapshot_id"]
+
+    def save(self, index: int, snapshot_id: str):
+        self.applied.add(index)
+        self.snapshot_id = snapshot_id
+        temp_path = self.path + ".part"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"job": self.job, "applied": sorted(self.applied), "snapshot_id": snapshot_id}, file)
+        os.replace(temp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _write(
+    sp,
+    playlist_id: str,
+    operations: list,
+    snapshot_id: Optional[str],
+    checkpoint: Optional[Union[str, os.PathLike]],
+    max_concurrency: int = 1,
+) -> str:
+    """ Runs the chunks of a bulk write and returns the snapshot id of the playlist after them
+
+        The chunks run in order, each with the snapshot id of the previous one, except RemoveAll chunks which don't
+        depend on each other and run max_concurrency at a time.
+    """
+    ordered = not all(isinstance(operation, RemoveAll) for operation in operations)
+    state = _Checkpoint(checkpoint, playlist_id, operations) if checkpoint is not None else None
+    pending = [index for index in range(len(operations)) if state is None or index not in state.applied]
+    if state is not None and state.snapshot_id is not None:
+        if ordered:
+            # a chunk sent after the last saved one may have been applied, its positions would be wrong
+            current_snapshot_id = sp.playlist(playlist_id, fields=_PLAYLIST_STATE)["snapshot_id"]
+            if current_snapshot_id != state.snapshot_id:
+                raise exceptions.SpotifyError(
+                    "playlist {} changed since the checkpoint {} was saved".format(playlist_id, state.path)
+                )
+        snapshot_id = state.snapshot_id
+
+    if ordered or max_concurrency == 1 or len(pending) <= 1:
+        for index in pending:
+            snapshot_id = apply_plan(sp, playlist_id, [operations[index]], snapshot_id)
+            if state is not None:
+                state.save(index, snapshot_id)
+    else:
+        indexes = iter(pending)
+        executor = sp._get_executor()
+
+        def submit(index):
+            return index, executor.submit(apply_plan, sp, playlist_id, [operations[index]], snapshot_id)
+
+        queue = collections.deque(submit(index) for index in itertools.islice(indexes, max_concurrency))
+        try:
+            while queue:
+                index, future = queue.popleft()
+                chunk_snapshot_id = future.result()
+                queue.extend(submit(index) for index in itertools.islice(indexes, 1))
+                if state is not None:
+                    state.save(index, chunk_snapshot_id)
+        finally:
+            for _, future in queue:
+                future.cancel()
+        # the chunks may have been applied in any order
+        snapshot_id = None
+
+    if snapshot_id is None:
+        snapshot_id = sp.playlist(playlist_id, fields=_PLAYLIST_STATE)["snapshot_id"]
+    if state is not None:
+        state.remove()
+    return snapshot_id
+
+
+def add_tracks(
+    sp, playlist_id: str, tracks: Sequence[str], position: int = None, checkpoint: Union[str, os.PathLike] = None,
+) -> str:
+    """ Adds any number of tracks to a playlist in chunks of 100 and returns the snapshot id after them
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - playlist_id - the playlist ID, URI or URL
+            - tracks - track IDs, URIs or URLs
+            - position - the position to insert the tracks at. Default: they are appended.
+            - checkpoint - the path of a file where the progress is saved after every chunk. If the file exists
+              the write resumes after the last applied chunk, and it's removed once the write is complete.
+    """
+    uris = [ids.to_uri("track", track) for track in tracks]
+    operations = [
+        Add(chunk, None if position is None else position + i * MAX_TRACKS_PER_REQUEST)
+        for i, chunk in enumerate(_chunks(uris))
+    ]
+    return _write(sp, playlist_id, operations, None, checkpoint)
+
+
+def replace_tracks(sp, playlist_id: str, tracks: Sequence[str], checkpoint: Union[str, os.PathLike] = None) -> str:
+    """ Replaces the tracks of a playlist with any number of tracks and returns the snapshot id after them.
+        The first 100 tracks replace the playlist, the others are appended in chunks of 100.
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - playlist_id - the playlist ID, URI or URL
+            - tracks - track IDs, URIs or URLs
+            - checkpoint - see add_tracks
+    """
+    uris = [ids.to_uri("track", track) for track in tracks]
+    operations = [Replace(uris[:MAX_TRACKS_PER_REQUEST])]
+    operations.extend(Add(chunk, None) for chunk in _chunks(uris[MAX_TRACKS_PER_REQUEST:]))
+    return _write(sp, playlist_id, operations, None, checkpoint)
+
+
+def remove_all_occurrences(
+    sp,
+    playlist_id: str,
+    tracks: Sequence[str],
+    snapshot_id: str = None,
+    checkpoint: Union[str, os.PathLike] = None,
+    max_concurrency: int = None,
+) -> str:
+    """ Removes all the occurrences of any number of tracks from a playlist and returns the snapshot id after them
+
+        The chunks of 100 tracks don't depend on each other, so they are sent concurrently on the client's executor.
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - playlist_id - the playlist ID, URI or URL
+            - tracks - track IDs, URIs or URLs
+            - snapshot_id - optional id of the playlist snapshot
+            - checkpoint - see add_tracks
+            - max_concurrency - the maximum number of chunks sent at the same time. Default: max_workers.
+    """
+    uris = list(collections.OrderedDict.fromkeys(ids.to_uri("track", track) for track in tracks))
+    operations = [RemoveAll(chunk) for chunk in _chunks(uris)]
+    return _write(sp, playlist_id, operations, snapshot_id, checkpoint, max_concurrency or sp.max_workers)
+
+
+def remove_specific_occurrences(
+    sp, playlist_id: str, tracks: Sequence[dict], snapshot_id: str = None, checkpoint: Union[str, os.PathLike] = None,
+) -> str:
+    """ Removes any number of track occurrences from a playlist and returns the snapshot id after them.
+        The occurrences are removed from the last position, 100 at a time, so the positions of the next chunks
+        don't change.
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - playlist_id - the playlist ID, URI or URL
+            - tracks - objects with the URI of a track and its positions in the playlist, e.g.
+              [{"uri": "4iV5W9uYEdYUVa79Axb7Rh", "positions": [2, 7]}]
+            - snapshot_id - optional id of the playlist snapshot the positions refer to
+            - checkpoint - see add_tracks
+    """
+    operations = _removals(
+        (position, ids.to_uri("track", track["uri"])) for track in tracks for position in track["positions"]
+    )
+    return _write(sp, playlist_id, operations, snapshot_id, checkpoint)
@@ -0,0 +1,166 @@
+import collections
+from typing import Iterable
+from typing import List
+from typing import Union
+
+from spotipy import exceptions
+from spotipy import models
+
+""" Compiles the fields filter of the playlist endpoints from the attribute paths the caller needs
+
+    Example usage::
+
+        import spotipy.projection
+        tracks = spotipy.projection.Projection.page(["added_at", "track.id", "track.artists.id"])
+        print(tracks.expression)  # items(added_at,track(id,artists.id)),href,limit,offset,total,next,previous
+        for item in sp.iter_all(sp.playlist_tracks, playlist_id, fields=tracks):
+            print(item["added_at"], item["track"]["id"])
+
+    The responses of a request made with a Projection are validated against it, see Projection.validate.
+"""
+
+_ABSENT = object()
+
+# the keys of a paging object, iter_all needs total and next
+PAGING_FIELDS = models.Paging._fields
+
+
+def _split(path: str) -> tuple:
+    keys = tuple(path.split("."))
+    if not all(keys):
+        raise ValueError("invalid path {!r}".format(path))
+    return keys
+
+
+def _prefixes(keys: tuple) -> list:
+    return [keys[:i] for i in range(1, len(keys) + 1)]
+
+
+def _model_paths(model: type) -> List[str]:
+    """ Returns the paths of all the keys a model holds, the nested models included
+    """
+    paths = list(model._fields + model._interned)
+    for name in model._lazy:
+        lazy = getattr(model, name)
+        if not isinstance(lazy, models._Lazy):
+            # the items of a Paging, whose model is only known when it's built
+            paths.append(name)
+            continue
+        nested = getattr(models, lazy.model)
+        if lazy.item_model is not None:
+            item_paths = _model_paths(getattr(models, lazy.item_model))
+            nested_paths = list(nested._fields) + ["items." + path for path in item_paths]
+        else:
+            nested_paths = _model_paths(nested)
+        paths.extend("{}.{}".format(name, path) for path in nested_paths)
+    return paths
+
+
+class Projection:
+    """
+    The shape of a response, compiled to a fields expression.
+
+    A path is a dot separated list of keys, arrays are transparent: "items.track.artists.id" selects the id
+    of every artist of the track of every item.
+    """
+
+    def __init__(self, paths: Iterable[str], required: bool = True):
+        """
+            Parameters:
+                - paths - the dot separated paths of the keys to return, e.g. ["total", "items.track.id"]
+                - required - validate raises if the responses miss a key of the paths.
+                  A None value along a path is accepted, e.g. the track of an unavailable playlist item.
+        """
+        self.paths = list(collections.OrderedDict.fromkeys(paths))
+        self._required = {prefix for path in self.paths for prefix in _prefixes(_split(path))} if required else set()
+        self.tree = self._build_tree(self.paths)
+        self.expression = self._render(self.tree)
+
+    @classmethod
+    def from_model(cls, model: type) -> "Projection":
+        """ Returns the projection of the keys a spotipy.models class holds, nested models included.
+            The keys are optional, as the model tolerates absent keys.
+        """
+        return cls(_model_paths(model), required=False)
+
+    @classmethod
+    def page(cls, item: Union["Projection", type, Iterable[str]]) -> "Projection":
+        """ Returns the projection of a page of items, with the required paging keys
+
+            Parameters:
+                - item - the projection of an item, a spotipy.models class or the paths of an item
+        """
+        if isinstance(item, type) and issubclass(item, models.Model):
+            item = cls.from_model(item)
+        elif not isinstance(item, Projection):
+            item = cls(item)
+        projection = cls(["items." + path for path in item.paths] + list(PAGING_FIELDS), required=False)
+        required = {(name,) for name in PAGING_FIELDS + ("items",)}
+        projection._required = required | {("items",) + keys for keys in item._required}
+        return projection
+
+    @staticmethod
+    def _build_tree(paths: Iterable[str]) -> dict:
+        """ Returns the nested dicts of the keys, None for a key whose whole value is selected
+        """
+        tree = collections.OrderedDict()
+        for path in paths:
+            node = tree
+            keys = _split(path)
+            for key in keys[:-1]:
+                child = node.get(key, collections.OrderedDict())
+                if child is None:
+                    # the whole value is already selected
+                    break
+                node = node.setdefault(key, child)
+            else:
+                node[keys[-1]] = None
+        return tree
+
+    @classmethod
+    def _render(cls, tree: dict) -> str:
+        parts = []
+        for key, children in tree.items():
+            if children is None:
+                parts.append(key)
+            elif len(children) == 1:
+                parts.append("{}.{}".format(key, cls._render(children)))
+            else:
+                parts.append("{}({})".format(key, cls._render(children)))
+        return ",".join(parts)
+
+    def validate(self, data):
+        """ Returns data if it has the shape of the projection, raises ProjectionError with the unexpected keys,
+            which mean the fields filter wasn't applied, and the missing required keys
+        """
+        errors = []
+        if data is not None:
+            self._check(self.tree, data, (), errors)
+        if errors:
+            raise exceptions.ProjectionError(self.expression, list(collections.OrderedDict.fromkeys(errors)))
+        return data
+
+    def _check(self, tree: dict, value, keys: tuple, errors: list):
+        if isinstance(value, list):
+            for item in value:
+                if item is not None:
+                    self._check(tree, item, keys, errors)
+            return
+        if not isinstance(value, dict):
+            errors.append("{} is not an object".format(".".join(keys)))
+            return
+        if not value.keys() <= tree.keys():
+            errors.extend("unexpected {}".format(".".join(keys + (key,))) for key in value if key not in tree)
+        for key, children in tree.items():
+            child = value.get(key, _ABSENT)
+            if child is _ABSENT:
+                if keys + (key,) in self._required:
+                    errors.append("missing {}".format(".".join(keys + (key,))))
+            elif children is not None and child is not None:
+                self._check(children, child, keys + (key,), errors)
+
+    def __str__(self):
+        return self.expression
+
+    def __repr__(self):
+        return "Projection({!r})".format(self.expression)
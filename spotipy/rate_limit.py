@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+def parse_retry_after(retry_after, default: float = 1) -> float:
+    """ Returns the number of seconds of a Retry-After header value, or default if it's missing or not a number
+    """
+    try:
+        return max(float(retry_after), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """
+    A thread safe token bucket that paces the requests of a Spotify object.
+
+    Every request takes a token, tokens are added at `rate` per second up to `burst`.
+    When the API answers 429, pause() stops every caller for the Retry-After duration and empties the bucket,
+    so the requests resume at the steady rate instead of all at once.
+
+    Example usage::
+
+        rate_limiter = spotipy.rate_limit.RateLimiter(rate=20, burst=40)
+        sp = spotipy.Spotify(auth_provider, rate_limiter=rate_limiter)
+    """
+
+    def __init__(self, rate: float = 10, burst: int = None):
+        """
+            Parameters:
+                - rate - the number of requests per second
+                - burst - the maximum number of requests sent at once after an idle period. Default: rate
+        """
+        if rate <= 0:
+            raise ValueError("rate must be a positive number")
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, max_wait: float = None) -> Optional[float]:
+        """ Takes the next token, which might only be available in the future, and returns how many seconds to wait
+            for it. Returns None without taking a token if the wait would be longer than max_wait.
+
+            The waiting callers reserve consecutive tokens, so they are served in order, 1 / rate apart.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated_at:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+            # the bucket can owe tokens to the reserved callers, the next token is added after their tokens
+            wait = self._updated_at - now + max(1 - self._tokens, 0) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def try_acquire(self) -> bool:
+        """ Takes a token without waiting, returns False if none is available
+        """
+        return self._reserve(0) is not None
+
+    def acquire(self, blocking: bool = True, timeout: float = None) -> bool:
+        """ Takes a token, waiting for one to be available
+
+            Parameters:
+                - blocking - when false, returns False right away instead of waiting
+                - timeout - the maximum number of seconds to wait, returns False if no token was available by then
+        """
+        wait = self._reserve(0 if not blocking else timeout)
+        if wait is None:
+            return False
+        time.sleep(wait)
+        # a 429 answered while we waited pauses the reserved callers too
+        while self.paused_for > 0:
+            time.sleep(self.paused_for)
+        return True
+
+    async def acquire_async(self, timeout: float = None) -> bool:
+        """ Takes a token, waiting for one to be available without blocking the event loop
+
+            Parameters:
+                - timeout - the maximum number of seconds to wait, returns False if no token was available by then
+        """
+        wait = self._reserve(timeout)
+        if wait is None:
+            return False
+        await asyncio.sleep(wait)
+        while self.paused_for > 0:
+            await asyncio.sleep(self.paused_for)
+        return True
+
+    def pause(self, seconds: float):
+        """ Stops handing out tokens for the given number of seconds, e.g. the Retry-After of a 429 response
+        """
+        with self._lock:
+            paused_until = time.monotonic() + seconds
+            if paused_until > self._paused_until:
+                self._paused_until = paused_until
+            # the tokens owed to the reserved callers are added after the pause
+            self._tokens = min(self._tokens, 0)
+            self._updated_at = self._paused_until
+
+    @property
+    def paused_for(self) -> float:
+        """ The number of seconds left until the pause ends
+        """
+        return max(self._paused_until - time.monotonic(), 0)
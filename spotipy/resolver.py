@@ -0,0 +1,150 @@
+import asyncio
+import collections
+from http import HTTPStatus
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from spotipy import coalescer
+from spotipy import exceptions
+from spotipy import ids
+
+""" Resolves mixed lists of Spotify URIs, URLs and IDs to their objects with the fewest requests
+
+    Example usage::
+
+        import spotipy.resolver
+        objects = spotipy.resolver.resolve(sp, [
+            "spotify:track:4iV5W9uYEdYUVa79Axb7Rh",
+            "https://open.spotify.com/album/1DFixLWuPkv3KT3TnV35m3?si=abc",
+            "4iV5W9uYEdYUVa79Axb7Rh",
+        ])
+"""
+
+Link = collections.namedtuple("Link", ["type", "id"])
+
+# type -> the batch method of the client, its maximum number of ids is in coalescer.BATCH_ENDPOINTS
+BATCH_METHODS = {"track": "tracks", "album": "albums", "artist": "artists"}
+# type -> the method of the client which gets a single item
+SINGLE_METHODS = {"playlist": "playlist", "user": "user"}
+RESOLVABLE_TYPES = tuple(BATCH_METHODS) + tuple(SINGLE_METHODS)
+
+_MARKET_TYPES = ("track", "playlist")
+
+
+def classify(values: Iterable[str], default_type: str = "track") -> Dict[str, Optional[Link]]:
+    """ Returns the Link of every distinct value, None for the values which aren't a valid link of a resolvable type
+
+        Parameters:
+            - values - Spotify URIs, URLs or IDs of any of the RESOLVABLE_TYPES
+            - default_type - the type of the plain IDs
+    """
+    links = {}
+    for value in values:
+        if value in links:
+            continue
+        item_type, item_id = ids.parse(value)
+        item_type = item_type or default_type
+        links[value] = Link(item_type, item_id) if item_type in RESOLVABLE_TYPES and item_id else None
+
+    # validated before requesting, a single invalid id fails the whole batch request
+    base62 = [link.id for link in links.values() if link is not None and link.type in ids.BASE62_TYPES]
+    invalid = set(ids.find_invalid_ids(base62))
+    if invalid:
+        for value, link in links.items():
+            if link is not None and link.id in invalid and link.type in ids.BASE62_TYPES:
+                links[value] = None
+    return links
+
+
+def group(links: Iterable[Optional[Link]]) -> Dict[str, List[str]]:
+    """ Returns the distinct IDs of every type, in the order of the links. None links are skipped
+    """
+    groups = collections.OrderedDict()
+    for link in links:
+        if link is not None:
+            groups.setdefault(link.type, collections.OrderedDict())[link.id] = None
+    return collections.OrderedDict((link_type, list(type_ids)) for link_type, type_ids in groups.items())
+
+
+def _calls(groups: Dict[str, List[str]]) -> Iterator[Tuple[str, List[str]]]:
+    """ Yields the type and the IDs of every request, the batch types in chunks of the endpoint's maximum size
+    """
+    for link_type, type_ids in groups.items():
+        if link_type in BATCH_METHODS:
+            max_ids = coalescer.BATCH_ENDPOINTS[BATCH_METHODS[link_type]][1]
+            for i in range(0, len(type_ids), max_ids):
+                yield link_type, type_ids[i : i + max_ids]
+        else:
+            for item_id in type_ids:
+                yield link_type, [item_id]
+
+
+def _market_params(link_type: str, market: Optional[str]) -> dict:
+    return {"market": market} if market and link_type in _MARKET_TYPES else {}
+
+
+def _fetch(sp, link_type: str, chunk: List[str], market: Optional[str]) -> List[Optional[dict]]:
+    params = _market_params(link_type, market)
+    if link_type in BATCH_METHODS:
+        # a single chunk, the client requests it on the calling thread
+        return getattr(sp, BATCH_METHODS[link_type])(chunk, **params)
+    try:
+        return [getattr(sp, SINGLE_METHODS[link_type])(chunk[0], **params)]
+    except exceptions.SpotifyRequestError as e:
+        if e.status != HTTPStatus.NOT_FOUND:
+            raise
+        return [None]
+
+
+async def _fetch_async(sp, link_type: str, chunk: List[str], market: Optional[str]) -> List[Optional[dict]]:
+    params = _market_params(link_type, market)
+    if link_type in BATCH_METHODS:
+        return await getattr(sp, BATCH_METHODS[link_type])(chunk, **params)
+    try:
+        return [await getattr(sp, SINGLE_METHODS[link_type])(chunk[0], **params)]
+    except exceptions.SpotifyRequestError as e:
+        if e.status != HTTPStatus.NOT_FOUND:
+            raise
+        return [None]
+
+
+def _results(links: Dict[str, Optional[Link]], calls: list, pages: Iterable[list]) -> Dict[str, Optional[dict]]:
+    items = {}
+    for (link_type, chunk), page in zip(calls, pages):
+        items.update(zip((Link(link_type, item_id) for item_id in chunk), page))
+    return {value: items.get(link) for value, link in links.items()}
+
+
+def resolve(sp, values: Iterable[str], default_type: str = "track", market: str = None) -> Dict[str, Optional[dict]]:
+    """ Returns the object of every Spotify URI, URL or ID, keyed by the given values
+
+        The values are grouped by type and every distinct ID is requested once: tracks, albums and artists
+        from the batch endpoints in chunks of their maximum size, playlists and users one by one.
+        The requests are sent concurrently on the client's executor.
+        Values which aren't valid links of one of the RESOLVABLE_TYPES, or weren't found, are None.
+
+        Parameters:
+            - sp - a spotipy.Spotify object
+            - values - Spotify URIs, URLs or IDs, of mixed types
+            - default_type - the type of the plain IDs
+            - market - an ISO 3166-1 alpha-2 country code or 'from_token', for the tracks and playlists
+    """
+    links = classify(values, default_type)
+    calls = list(_calls(group(links.values())))
+    pages = sp._get_executor().map(lambda call: _fetch(sp, call[0], call[1], market), calls)
+    return _results(links, calls, pages)
+
+
+async def resolve_async(
+    sp, values: Iterable[str], default_type: str = "track", market: str = None
+) -> Dict[str, Optional[dict]]:
+    """ The asyncio version of resolve, for a spotipy.async_client.AsyncSpotify object
+    """
+    links = classify(values, default_type)
+    calls = list(_calls(group(links.values())))
+    pages = await asyncio.gather(*(_fetch_async(sp, link_type, chunk, market) for link_type, chunk in calls))
+    return _results(links, calls, pages)
@@ -0,0 +1,163 @@
+import collections
+import queue
+import threading
+
+import requests
+import requests.adapters
+from urllib3 import connectionpool
+
+PoolStats = collections.namedtuple("PoolStats", ["in_use", "max_in_use", "created", "discarded"])
+
+
+class _PoolCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.max_in_use = 0
+        self.created = 0
+        self.discarded = 0
+
+    def connection_created(self):
+        with self._lock:
+            self.created += 1
+
+    def connection_acquired(self):
+        with self._lock:
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def connection_released(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_discarded(self):
+        with self._lock:
+            self.discarded += 1
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(self.in_use, self.max_in_use, self.created, self.discarded)
+
+
+class _CountingQueue(connectionpool.HTTPConnectionPool.QueueCls):
+    """ The queue of the idle connections of a pool, counts the connections it has no room for """
+
+    _counters = None  # type: _PoolCounters
+
+    def put(self, item, block=True, timeout=None):
+        try:
+            super().put(item, block, timeout)
+        except queue.Full:
+            self._counters.connection_discarded()
+            raise
+
+
+class _CountingPoolMixin:
+    _counters = None  # type: _PoolCounters
+
+    def _new_conn(self):
+        self._counters.connection_created()
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        self._counters.connection_acquired()
+        return conn
+
+    def _put_conn(self, conn):
+        try:
+            super()._put_conn(conn)
+        finally:
+            self._counters.connection_released()
+
+
+def _counting_pool_classes(counters: _PoolCounters) -> dict:
+    attributes = {"_counters": counters, "QueueCls": type("CountingQueue", (_CountingQueue,), {"_counters": counters})}
+    return {
+        "http": type("CountingHTTPConnectionPool", (_CountingPoolMixin, connectionpool.HTTPConnectionPool), attributes),
+        "https": type(
+            "CountingHTTPSConnectionPool", (_CountingPoolMixin, connectionpool.HTTPSConnectionPool), attributes
+        ),
+    }
+
+
+class _CountingHTTPAdapter(requests.adapters.HTTPAdapter):
+    def __init__(self, counters: _PoolCounters, **kwargs):
+        self._counters = counters
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self._counters)
+
+    def __setstate__(self, state):
+        self._counters = _PoolCounters()
+        super().__setstate__(state)
+
+
+class Transport:
+    """
+    The HTTP transport shared by Spotify and the auth providers.
+
+    Passing the same Transport to Spotify and to its auth provider makes API calls and token refreshes
+    share one connection pool.
+
+    Example usage::
+
+        transport = spotipy.transport.Transport(pool_maxsize=32)
+        auth_provider = spotipy.auth.ClientCredentials(client_id, client_secret, transport=transport)
+        sp = spotipy.Spotify(auth_provider, transport=transport)
+
+        print(transport.pool_stats())
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = requests.adapters.DEFAULT_POOLSIZE,
+        pool_maxsize: int = requests.adapters.DEFAULT_POOLSIZE,
+        pool_block: bool = requests.adapters.DEFAULT_POOLBLOCK,
+        max_retries=requests.adapters.DEFAULT_RETRIES,
+        requests_session: requests.Session = None,
+    ):
+        """
+        Create a Transport object.
+
+        :param pool_connections:
+            The number of hosts to keep a connection pool for
+        :param pool_maxsize:
+            The maximum number of connections to keep per host.
+            Should be at least the number of threads that use the transport concurrently.
+        :param pool_block:
+            When true, a request waits for a free connection instead of opening one that will
+            be discarded once the pool is full
+        :param max_retries:
+            int or urllib3 Retry object, passed to the HTTPAdapter. A Spotify object uses the retries of the
+            transport it's given, the default retries no request.
+        :param requests_session:
+            A Requests session object to mount the adapter on. A new session is created if not supplied.
+        """
+        self._counters = _PoolCounters()
+        self.session = requests_session if isinstance(requests_session, requests.Session) else requests.Session()
+        self.adapter = _CountingHTTPAdapter(
+            self._counters,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries,
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    @property
+    def pool_maxsize(self) -> int:
+        return self.adapter._pool_maxsize
+
+    def pool_stats(self) -> PoolStats:
+        """ Returns the live connection pool statistics
+
+            - in_use - connections currently checked out of the pool
+            - max_in_use - the highest number of connections checked out at the same time
+            - created - connections opened since the transport was created
+            - discarded - connections closed because the pool was full when they were returned
+        """
+        return self._counters.snapshot()
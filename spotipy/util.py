@@ -11,6 +11,7 @@ import requests
 
 from spotipy import exceptions
 from spotipy import auth
+from spotipy import transport as transport_module
 
 PORT = 8080
 REDIRECT_ADDRESS = "http://localhost"
@@ -27,6 +28,7 @@ def prompt_user_for_authorization_code_provider(
     persist_file_path: str = None,
     requests_session: requests.Session = None,
     deploy_local_server=False,
+    transport: transport_module.Transport = None,
 ) -> auth.AuthorizationCode:
     """ prompts the user to login if necessary and returns
         the user token suitable for use with the spotipy.Spotify
@@ -41,6 +43,7 @@ def prompt_user_for_authorization_code_provider(
          - persist_file_path - path to location to save tokens
          - requests_session - a request.Session object
          - deploy_local_server - if true, will deploy local server to get the authorization code automatically
+         - transport - a Transport object, overrides requests_session
 
     """
 
@@ -82,6 +85,8 @@ def prompt_user_for_authorization_code_provider(
             raise ValueError("invalid url")
         code = parse_qs(parsed_url.query)["code"][0]
 
+    if transport is not None:
+        requests_session = transport.session
     payload = {"code": code, "grant_type": "authorization_code", "redirect_uri": redirect_uri}
     now = int(time.time())
     token_info = auth.request_token(payload, client_id, client_secret, requests_session)
@@ -96,6 +101,7 @@ def prompt_user_for_authorization_code_provider(
         access_token_expires_at,
         persist_file_path,
         requests_session,
+        transport,
     )
 
     if persist_file_path:
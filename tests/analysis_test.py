@@ -0,0 +1,113 @@
+import copy
+import unittest
+import warnings
+
+import fake_server
+import spotipy
+from spotipy import analysis
+from spotipy import auth
+
+
+@unittest.skipIf(analysis.np is None, "numpy is not installed")
+class AudioAnalysisArraysSpec(unittest.TestCase):
+    def setUp(self) -> None:
+        fixtures = fake_server.Fixtures("http://localhost/v1/")
+        # the fixtures are cached, the tests get their own copy to change
+        self.analysis = copy.deepcopy(fixtures.audio_analysis(fake_server.make_id("track")))
+
+    def test_pitches_and_timbre_are_float32_matrices(self):
+        # Arrange
+        segments = self.analysis["segments"]
+
+        # Act
+        arrays = analysis.to_arrays(self.analysis)
+
+        # Assert
+        self.assertEqual((len(segments), 12), arrays.pitches.shape)
+        self.assertEqual(analysis.np.float32, arrays.timbre.dtype)
+        self.assertAlmostEqual(segments[-1]["timbre"][11], float(arrays.timbre[-1, 11]), places=3)
+
+    def test_segments_fields_match_the_analysis(self):
+        # Arrange
+        segments = self.analysis["segments"]
+
+        # Act
+        arrays = analysis.to_arrays(self.analysis)
+
+        # Assert
+        self.assertEqual([segment["start"] for segment in segments], arrays.segments["start"].tolist())
+        self.assertAlmostEqual(segments[3]["loudness_max"], float(arrays.segments["loudness_max"][3]), places=3)
+        self.assertEqual(len(self.analysis["beats"]), len(arrays.beats))
+
+    def test_missing_fields_are_nan(self):
+        # Arrange
+        del self.analysis["segments"][0]["loudness_end"]
+
+        # Act
+        arrays = analysis.to_arrays(self.analysis)
+
+        # Assert
+        self.assertTrue(analysis.np.isnan(arrays.segments["loudness_end"][0]))
+        self.assertEqual(0, arrays.segments["loudness_end"][1])
+
+    def test_missing_integer_fields_are_minus_one(self):
+        # Arrange
+        del self.analysis["sections"][0]["key"]
+        self.analysis["sections"][0]["time_signature"] = None
+
+        # Act
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            arrays = analysis.to_arrays(self.analysis)
+
+        # Assert
+        self.assertEqual((-1, -1), (arrays.sections["key"][0], arrays.sections["time_signature"][0]))
+        self.assertEqual(self.analysis["sections"][1]["key"], arrays.sections["key"][1])
+
+    def test_pitches_and_timbre_of_other_lengths_are_padded_or_truncated(self):
+        # Arrange
+        segments = self.analysis["segments"]
+        segments[0]["pitches"] = segments[0]["pitches"][:11]
+        segments[1]["timbre"] = segments[1]["timbre"] + [1.0]
+        del segments[2]["pitches"]
+
+        # Act
+        arrays = analysis.to_arrays(self.analysis)
+
+        # Assert
+        self.assertEqual((len(segments), 12), arrays.pitches.shape)
+        self.assertEqual((len(segments), 12), arrays.timbre.shape)
+        self.assertTrue(analysis.np.isnan(arrays.pitches[0, 11]))
+        self.assertAlmostEqual(segments[0]["pitches"][10], float(arrays.pitches[0, 10]), places=3)
+        self.assertAlmostEqual(segments[1]["timbre"][11], float(arrays.timbre[1, 11]), places=3)
+        self.assertTrue(analysis.np.isnan(arrays.pitches[2]).all())
+
+
+@unittest.skipIf(analysis.np is None, "numpy is not installed")
+class AudioFeaturesTableSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def test_get_audio_features_table_masks_missing_tracks(self):
+        # Arrange
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        sp.base_api_url = self.server.api_url
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(250)]
+        self.server.missing_ids.add(track_ids[7])
+
+        # Act
+        table = sp.tracks_audio_feature_table(track_ids)
+
+        # Assert
+        self.assertEqual((250, len(analysis.AUDIO_FEATURE_COLUMNS)), table.matrix.shape)
+        self.assertEqual(track_ids, table.ids.tolist())
+        self.assertEqual([7], analysis.np.flatnonzero(table.missing).tolist())
+        self.assertTrue(analysis.np.isnan(table.matrix[7]).all())
+        expected_tempo = self.server.fixtures.audio_features(track_ids[0])["tempo"]
+        self.assertAlmostEqual(expected_tempo, float(table.column("tempo")[0]), places=3)
+        self.assertEqual(3, self.server.requests["GET", "audio-features"])
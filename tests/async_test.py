@@ -0,0 +1,181 @@
+import asyncio
+import time
+import unittest
+from http import HTTPStatus
+from unittest import mock
+
+import fake_server
+from spotipy import auth
+from spotipy import cache
+
+try:
+    from spotipy import async_auth
+    from spotipy import async_client
+except ImportError:
+    async_auth = None
+
+
+@unittest.skipIf(async_auth is None, "aiohttp is not installed")
+class AsyncFakeServerSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.reset_counters()
+        self.server.missing_ids.clear()
+        patcher = mock.patch.object(auth, "TOKEN_URL", self.server.token_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_with_spotify(self, use, auth_provider=None, **kwargs):
+        """ Runs use(sp) with an AsyncSpotify of the fake server and returns its result
+        """
+
+        async def run():
+            async with async_client.AsyncSpotify(
+                auth_provider or async_auth.AsyncPlainAccessToken("token"), **kwargs
+            ) as sp:
+                sp.base_api_url = self.server.api_url
+                return await use(sp)
+
+        return asyncio.run(run())
+
+
+class AsyncSpotifySpec(AsyncFakeServerSpec):
+    def test_get_returns_the_item(self):
+        # Arrange
+        track_id = fake_server.make_id("track")
+
+        # Act
+        track = self.run_with_spotify(lambda sp: sp.track(track_id))
+
+        # Assert
+        self.assertEqual(track_id, track["id"])
+        self.assertEqual({("GET", "tracks/{id}"): 1}, dict(self.server.requests))
+
+    def test_batch_is_split_at_the_maximum_number_of_ids(self):
+        # Arrange
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(120)]
+        self.server.missing_ids.add(track_ids[7])
+
+        # Act
+        tracks = self.run_with_spotify(lambda sp: sp.tracks(track_ids))
+
+        # Assert
+        self.assertIsNone(tracks[7])
+        self.assertEqual(track_ids[8:], [track["id"] for track in tracks[8:]])
+        self.assertEqual({("GET", "tracks"): 3}, dict(self.server.requests))
+
+    def test_fetch_all_reads_every_page(self):
+        # Arrange
+        playlist_id = fake_server.make_id("playlist")
+
+        # Act
+        items = self.run_with_spotify(lambda sp: sp.fetch_all(sp.playlist_tracks, playlist_id))
+
+        # Assert
+        self.assertEqual(self.server.playlist_track_ids(playlist_id), [item["track"]["id"] for item in items])
+        self.assertEqual(3, self.server.requests["GET", "playlists/{id}/tracks"])
+
+    def test_fetch_all_reads_the_pages_of_a_fields_filter_without_paging_keys(self):
+        # Arrange
+        playlist_id = fake_server.make_id("playlist")
+
+        # Act
+        items = self.run_with_spotify(
+            lambda sp: sp.fetch_all(sp.playlist_tracks, playlist_id, fields="items(track(id))")
+        )
+
+        # Assert
+        self.assertEqual(self.server.playlist_track_ids(playlist_id), [item["track"]["id"] for item in items])
+
+    def test_rate_limited_and_unavailable_requests_are_retried(self):
+        # Arrange
+        self.server.rate_limit(1, retry_after=0)
+
+        async def get_users(sp):
+            first = await sp.user("fake_user")
+            self.server.fail(2, HTTPStatus.SERVICE_UNAVAILABLE, retry_after=0)
+            return first, await sp.user("fake_user")
+
+        # Act
+        users = self.run_with_spotify(get_users)
+
+        # Assert
+        self.assertEqual(["fake_user", "fake_user"], [user["id"] for user in users])
+        self.assertEqual(5, self.server.requests["GET", "users/{id}"])
+
+    def test_access_token_is_requested_once(self):
+        # Arrange
+        auth_provider = async_auth.AsyncClientCredentials("client_id", "client_secret")
+
+        async def get_users(sp):
+            return await asyncio.gather(*(sp.user("user {}".format(i)) for i in range(10)))
+
+        # Act
+        self.run_with_spotify(get_users, auth_provider)
+
+        # Assert
+        self.assertEqual(1, self.server.token_requests)
+        self.assertEqual(10, self.server.requests["GET", "users/{id}"])
+
+    def test_removal_against_the_cached_snapshot_updates_the_cache(self):
+        # Arrange
+        playlist_id = fake_server.make_id("async removed playlist")
+
+        async def remove(sp):
+            items = await sp.playlist_all_tracks(playlist_id)
+            snapshot_id = (await sp.playlist(playlist_id, fields="snapshot_id"))["snapshot_id"]
+            await sp.playlist_remove_all_occurrences_of_tracks(playlist_id, [items[0]["track"]["id"]], snapshot_id)
+            self.server.reset_counters()
+            return await sp.playlist_all_tracks(playlist_id)
+
+        # Act
+        items = self.run_with_spotify(remove, playlist_cache=cache.MemoryCache())
+
+        # Assert
+        self.assertEqual(self.server.playlist_track_ids(playlist_id), [item["track"]["id"] for item in items])
+        self.assertEqual({("GET", "playlists/{id}"): 1}, dict(self.server.requests))
+
+
+class AsyncAuthSpec(AsyncFakeServerSpec):
+    def test_concurrent_requests_of_an_expired_token_request_it_once(self):
+        # Arrange
+        provider = async_auth.AsyncAuthorizationCode(
+            "client_id", "client_secret", "refresh_token", "expired", int(time.time()) - 10
+        )
+
+        async def make_headers():
+            return await asyncio.gather(*(provider.make_authorization_headers() for _ in range(20)))
+
+        # Act
+        headers = asyncio.run(make_headers())
+
+        # Assert
+        self.assertEqual(1, self.server.token_requests)
+        self.assertEqual({"Authorization": "Bearer fake-access-token-1"}, headers[-1])
+        self.assertEqual(1, len({id(header) for header in headers}))
+
+    def test_token_is_refreshed_ahead_before_any_request(self):
+        # Arrange
+        async def refresh_ahead():
+            provider = async_auth.AsyncAuthorizationCode(
+                "client_id", "client_secret", "refresh_token", "current", int(time.time()) + 1, refresh_ahead=10
+            )
+            try:
+                await asyncio.sleep(1.5)
+                return provider.access_token
+            finally:
+                provider.close()
+
+        # Act
+        access_token = asyncio.run(refresh_ahead())
+
+        # Assert
+        self.assertEqual(1, self.server.token_requests)
+        self.assertEqual("fake-access-token-1", access_token)
@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+from concurrent import futures
+from http import HTTPStatus
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import exceptions
+
+
+class RequestCoalescerSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.reset_counters()
+        self.server.missing_ids.clear()
+
+    def make_spotify(self, coalesce_window: float) -> spotipy.Spotify:
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"), coalesce_window=coalesce_window)
+        sp.base_api_url = self.server.api_url
+        self.addCleanup(sp.close)
+        return sp
+
+    @staticmethod
+    def lookup_concurrently(sp: spotipy.Spotify, track_ids: list) -> list:
+        """ Looks up every track on its own thread, all at the same time, and returns the futures of the results
+        """
+        barrier = threading.Barrier(len(track_ids))
+
+        def lookup(track_id):
+            barrier.wait()
+            return sp.track(track_id)
+
+        with futures.ThreadPoolExecutor(len(track_ids)) as executor:
+            results = [executor.submit(lookup, track_id) for track_id in track_ids]
+        return results
+
+    def test_lookups_within_the_window_are_merged(self):
+        # Arrange
+        sp = self.make_spotify(coalesce_window=0.2)
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(10)]
+
+        # Act
+        results = self.lookup_concurrently(sp, track_ids)
+
+        # Assert
+        self.assertEqual(track_ids, [result.result()["id"] for result in results])
+        self.assertEqual({("GET", "tracks"): 1}, dict(self.server.requests))
+
+    def test_lookups_after_the_window_are_sent_separately(self):
+        # Arrange
+        sp = self.make_spotify(coalesce_window=0.01)
+        sp.track(fake_server.make_id("track 1"))
+
+        # Act
+        time.sleep(0.05)
+        track = sp.track(fake_server.make_id("track 2"))
+
+        # Assert
+        self.assertEqual(fake_server.make_id("track 2"), track["id"])
+        self.assertEqual({("GET", "tracks"): 2}, dict(self.server.requests))
+
+    def test_full_batches_are_split_at_the_maximum_number_of_ids(self):
+        # Arrange
+        sp = self.make_spotify(coalesce_window=0.5)
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(120)]
+
+        # Act
+        results = self.lookup_concurrently(sp, track_ids)
+
+        # Assert
+        self.assertEqual(track_ids, [result.result()["id"] for result in results])
+        self.assertEqual({("GET", "tracks"): 3}, dict(self.server.requests))
+
+    def test_missing_id_raises_not_found(self):
+        # Arrange
+        sp = self.make_spotify(coalesce_window=0.2)
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(3)]
+        self.server.missing_ids.add(track_ids[1])
+
+        # Act
+        results = self.lookup_concurrently(sp, track_ids)
+
+        # Assert
+        self.assertEqual(track_ids[0], results[0].result()["id"])
+        with self.assertRaises(exceptions.SpotifyRequestError) as context:
+            results[1].result()
+        self.assertEqual(HTTPStatus.NOT_FOUND, context.exception.status)
+        self.assertEqual({("GET", "tracks"): 1}, dict(self.server.requests))
+
+    def test_rejected_batch_is_looked_up_one_by_one(self):
+        # Arrange
+        sp = self.make_spotify(coalesce_window=0.2)
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(3)]
+        self.server.missing_ids.add(track_ids[2])
+        self.server.fail(1, status=HTTPStatus.BAD_REQUEST)
+
+        # Act
+        results = self.lookup_concurrently(sp, track_ids)
+
+        # Assert
+        self.assertEqual(track_ids[:2], [result.result()["id"] for result in results[:2]])
+        with self.assertRaises(exceptions.SpotifyRequestError) as context:
+            results[2].result()
+        self.assertEqual(HTTPStatus.NOT_FOUND, context.exception.status)
+        self.assertEqual({("GET", "tracks"): 1, ("GET", "tracks/{id}"): 3}, dict(self.server.requests))
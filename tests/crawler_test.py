@@ -0,0 +1,147 @@
+import collections
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import crawler
+from spotipy import export
+
+
+class CrawlerSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer(artist_count=300).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.reset_counters()
+        self.server.missing_ids.clear()
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        self.sp.base_api_url = self.server.api_url
+        self.addCleanup(self.sp.close)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.edges_path = os.path.join(directory.name, "edges.tsv")
+        self.artists_path = os.path.join(directory.name, "artists.jsonl")
+        self.checkpoint = os.path.join(directory.name, "crawl.json")
+        self.seed = fake_server.make_artist_id(0)
+
+    def read_edges(self) -> list:
+        with open(self.edges_path, "r") as file:
+            return [tuple(line.rstrip("\n").split("\t")) for line in file]
+
+    def expected_artists(self, max_depth: int = None) -> list:
+        depths = collections.OrderedDict([(self.seed, 0)])
+        queue = collections.deque([self.seed])
+        while queue:
+            artist_id = queue.popleft()
+            if max_depth is not None and depths[artist_id] >= max_depth:
+                continue
+            for related_id in self.server.fixtures.related_artist_ids(artist_id):
+                if related_id not in depths:
+                    depths[related_id] = depths[artist_id] + 1
+                    queue.append(related_id)
+        return list(depths)
+
+    def test_crawl_visits_every_artist_once(self):
+        # Act
+        result = crawler.crawl_related_artists(self.sp, [self.seed], self.edges_path, self.artists_path)
+
+        # Assert
+        artist_ids = self.expected_artists()
+        self.assertEqual(crawler.CrawlResult(len(artist_ids), len(artist_ids), 20 * len(artist_ids)), result)
+        self.assertEqual(set(artist_ids), {source for source, _ in self.read_edges()})
+        self.assertEqual(len(artist_ids), self.server.requests["GET", "artists/{id}/related-artists"])
+        artists = list(export.read_jsonl(self.artists_path))
+        self.assertEqual(sorted(artist_ids), sorted(artist["id"] for artist in artists))
+        self.assertEqual(-(-len(artist_ids) // 50), self.server.requests["GET", "artists"])
+
+    def test_crawl_stops_at_max_depth(self):
+        # Act
+        result = crawler.crawl_related_artists(self.sp, [self.seed], self.edges_path, max_depth=2, max_concurrency=4)
+
+        # Assert
+        artist_ids = self.expected_artists(max_depth=2)
+        self.assertEqual(len(artist_ids), result.artists)
+        self.assertEqual(len(self.expected_artists(max_depth=1)), result.expanded)
+        self.assertEqual(0, self.server.requests["GET", "artists"])
+
+    def test_artists_found_sooner_from_a_deeper_artist_keep_their_depth(self):
+        # Arrange
+        slow_seed, seed, near, far, beyond = [fake_server.make_artist_id(i) for i in range(5)]
+        graph = {slow_seed: [far], seed: [near], near: [far], far: [beyond], beyond: []}
+
+        def related_artists(artist_id):
+            if artist_id == slow_seed:
+                time.sleep(0.2)
+            return {"artists": [{"id": related_id} for related_id in graph[artist_id]]}
+
+        # Act
+        with mock.patch.object(self.sp, "artist_related_artists", side_effect=related_artists):
+            result = crawler.crawl_related_artists(
+                self.sp, [slow_seed, seed], self.edges_path, max_depth=2, max_concurrency=4
+            )
+
+        # Assert
+        self.assertEqual(crawler.CrawlResult(5, 4, 4), result)
+        self.assertIn((far, beyond), self.read_edges())
+
+    def test_missing_artist_has_no_edges(self):
+        # Arrange
+        self.server.missing_ids.add(self.seed)
+
+        # Act
+        result = crawler.crawl_related_artists(self.sp, [self.seed], self.edges_path)
+
+        # Assert
+        self.assertEqual(crawler.CrawlResult(1, 1, 0), result)
+        self.assertEqual([], self.read_edges())
+
+    def test_killed_crawl_resumes_without_requesting_again(self):
+        # Arrange
+        related_artists = self.sp.artist_related_artists
+        calls = []
+
+        def killed_after_100_calls(artist_id):
+            calls.append(artist_id)
+            if len(calls) > 100:
+                raise KeyboardInterrupt()
+            return related_artists(artist_id)
+
+        with mock.patch.object(self.sp, "artist_related_artists", side_effect=killed_after_100_calls):
+            with self.assertRaises(KeyboardInterrupt):
+                crawler.crawl_related_artists(
+                    self.sp, [self.seed], self.edges_path, self.artists_path, self.checkpoint, max_concurrency=1
+                )
+        self.server.reset_counters()
+
+        # Act
+        result = crawler.crawl_related_artists(
+            self.sp, [self.seed], self.edges_path, self.artists_path, self.checkpoint, max_concurrency=1
+        )
+
+        # Assert
+        artist_ids = self.expected_artists()
+        self.assertEqual(len(artist_ids), result.artists)
+        self.assertEqual(len(artist_ids) - 100, self.server.requests["GET", "artists/{id}/related-artists"])
+        self.assertEqual(20 * len(artist_ids), len(self.read_edges()))
+        self.assertEqual(len(set(self.read_edges())), len(self.read_edges()))
+        self.assertEqual(len(artist_ids), len(list(export.read_jsonl(self.artists_path))))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_of_another_crawl_raises(self):
+        # Arrange
+        with open(self.checkpoint, "w") as file:
+            file.write('{"job": "other"}')
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            crawler.crawl_related_artists(self.sp, [self.seed], self.edges_path, checkpoint=self.checkpoint)
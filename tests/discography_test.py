@@ -0,0 +1,101 @@
+import unittest
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import discography
+
+
+class NormalizeTitleSpec(unittest.TestCase):
+    def test_editions_have_the_same_title(self):
+        # Arrange
+        titles = [
+            "Abbey Road",
+            "Abbey Road (Remastered)",
+            "ABBEY ROAD [Super Deluxe Edition]",
+            "Abbey Road - 2019 Mix Deluxe Edition",
+        ]
+
+        # Act
+        normalized = {discography.normalize_title(title) for title in titles}
+
+        # Assert
+        self.assertEqual({"abbey road"}, normalized)
+
+    def test_other_qualifiers_are_kept(self):
+        # Act
+        normalized = discography.normalize_title("Live at Brixton (Part 1)")
+
+        # Assert
+        self.assertEqual("live at brixton part 1", normalized)
+
+    def test_accents_are_removed(self):
+        # Act
+        normalized = discography.normalize_title("Homogénic")
+
+        # Assert
+        self.assertEqual("homogenic", normalized)
+
+
+class DedupeAlbumsSpec(unittest.TestCase):
+    def test_dedupe_by_id_and_title(self):
+        # Arrange
+        albums = [
+            {"id": "a", "name": "Album", "album_group": "album", "total_tracks": 10},
+            {"id": "b", "name": "Other", "album_group": "album", "total_tracks": 8},
+            {"id": "c", "name": "Album (Deluxe Edition)", "album_group": "album", "total_tracks": 14},
+            {"id": "a", "name": "Album", "album_group": "appears_on", "total_tracks": 10},
+            {"id": "d", "name": "Album", "album_group": "single", "total_tracks": 1},
+            None,
+        ]
+
+        # Act
+        unique = discography.dedupe_albums(albums)
+
+        # Assert
+        self.assertEqual(["c", "b", "d"], [album["id"] for album in unique])
+        self.assertEqual(["a", "b", "c", "d"], [album["id"] for album in discography.dedupe_albums(albums, False)])
+
+
+class FetchDiscographySpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.reset_counters()
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        self.sp.base_api_url = self.server.api_url
+        self.addCleanup(self.sp.close)
+        artist_ids = [fake_server.make_id("discography artist {}".format(i)) for i in range(100)]
+        # an artist with a long discography
+        self.artist_id = max(artist_ids, key=lambda artist_id: len(self.server.fixtures.artist_album_ids(artist_id)))
+
+    def test_fetch_discography_with_all_tracks(self):
+        # Act
+        albums = discography.fetch_discography(self.sp, self.artist_id, dedupe_titles=False)
+
+        # Assert
+        album_ids = self.server.fixtures.artist_album_ids(self.artist_id)
+        self.assertEqual(album_ids, [album["id"] for album in albums])
+        for album in albums:
+            track_ids = self.server.fixtures.album_track_ids(album["id"])
+            self.assertEqual(track_ids, [track["id"] for track in album["tracks"]["items"]])
+            self.assertIsNotNone(album["album_group"])
+
+    def test_album_tracks_is_requested_only_for_truncated_albums(self):
+        # Arrange
+        album_ids = self.server.fixtures.artist_album_ids(self.artist_id)
+        truncated = [album_id for album_id in album_ids if len(self.server.fixtures.album_track_ids(album_id)) > 50]
+
+        # Act
+        discography.fetch_discography(self.sp, self.artist_id, dedupe_titles=False)
+
+        # Assert
+        self.assertEqual(-(-len(album_ids) // 50), self.server.requests["GET", "artists/{id}/albums"])
+        self.assertEqual(-(-len(album_ids) // 20), self.server.requests["GET", "albums"])
+        self.assertEqual(len(truncated), self.server.requests["GET", "albums/{id}/tracks"])
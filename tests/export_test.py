@@ -0,0 +1,91 @@
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import export
+
+
+class ExportSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        self.sp.base_api_url = self.server.api_url
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_export_playlist_tracks_to_gzip_file(self):
+        # Arrange
+        playlist_id = fake_server.make_id("playlist")
+        path = os.path.join(self.directory.name, "tracks.jsonl.gz")
+
+        # Act
+        count = export.export_playlist_tracks(self.sp, playlist_id, path, max_concurrency=2)
+
+        # Assert
+        self.assertEqual(250, count)
+        self.assertEqual(self.sp.fetch_all(self.sp.playlist_tracks, playlist_id), list(export.read_jsonl(path)))
+        with gzip.open(path, "rb") as file:
+            self.assertEqual(250, len(file.read().splitlines()))
+
+    def test_export_playlist_tracks_with_a_fields_filter(self):
+        # Arrange
+        playlist_id = fake_server.make_id("playlist")
+        path = os.path.join(self.directory.name, "tracks.jsonl")
+
+        # Act
+        count = export.export_playlist_tracks(self.sp, playlist_id, path, fields="items(track(id))")
+
+        # Assert
+        self.assertEqual(250, count)
+        track_ids = self.server.playlist_track_ids(playlist_id)
+        self.assertEqual([{"track": {"id": track_id}} for track_id in track_ids], list(export.read_jsonl(path)))
+
+    def test_iter_all_reads_the_pages_of_a_fields_filter_without_paging_keys(self):
+        # Arrange
+        playlist_id = fake_server.make_id("playlist")
+
+        # Act
+        items = list(self.sp.iter_all(self.sp.playlist_tracks, playlist_id, fields="items(track(id))"))
+
+        # Assert
+        self.assertEqual(self.server.playlist_track_ids(playlist_id), [item["track"]["id"] for item in items])
+
+    def test_export_saved_tracks_to_file_object(self):
+        # Arrange
+        file = io.BytesIO()
+
+        # Act
+        count = export.export_saved_tracks(self.sp, file)
+
+        # Assert
+        lines = file.getvalue().splitlines()
+        self.assertEqual(120, count)
+        self.assertEqual(120, len(lines))
+        self.assertTrue(file.getvalue().endswith(b"\n"))
+
+    def test_failed_export_leaves_no_file(self):
+        # Arrange
+        path = os.path.join(self.directory.name, "items.jsonl")
+
+        def items():
+            yield {"id": 1}
+            raise RuntimeError("source failed")
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            export.write_jsonl(items(), path)
+
+        # Assert
+        self.assertEqual([], os.listdir(self.directory.name))
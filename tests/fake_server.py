@@ -0,0 +1,1000 @@
+""" A local stand-in for the Spotify Web API and the accounts token endpoint, serving deterministic fixtures
+
+    Example usage::
+
+        with fake_server.FakeSpotifyServer(latency=0.01) as server:
+            sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+            sp.base_api_url = server.api_url
+            track = sp.track("4iV5W9uYEdYUVa79Axb7Rh")
+
+    Every object is generated from its id, so the same id always returns the same object.
+    Ids in missing_ids return 404, or null from the batch endpoints. The fields filter is applied to every GET.
+"""
+
+import collections
+import datetime
+import functools
+import hashlib
+import http.server
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from typing import Optional
+from urllib.parse import parse_qs
+from urllib.parse import urlencode
+from urllib.parse import urlparse
+
+from spotipy import metrics
+
+# the available markets of the tracks and albums, as many as a typical catalog item has
+MARKETS = (
+    "AD AE AG AL AM AO AR AT AU AZ BA BB BD BE BF BG BH BI BJ BN BO BR BS BT BW BY BZ CA CD CG CH CI CL CM CO CR CV "
+    "CW CY CZ DE DJ DK DM DO DZ EC EE EG ES FI FJ FM FR GA GB GD GE GH GM GN GQ GR GT GW GY HK HN HR HT HU ID IE IL "
+    "IN IQ IS IT JM JO JP KE KG KH KI KM KN KR KW KZ LA LB LC LI LK LR LS LT LU LV LY MA MC MD ME MG MH MK ML MN MO "
+    "MR MT MU MV MW MX MY MZ NA NE NG NI NL NO NP NR NZ OM PA PE PG PH PK PL PS PT PW PY QA RO RS RW SA SB SC SE SG "
+    "SI SK SL SM SN SR ST SV SZ TD TG TH TJ TL TN TO TR TT TV TW TZ UA UG US UY UZ VC VE VN VU WS XK ZA ZM ZW"
+).split()
+
+_BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def make_id(seed: str) -> str:
+    """ Returns a 22 characters base62 id derived from seed
+    """
+    number = int.from_bytes(hashlib.md5(seed.encode()).digest(), "big")
+    chars = []
+    for _ in range(22):
+        number, remainder = divmod(number, 62)
+        chars.append(_BASE62[remainder])
+    return "".join(reversed(chars))
+
+
+def make_artist_id(number: int) -> str:
+    """ Returns the id of the artist number of the related artists graph
+    """
+    return make_id("artist {}".format(number))
+
+
+def _number(seed: str, low: int, high: int) -> int:
+    return low + zlib.crc32(seed.encode()) % (high - low + 1)
+
+
+def _timestamp(seconds: int) -> str:
+    """ Returns the ISO 8601 time seconds after 2020-01-01
+    """
+    return (datetime.datetime(2020, 1, 1) + datetime.timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _fraction(seed: str) -> float:
+    return zlib.crc32(seed.encode()) / 0xFFFFFFFF
+
+
+class Fixtures:
+    """ Builds the JSON objects of the API
+    """
+
+    def __init__(self, base_url: str, playlist_size: int = 250, library_size: int = 120, artist_count: int = 100000):
+        self.base_url = base_url
+        self.playlist_size = playlist_size
+        self.library_size = library_size
+        self.artist_count = artist_count
+
+    def _object(self, item_type: str, item_id: str) -> dict:
+        return {
+            "id": item_id,
+            "type": item_type,
+            "uri": "spotify:{}:{}".format(item_type, item_id),
+            "href": "{}{}s/{}".format(self.base_url, item_type, item_id),
+            "external_urls": {"spotify": "https://open.spotify.com/{}/{}".format(item_type, item_id)},
+        }
+
+    def _images(self, seed: str) -> list:
+        return [
+            {"url": "https://i.scdn.co/image/{}".format(make_id(seed + str(size))), "height": size, "width": size}
+            for size in (640, 300, 64)
+        ]
+
+    def paging(self, url: str, items: list, total: int, limit: int, offset: int, params: dict = None) -> dict:
+        def page_url(page_offset):
+            query = dict(params or {}, limit=limit, offset=page_offset)
+            return "{}?{}".format(url, urlencode(query))
+
+        return {
+            "href": page_url(offset),
+            "items": items,
+            "limit": limit,
+            "offset": offset,
+            "total": total,
+            "next": page_url(offset + limit) if offset + limit < total else None,
+            "previous": page_url(max(offset - limit, 0)) if offset > 0 else None,
+        }
+
+    def simplified_artist(self, artist_id: str) -> dict:
+        return dict(self._object("artist", artist_id), name="Artist {}".format(artist_id[:6]))
+
+    @functools.lru_cache(maxsize=10000)
+    def artist(self, artist_id: str) -> dict:
+        return dict(
+            self.simplified_artist(artist_id),
+            followers={"href": None, "total": _number(artist_id + "followers", 0, 10000000)},
+            genres=["genre {}".format(_number(artist_id + "genre" + str(i), 1, 50)) for i in range(2)],
+            images=self._images(artist_id),
+            popularity=_number(artist_id + "popularity", 0, 100),
+        )
+
+    def album_artist_id(self, album_id: str) -> str:
+        return make_id("artist of " + album_id)
+
+    def album_track_ids(self, album_id: str) -> list:
+        return [make_id("{} track {}".format(album_id, i)) for i in range(_number(album_id + "tracks", 5, 60))]
+
+    @functools.lru_cache(maxsize=10000)
+    def simplified_album(self, album_id: str) -> dict:
+        album_type = ("album", "single", "compilation")[_number(album_id + "type", 0, 2)]
+        return dict(
+            self._object("album", album_id),
+            album_type=album_type,
+            album_group=album_type,
+            artists=[self.simplified_artist(self.album_artist_id(album_id))],
+            available_markets=MARKETS,
+            images=self._images(album_id),
+            name="Album {}".format(album_id[:6]),
+            release_date="{}-{:02d}-{:02d}".format(
+                _number(album_id + "year", 1960, 2020), _number(album_id + "month", 1, 12), _number(album_id, 1, 28)
+            ),
+            release_date_precision="day",
+            total_tracks=len(self.album_track_ids(album_id)),
+        )
+
+    @functools.lru_cache(maxsize=10000)
+    def album(self, album_id: str) -> dict:
+        track_ids = self.album_track_ids(album_id)
+        tracks = [self.simplified_track(track_id, album_id, i) for i, track_id in enumerate(track_ids[:50])]
+        return dict(
+            self.simplified_album(album_id),
+            copyrights=[{"text": "(C) Fake Records", "type": "C"}],
+            external_ids={"upc": str(_number(album_id + "upc", 10 ** 11, 10 ** 12 - 1))},
+            genres=[],
+            label="Fake Records",
+            popularity=_number(album_id + "popularity", 0, 100),
+            tracks=self.paging("{}albums/{}/tracks".format(self.base_url, album_id), tracks, len(track_ids), 50, 0),
+        )
+
+    def album_tracks(self, album_id: str, limit: int, offset: int) -> dict:
+        track_ids = self.album_track_ids(album_id)
+        tracks = [
+            self.simplified_track(track_id, album_id, i)
+            for i, track_id in enumerate(track_ids[offset : offset + limit], offset)
+        ]
+        return self.paging("{}albums/{}/tracks".format(self.base_url, album_id), tracks, len(track_ids), limit, offset)
+
+    def track_album_id(self, track_id: str) -> str:
+        return make_id("album of " + track_id)
+
+    def simplified_track(self, track_id: str, album_id: str = None, index: int = None) -> dict:
+        album_id = album_id or self.track_album_id(track_id)
+        return dict(
+            self._object("track", track_id),
+            artists=[self.simplified_artist(self.album_artist_id(album_id))],
+            available_markets=MARKETS,
+            disc_number=1,
+            duration_ms=_number(track_id + "duration", 90000, 420000),
+            explicit=_number(track_id + "explicit", 0, 4) == 0,
+            is_local=False,
+            name="Track {}".format(track_id[:6]),
+            preview_url="https://p.scdn.co/mp3-preview/{}".format(track_id),
+            track_number=index + 1 if index is not None else _number(track_id + "number", 1, 12),
+        )
+
+    @functools.lru_cache(maxsize=10000)
+    def track(self, track_id: str) -> dict:
+        album_id = self.track_album_id(track_id)
+        return dict(
+            self.simplified_track(track_id, album_id),
+            album=self.simplified_album(album_id),
+            external_ids={"isrc": "US{}".format(track_id[:10].upper())},
+            popularity=_number(track_id + "popularity", 0, 100),
+        )
+
+    @functools.lru_cache(maxsize=10000)
+    def audio_features(self, track_id: str) -> dict:
+        return {
+            "id": track_id,
+            "type": "audio_features",
+            "uri": "spotify:track:{}".format(track_id),
+            "track_href": "{}tracks/{}".format(self.base_url, track_id),
+            "analysis_url": "{}audio-analysis/{}".format(self.base_url, track_id),
+            "duration_ms": _number(track_id + "duration", 90000, 420000),
+            "acousticness": _fraction(track_id + "acousticness"),
+            "danceability": _fraction(track_id + "danceability"),
+            "energy": _fraction(track_id + "energy"),
+            "instrumentalness": _fraction(track_id + "instrumentalness"),
+            "liveness": _fraction(track_id + "liveness"),
+            "loudness": -60 * _fraction(track_id + "loudness"),
+            "speechiness": _fraction(track_id + "speechiness"),
+            "valence": _fraction(track_id + "valence"),
+            "tempo": 60 + 140 * _fraction(track_id + "tempo"),
+            "key": _number(track_id + "key", 0, 11),
+            "mode": _number(track_id + "mode", 0, 1),
+            "time_signature": _number(track_id + "time_signature", 3, 7),
+        }
+
+    @functools.lru_cache(maxsize=10000)
+    def audio_analysis(self, track_id: str) -> dict:
+        rng = random.Random(track_id)
+        duration = _number(track_id + "duration", 90000, 420000) / 1000
+
+        def intervals(length):
+            result = []
+            start = 0.0
+            while start < duration:
+                result.append({"start": round(start, 5), "duration": length, "confidence": round(rng.random(), 3)})
+                start += length
+            return result
+
+        segments = []
+        for interval in intervals(0.25):
+            interval.update(
+                loudness_start=round(-60 * rng.random(), 3),
+                loudness_max=round(-30 * rng.random(), 3),
+                loudness_max_time=round(interval["duration"] * rng.random(), 5),
+                loudness_end=0.0,
+                pitches=[round(rng.random(), 3) for _ in range(12)],
+                timbre=[round(rng.uniform(-100, 100), 3) for _ in range(12)],
+            )
+            segments.append(interval)
+
+        features = self.audio_features(track_id)
+        sections = intervals(30.0)
+        for section in sections:
+            section.update(
+                loudness=features["loudness"],
+                tempo=features["tempo"],
+                tempo_confidence=0.5,
+                key=features["key"],
+                key_confidence=0.5,
+                mode=features["mode"],
+                mode_confidence=0.5,
+                time_signature=features["time_signature"],
+                time_signature_confidence=0.5,
+            )
+        beat = 60 / features["tempo"]
+        return {
+            "meta": {"analyzer_version": "4.0.0", "platform": "Linux", "status_code": 0, "timestamp": 0},
+            "track": {
+                "duration": duration,
+                "tempo": features["tempo"],
+                "key": features["key"],
+                "mode": features["mode"],
+                "loudness": features["loudness"],
+                "time_signature": features["time_signature"],
+            },
+            "bars": intervals(beat * features["time_signature"]),
+            "beats": intervals(beat),
+            "tatums": intervals(beat / 2),
+            "sections": sections,
+            "segments": segments,
+        }
+
+    def user(self, user_id: str) -> dict:
+        return dict(
+            self._object("user", user_id),
+            display_name="User {}".format(user_id),
+            followers={"href": None, "total": _number(user_id + "followers", 0, 1000)},
+            images=[],
+        )
+
+    def current_user(self) -> dict:
+        return dict(self.user("fake_user"), country="US", email="fake_user@example.com", product="premium")
+
+    def playlist_track_ids(self, playlist_id: str) -> list:
+        return [make_id("{} item {}".format(playlist_id, i)) for i in range(self.playlist_size)]
+
+    def playlist_track(self, track_id: Optional[str]) -> dict:
+        """ Returns the playlist item of a track id, None is an unavailable track and a spotify:local: URI a local file
+        """
+        item = {"added_at": "2020-01-01T00:00:00Z", "added_by": self.user("fake_user"), "is_local": False}
+        if track_id is None:
+            return dict(item, track=None)
+        if track_id.startswith("spotify:local:"):
+            local_track = {"id": None, "uri": track_id, "name": track_id.split(":")[-2], "type": "track"}
+            return dict(item, is_local=True, track=dict(local_track, is_local=True))
+        return dict(item, track=self.track(track_id))
+
+    def playlist_tracks(self, playlist_id: str, limit: int, offset: int, track_ids: list = None) -> dict:
+        if track_ids is None:
+            track_ids = self.playlist_track_ids(playlist_id)
+        items = [self.playlist_track(track_id) for track_id in track_ids[offset : offset + limit]]
+        return self.paging(
+            "{}playlists/{}/tracks".format(self.base_url, playlist_id), items, len(track_ids), limit, offset
+        )
+
+    def simplified_playlist(self, playlist_id: str, snapshot_id: str = None, total: int = None) -> dict:
+        return dict(
+            self._object("playlist", playlist_id),
+            collaborative=False,
+            description="",
+            images=self._images(playlist_id),
+            name="Playlist {}".format(playlist_id[:6]),
+            owner=self.user("fake_user"),
+            public=True,
+            snapshot_id=snapshot_id or make_id("snapshot of " + playlist_id),
+            tracks={
+                "href": "{}playlists/{}/tracks".format(self.base_url, playlist_id),
+                "total": self.playlist_size if total is None else total,
+            },
+        )
+
+    def playlist(self, playlist_id: str, snapshot_id: str = None, track_ids: list = None) -> dict:
+        return dict(
+            self.simplified_playlist(playlist_id, snapshot_id),
+            followers={"href": None, "total": _number(playlist_id + "followers", 0, 100000)},
+            tracks=self.playlist_tracks(playlist_id, 100, 0, track_ids),
+        )
+
+    def artist_album_ids(self, artist_id: str) -> list:
+        return [make_id("{} album {}".format(artist_id, i)) for i in range(_number(artist_id + "albums", 1, 120))]
+
+    def related_artist_ids(self, artist_id: str) -> list:
+        """ Returns 20 artists of the artist_count ones of make_artist_id, so the related artists form a graph
+        """
+        related_ids = []
+        i = 0
+        while len(related_ids) < min(20, self.artist_count - 1):
+            related_id = make_artist_id(_number("{} related {}".format(artist_id, i), 0, self.artist_count - 1))
+            if related_id != artist_id and related_id not in related_ids:
+                related_ids.append(related_id)
+            i += 1
+        return related_ids
+
+    def paged(self, url: str, make_item, ids: list, limit: int, offset: int, params: dict = None) -> dict:
+        items = [make_item(item_id) for item_id in ids[offset : offset + limit]]
+        return self.paging(url, items, len(ids), limit, offset, params)
+
+    def library_ids(self, kind: str) -> list:
+        return [make_id("saved {} {}".format(kind, i)) for i in range(self.library_size)]
+
+
+def _parse_fields(expression: str) -> dict:
+    """ Parses a fields filter, e.g. "items(added_at,track.id),total", into nested dicts of the keys.
+        The value of a key whose whole value is selected is None.
+    """
+    tokens = re.findall(r"[^.,()]+|[.,()]", expression)
+    position = 0
+
+    def parse_list() -> dict:
+        nonlocal position
+        tree = {}
+        while position < len(tokens) and tokens[position] != ")":
+            key = tokens[position]
+            position += 1
+            children = None
+            if position < len(tokens) and tokens[position] == ".":
+                position += 1
+                children = parse_item()
+            elif position < len(tokens) and tokens[position] == "(":
+                position += 1
+                children = parse_list()
+                position += 1
+            tree[key] = children
+            if position < len(tokens) and tokens[position] == ",":
+                position += 1
+        return tree
+
+    def parse_item() -> dict:
+        nonlocal position
+        key = tokens[position]
+        position += 1
+        if position < len(tokens) and tokens[position] == ".":
+            position += 1
+            return {key: parse_item()}
+        if position < len(tokens) and tokens[position] == "(":
+            position += 1
+            children = parse_list()
+            position += 1
+            return {key: children}
+        return {key: None}
+
+    return parse_list()
+
+
+def _apply_fields(value, tree: dict):
+    if tree is None or value is None:
+        return value
+    if isinstance(value, list):
+        return [_apply_fields(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: _apply_fields(value[key], children) for key, children in tree.items() if key in value}
+    return value
+
+
+class _Route:
+    def __init__(self, method: str, pattern: str, handler):
+        self.method = method
+        self.pattern = re.compile("^{}$".format(pattern))
+        self.handler = handler
+
+
+class _Request(collections.namedtuple("_Request", ["endpoint", "query", "payload"])):
+    def limit_offset(self, default_limit: int) -> tuple:
+        return int(self.query.get("limit", default_limit)), int(self.query.get("offset", 0))
+
+
+class _Reply(Exception):
+    def __init__(self, status: int, body=None, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+def _error(status: int, message: str) -> _Reply:
+    return _Reply(status, {"error": {"status": status, "message": message}})
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class FakeSpotifyServer:
+    """
+    Serves the endpoints used by spotipy.Spotify and spotipy.auth.request_token on a local port.
+
+    Fault injection:
+        - latency - seconds every request waits before it's answered, plus up to jitter seconds
+        - rate_limit(count, retry_after) - the next count API requests are answered with 429 and Retry-After
+        - fail(count, status, retry_after) - the next count API requests are answered with a 5xx error
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        playlist_size: int = 250,
+        library_size: int = 120,
+        artist_count: int = 100000,
+        token_expires_in: int = 3600,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_expires_in = token_expires_in
+        self.missing_ids = set()
+        # the track ids of the playlists that were changed, and their snapshot ids
+        self.playlists = {}
+        self._snapshot_ids = {}
+        # kind -> the [id, added_at] of the saved items, newest first, created on first use
+        self._libraries = {}
+        self._saves = 0
+        self.requests = collections.Counter()
+        self.token_requests = 0
+        self._rate_limited = 0
+        self._retry_after = 1
+        self._failures = 0
+        self._failure_status = 503
+        self._failure_retry_after = None
+        self._snapshots = 0
+        self._random = random.Random(0)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self._server = _Server((host, port), self._make_handler())
+        self.url = "http://{}:{}/".format(*self._server.server_address[:2])
+        self.api_url = self.url + "v1/"
+        self.token_url = self.url + "api/token"
+        self.fixtures = Fixtures(self.api_url, playlist_size, library_size, artist_count)
+        self._routes = self._make_routes()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-spotify", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def rate_limit(self, count: int, retry_after: int = 1):
+        """ Answers the next count API requests with 429 Too Many Requests
+        """
+        with self._lock:
+            self._rate_limited = count
+            self._retry_after = retry_after
+
+    def fail(self, count: int, status: int = 503, retry_after: int = None):
+        """ Answers the next count API requests with the given server error
+        """
+        with self._lock:
+            self._failures = count
+            self._failure_status = status
+            self._failure_retry_after = retry_after
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+            self.token_requests = 0
+
+    def playlist_track_ids(self, playlist_id: str) -> list:
+        """ Returns the current track ids of a playlist
+        """
+        with self._lock:
+            track_ids = self.playlists.get(playlist_id)
+            return list(track_ids) if track_ids is not None else self.fixtures.playlist_track_ids(playlist_id)
+
+    def set_playlist(self, playlist_id: str, track_ids: list):
+        """ Replaces the items of a playlist, see Fixtures.playlist_track for the unavailable and local items
+        """
+        with self._lock:
+            self.playlists[playlist_id] = list(track_ids)
+
+    def _library(self, kind: str) -> list:
+        library = self._libraries.get(kind)
+        if library is None:
+            library = self._libraries[kind] = [
+                [item_id, _timestamp(-i)] for i, item_id in enumerate(self.fixtures.library_ids(kind))
+            ]
+        return library
+
+    def saved_ids(self, kind: str) -> list:
+        """ Returns the ids of the saved items of a kind, newest first
+        """
+        with self._lock:
+            return [item_id for item_id, _ in self._library(kind)]
+
+    def save_items(self, kind: str, item_ids: list):
+        """ Saves items to the library, the saved ones again with a new added_at
+        """
+        with self._lock:
+            library = self._library(kind)
+            library[:] = [entry for entry in library if entry[0] not in item_ids]
+            for item_id in item_ids:
+                self._saves += 1
+                library.insert(0, [item_id, _timestamp(self._saves)])
+
+    def remove_saved_items(self, kind: str, item_ids: list):
+        with self._lock:
+            library = self._library(kind)
+            library[:] = [entry for entry in library if entry[0] not in item_ids]
+
+    def _change_playlist(self, playlist_id: str, change) -> dict:
+        """ Applies change to a copy of the track ids of a playlist and stores it, change raises _Reply on errors
+        """
+        with self._lock:
+            track_ids = self.playlists.get(playlist_id)
+            track_ids = list(track_ids if track_ids is not None else self.fixtures.playlist_track_ids(playlist_id))
+            change(track_ids)
+            self.playlists[playlist_id] = track_ids
+            self._snapshots += 1
+            snapshot_id = make_id("{} snapshot {}".format(playlist_id, self._snapshots))
+            self._snapshot_ids[playlist_id] = snapshot_id
+        return {"snapshot_id": snapshot_id}
+
+    def _injected_fault(self):
+        with self._lock:
+            if self._rate_limited > 0:
+                self._rate_limited -= 1
+                return _Reply(
+                    429,
+                    {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                    {"Retry-After": str(self._retry_after)},
+                )
+            if self._failures > 0:
+                self._failures -= 1
+                headers = (
+                    {"Retry-After": str(self._failure_retry_after)} if self._failure_retry_after is not None else {}
+                )
+                return _Reply(
+                    self._failure_status,
+                    {"error": {"status": self._failure_status, "message": "Server error"}},
+                    headers,
+                )
+        return None
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # the headers and the body are written separately, don't wait for the ack of the headers
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                try:
+                    server._delay()
+                    server._dispatch(self.command, self.path, self.headers, body)
+                except _Reply as reply:
+                    self._send(reply)
+
+            def _send(self, reply: _Reply):
+                content = b""
+                if reply.body is not None:
+                    content = json.dumps(reply.body, separators=(",", ":")).encode()
+                headers = dict(reply.headers)
+                if self.command == "GET" and reply.status == 200:
+                    etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        reply = _Reply(304)
+                        content = b""
+                self.send_response(reply.status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if content:
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
+
+    def _dispatch(self, method: str, path: str, headers, body: bytes):
+        url = urlparse(path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/api/token":
+            raise self._token(method, headers, body)
+
+        if not url.path.startswith("/v1/"):
+            raise _error(404, "Service not found")
+        if not (headers.get("Authorization") or "").startswith("Bearer "):
+            raise _error(401, "No token provided")
+
+        endpoint = url.path[len("/v1/") :].rstrip("/")
+        with self._lock:
+            self.requests[method, metrics.normalize_endpoint(endpoint)] += 1
+        fault = self._injected_fault()
+        if fault is not None:
+            raise fault
+
+        request = _Request(endpoint, query, json.loads(body) if body else None)
+        for route in self._routes:
+            match = route.pattern.match(endpoint)
+            if match and route.method == method:
+                result = route.handler(request, *match.groups())
+                if result is not None and request.query.get("fields"):
+                    result = _apply_fields(result, _parse_fields(request.query["fields"]))
+                raise _Reply(200 if result is not None else 204, result)
+        raise _error(404, "Service not found")
+
+    def _token(self, method: str, headers, body: bytes) -> _Reply:
+        if method != "POST":
+            return _error(405, "Method not allowed")
+        if not (headers.get("Authorization") or "").startswith("Basic "):
+            return _Reply(400, {"error": "invalid_client", "error_description": "Invalid client"})
+        form = {key: values[-1] for key, values in parse_qs(body.decode()).items()}
+        with self._lock:
+            self.token_requests += 1
+            token_number = self.token_requests
+        token = {
+            "access_token": "fake-access-token-{}".format(token_number),
+            "token_type": "Bearer",
+            "expires_in": self.token_expires_in,
+            "scope": form.get("scope", ""),
+        }
+        if form.get("grant_type") == "authorization_code":
+            token["refresh_token"] = "fake-refresh-token"
+        elif form.get("grant_type") not in ("client_credentials", "refresh_token"):
+            return _Reply(400, {"error": "unsupported_grant_type", "error_description": "Unsupported grant type"})
+        return _Reply(200, token)
+
+    def _make_routes(self) -> list:
+        fixtures = self.fixtures
+        id_pattern = "([^/]+)"
+
+        def item(make_item):
+            def handler(request, item_id):
+                if item_id in self.missing_ids:
+                    raise _error(404, "non existing id")
+                return make_item(item_id)
+
+            return handler
+
+        def batch(key, make_item, max_ids):
+            def handler(request):
+                ids = request.query.get("ids", "").split(",")
+                if not request.query.get("ids") or len(ids) > max_ids:
+                    raise _error(400, "invalid request")
+                return {key: [None if item_id in self.missing_ids else make_item(item_id) for item_id in ids]}
+
+            return handler
+
+        def paged(make_ids, make_item, key=None, default_limit=20):
+            def handler(request, *args):
+                limit, offset = request.limit_offset(default_limit)
+                params = {name: value for name, value in request.query.items() if name not in ("limit", "offset")}
+                url = fixtures.base_url + request.endpoint
+                page = fixtures.paged(url, make_item, make_ids(*args), limit, offset, params)
+                return {key: page} if key else page
+
+            return handler
+
+        def saved(kind, make_item):
+            def handler(request):
+                limit, offset = request.limit_offset(20)
+                with self._lock:
+                    entries = self._library(kind)[offset : offset + limit]
+                    total = len(self._library(kind))
+                items = [{"added_at": added_at, kind: make_item(item_id)} for item_id, added_at in entries]
+                return fixtures.paging(fixtures.base_url + request.endpoint, items, total, limit, offset)
+
+            return handler
+
+        def saved_contains(request, kind):
+            saved_ids = set(self.saved_ids(kind[:-1]))
+            return [item_id in saved_ids for item_id in request.query.get("ids", "").split(",")]
+
+        def ids_of(request) -> list:
+            return [item_id for item_id in request.query.get("ids", "").split(",") if item_id]
+
+        def save(request, kind):
+            self.save_items(kind[:-1], ids_of(request))
+
+        def remove_saved(request, kind):
+            self.remove_saved_items(kind[:-1], ids_of(request))
+
+        def contains(request, *args):
+            return [_number(item_id, 0, 1) == 1 for item_id in request.query.get("ids", "").split(",")]
+
+        def empty(request, *args):
+            return None
+
+        def followed_artists(request):
+            limit = int(request.query.get("limit", 20))
+            ids = fixtures.library_ids("artist")
+            start = ids.index(request.query["after"]) + 1 if request.query.get("after") in ids else 0
+            artists = [fixtures.artist(artist_id) for artist_id in ids[start : start + limit]]
+            after = artists[-1]["id"] if artists and start + limit < len(ids) else None
+            url = "{}me/following?type=artist&limit={}".format(fixtures.base_url, limit)
+            return {
+                "artists": {
+                    "href": url,
+                    "items": artists,
+                    "limit": limit,
+                    "total": len(ids),
+                    "cursors": {"after": after},
+                    "next": "{}&after={}".format(url, after) if after else None,
+                }
+            }
+
+        def search(request):
+            limit, offset = request.limit_offset(10)
+            makers = {
+                "track": fixtures.track,
+                "artist": fixtures.artist,
+                "album": fixtures.simplified_album,
+                "playlist": fixtures.simplified_playlist,
+            }
+            result = {}
+            for kind in request.query.get("type", "track").split(","):
+                seeds = ["{} {} {}".format(request.query.get("q"), kind, i) for i in range(offset, offset + limit)]
+                result[kind + "s"] = fixtures.paging(
+                    fixtures.base_url + "search",
+                    [makers[kind](make_id(seed)) for seed in seeds],
+                    1000,
+                    limit,
+                    offset,
+                    {"q": request.query.get("q"), "type": kind},
+                )
+            return result
+
+        def top_tracks(request, artist_id):
+            return {"tracks": [fixtures.track(make_id("{} top {}".format(artist_id, i))) for i in range(10)]}
+
+        def related_artists(request, artist_id):
+            if artist_id in self.missing_ids:
+                raise _error(404, "non existing id")
+            return {"artists": [fixtures.artist(related_id) for related_id in fixtures.related_artist_ids(artist_id)]}
+
+        def album_tracks(request, album_id):
+            return fixtures.album_tracks(album_id, *request.limit_offset(20))
+
+        def playlist(request, playlist_id):
+            if playlist_id in self.missing_ids:
+                raise _error(404, "non existing id")
+            with self._lock:
+                snapshot_id = self._snapshot_ids.get(playlist_id)
+            return fixtures.playlist(playlist_id, snapshot_id, self.playlist_track_ids(playlist_id))
+
+        def playlist_tracks(request, playlist_id):
+            limit, offset = request.limit_offset(100)
+            return fixtures.playlist_tracks(playlist_id, limit, offset, self.playlist_track_ids(playlist_id))
+
+        def track_ids_of(uris: list) -> list:
+            if uris is None or len(uris) > 100:
+                raise _error(400, "invalid request")
+            return [uri.split(":")[-1] for uri in uris]
+
+        def add_tracks(request, playlist_id):
+            added = track_ids_of(request.payload.get("uris"))
+
+            def change(track_ids):
+                position = request.payload.get("position", len(track_ids))
+                if not 0 <= position <= len(track_ids):
+                    raise _error(400, "Index out of bounds")
+                track_ids[position:position] = added
+
+            return self._change_playlist(playlist_id, change)
+
+        def replace_or_reorder_tracks(request, playlist_id):
+            payload = request.payload
+            if "uris" in payload:
+                replacement = track_ids_of(payload["uris"])
+                return self._change_playlist(
+                    playlist_id, lambda track_ids: track_ids.__setitem__(slice(None), replacement)
+                )
+
+            def change(track_ids):
+                start, length = payload["range_start"], payload.get("range_length", 1)
+                insert_before = payload["insert_before"]
+                if start + length > len(track_ids) or insert_before > len(track_ids):
+                    raise _error(400, "Index out of bounds")
+                moved = track_ids[start : start + length]
+                del track_ids[start : start + length]
+                if insert_before > start:
+                    insert_before = max(insert_before - length, start)
+                track_ids[insert_before:insert_before] = moved
+
+            return self._change_playlist(playlist_id, change)
+
+        def remove_tracks(request, playlist_id):
+            tracks = request.payload.get("tracks") or []
+            removed = track_ids_of([track["uri"] for track in tracks])
+
+            def change(track_ids):
+                positions = set()
+                all_occurrences = {track_id for track_id, track in zip(removed, tracks) if "positions" not in track}
+                if all_occurrences:
+                    positions.update(i for i, track_id in enumerate(track_ids) if track_id in all_occurrences)
+                for track_id, track in zip(removed, tracks):
+                    if "positions" not in track:
+                        continue
+                    for position in track["positions"]:
+                        if position >= len(track_ids) or track_ids[position] != track_id:
+                            raise _error(400, "Could not remove tracks, please check parameters.")
+                        positions.add(position)
+                track_ids[:] = [track_id for i, track_id in enumerate(track_ids) if i not in positions]
+
+            return self._change_playlist(playlist_id, change)
+
+        def user_playlist_ids(user_id):
+            return [make_id("{} playlist {}".format(user_id, i)) for i in range(30)]
+
+        def create_playlist(request, user_id):
+            name = request.payload.get("name")
+            playlist = fixtures.playlist(make_id("{} {}".format(user_id, name)))
+            return dict(playlist, name=name, public=request.payload.get("public", True))
+
+        def recommendations(request):
+            limit = int(request.query.get("limit", 20))
+            seed = ",".join(request.query.get(key, "") for key in ("seed_artists", "seed_genres", "seed_tracks"))
+            return {"seeds": [], "tracks": [fixtures.track(make_id("{} {}".format(seed, i))) for i in range(limit)]}
+
+        def genre_seeds(request):
+            return {"genres": ["genre {}".format(i) for i in range(1, 51)]}
+
+        def player(request):
+            return {
+                "device": {"id": "fake_device", "is_active": True, "name": "Fake", "type": "Computer"},
+                "is_playing": True,
+                "progress_ms": 1000,
+                "item": fixtures.track(make_id("now playing")),
+                "repeat_state": "off",
+                "shuffle_state": False,
+            }
+
+        def devices(request):
+            return {"devices": [player(request)["device"]]}
+
+        def played(track_id):
+            return {"played_at": "2020-01-01T00:00:00Z", "track": fixtures.track(track_id)}
+
+        def category(category_id):
+            return {"id": category_id, "name": category_id.title(), "icons": []}
+
+        return [
+            _Route("GET", "tracks", batch("tracks", fixtures.track, 50)),
+            _Route("GET", "tracks/" + id_pattern, item(fixtures.track)),
+            _Route("GET", "artists", batch("artists", fixtures.artist, 50)),
+            _Route(
+                "GET",
+                "artists/{}/albums".format(id_pattern),
+                paged(fixtures.artist_album_ids, fixtures.simplified_album),
+            ),
+            _Route("GET", "artists/{}/top-tracks".format(id_pattern), top_tracks),
+            _Route("GET", "artists/{}/related-artists".format(id_pattern), related_artists),
+            _Route("GET", "artists/" + id_pattern, item(fixtures.artist)),
+            _Route("GET", "albums", batch("albums", fixtures.album, 20)),
+            _Route("GET", "albums/{}/tracks".format(id_pattern), album_tracks),
+            _Route("GET", "albums/" + id_pattern, item(fixtures.album)),
+            _Route("GET", "audio-features", batch("audio_features", fixtures.audio_features, 100)),
+            _Route("GET", "audio-features/" + id_pattern, item(fixtures.audio_features)),
+            _Route("GET", "audio-analysis/" + id_pattern, item(fixtures.audio_analysis)),
+            _Route("GET", "search", search),
+            _Route("GET", "users/" + id_pattern, item(fixtures.user)),
+            _Route(
+                "GET", "users/{}/playlists".format(id_pattern), paged(user_playlist_ids, fixtures.simplified_playlist)
+            ),
+            _Route("POST", "users/{}/playlists".format(id_pattern), create_playlist),
+            _Route("GET", "playlists/{}/tracks".format(id_pattern), playlist_tracks),
+            _Route("POST", "playlists/{}/tracks".format(id_pattern), add_tracks),
+            _Route("PUT", "playlists/{}/tracks".format(id_pattern), replace_or_reorder_tracks),
+            _Route("DELETE", "playlists/{}/tracks".format(id_pattern), remove_tracks),
+            _Route("GET", "playlists/{}/followers/contains".format(id_pattern), contains),
+            _Route("PUT", "playlists/{}/followers".format(id_pattern), empty),
+            _Route("DELETE", "playlists/{}/followers".format(id_pattern), empty),
+            _Route("GET", "playlists/" + id_pattern, playlist),
+            _Route("PUT", "playlists/" + id_pattern, empty),
+            _Route("GET", "me", lambda request: fixtures.current_user()),
+            _Route(
+                "GET", "me/playlists", paged(lambda: fixtures.library_ids("playlist"), fixtures.simplified_playlist)
+            ),
+            _Route("GET", "me/tracks", saved("track", fixtures.track)),
+            _Route("GET", "me/albums", saved("album", fixtures.album)),
+            _Route("GET", "me/(tracks|albums)/contains", saved_contains),
+            _Route("PUT", "me/(tracks|albums)", save),
+            _Route("DELETE", "me/(tracks|albums)", remove_saved),
+            _Route("GET", "me/following/contains", contains),
+            _Route("PUT", "me/following", empty),
+            _Route("DELETE", "me/following", empty),
+            _Route("GET", "me/following", followed_artists),
+            _Route("GET", "me/top/artists", paged(lambda: fixtures.library_ids("top artist"), fixtures.artist)),
+            _Route("GET", "me/top/tracks", paged(lambda: fixtures.library_ids("top track"), fixtures.track)),
+            _Route("GET", "me/player/recently-played", paged(lambda: fixtures.library_ids("recent"), played)),
+            _Route("GET", "me/player/devices", devices),
+            _Route("GET", "me/player(?:/currently-playing)?", player),
+            _Route("PUT", "me/player(?:/[a-z]+)?", empty),
+            _Route("POST", "me/player/(?:next|previous)", empty),
+            _Route(
+                "GET",
+                "browse/featured-playlists",
+                paged(lambda: fixtures.library_ids("featured"), fixtures.simplified_playlist, "playlists"),
+            ),
+            _Route(
+                "GET",
+                "browse/new-releases",
+                paged(lambda: fixtures.library_ids("new release"), fixtures.simplified_album, "albums"),
+            ),
+            _Route(
+                "GET",
+                "browse/categories",
+                paged(lambda: ["category{}".format(i) for i in range(40)], category, "categories"),
+            ),
+            _Route(
+                "GET",
+                "browse/categories/{}/playlists".format(id_pattern),
+                paged(user_playlist_ids, fixtures.simplified_playlist, "playlists"),
+            ),
+            _Route("GET", "recommendations", recommendations),
+            _Route("GET", "recommendations/available-genre-seeds", genre_seeds),
+        ]
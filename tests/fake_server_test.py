@@ -0,0 +1,313 @@
+import time
+import unittest
+from concurrent import futures
+from http import HTTPStatus
+from unittest import mock
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import cache
+from spotipy import decoders
+from spotipy import exceptions
+from spotipy import playlists
+
+
+class FakeServerSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.reset_counters()
+        self.server.missing_ids.clear()
+        self.sp = self.make_spotify()
+
+    def make_spotify(self, **kwargs) -> spotipy.Spotify:
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"), **kwargs)
+        sp.base_api_url = self.server.api_url
+        return sp
+
+
+class BatchSpec(FakeServerSpec):
+    def test_get_tracks_more_than_max_ids(self):
+        # Arrange
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(120)]
+
+        # Act
+        tracks = self.sp.tracks(track_ids)
+
+        # Assert
+        self.assertEqual(track_ids, [track["id"] for track in tracks])
+        self.assertEqual(3, self.server.requests["GET", "tracks"])
+
+    def test_get_tracks_returns_none_for_missing_track(self):
+        # Arrange
+        missing_id = fake_server.make_id("missing")
+        self.server.missing_ids.add(missing_id)
+
+        # Act
+        tracks = self.sp.tracks([fake_server.make_id("track"), missing_id])
+
+        # Assert
+        self.assertIsNotNone(tracks[0])
+        self.assertIsNone(tracks[1])
+
+    def test_get_missing_track_raises_not_found(self):
+        # Arrange
+        missing_id = fake_server.make_id("missing")
+        self.server.missing_ids.add(missing_id)
+
+        # Act
+        with self.assertRaises(exceptions.SpotifyRequestError) as context:
+            self.sp.track(missing_id)
+
+        # Assert
+        self.assertEqual(HTTPStatus.NOT_FOUND, context.exception.status)
+
+
+class PaginationSpec(FakeServerSpec):
+    def test_fetch_all_playlist_tracks(self):
+        # Arrange
+        playlist_id = fake_server.make_id("playlist")
+
+        # Act
+        items = self.sp.fetch_all(self.sp.playlist_tracks, playlist_id)
+
+        # Assert
+        expected = self.server.fixtures.playlist_track_ids(playlist_id)
+        self.assertEqual(expected, [item["track"]["id"] for item in items])
+        self.assertEqual(3, self.server.requests["GET", "playlists/{id}/tracks"])
+
+
+class RetrySpec(FakeServerSpec):
+    def test_rate_limited_request_is_retried(self):
+        # Arrange
+        self.server.rate_limit(1, retry_after=0)
+
+        # Act
+        user = self.sp.user("fake_user")
+
+        # Assert
+        self.assertEqual("fake_user", user["id"])
+        self.assertEqual(2, self.server.requests["GET", "users/{id}"])
+
+    def test_server_error_with_retry_after_is_retried(self):
+        # Arrange
+        self.server.fail(2, HTTPStatus.SERVICE_UNAVAILABLE, retry_after=0)
+
+        # Act
+        user = self.sp.user("fake_user")
+
+        # Assert
+        self.assertEqual("fake_user", user["id"])
+        self.assertEqual(3, self.server.requests["GET", "users/{id}"])
+
+
+class ETagSpec(FakeServerSpec):
+    def test_not_modified_response_is_returned_from_cache(self):
+        # Arrange
+        sp = self.make_spotify(etag_cache=cache.ETagCache())
+        first = sp.artist(fake_server.make_id("artist"))
+
+        # Act
+        second = sp.artist(fake_server.make_id("artist"))
+
+        # Assert
+        self.assertIs(first, second)
+
+    def test_cache_keys_do_not_hold_the_refresh_token(self):
+        # Arrange
+        etag_cache = cache.ETagCache()
+        expires_at = int(time.time()) + 3600
+        provider = auth.AuthorizationCode("client_id", "client_secret", "refresh_token", "token", expires_at)
+        other = auth.AuthorizationCode("client_id", "client_secret", "other", "token", expires_at)
+        sp = spotipy.Spotify(provider, etag_cache=etag_cache)
+        sp.base_api_url = self.server.api_url
+
+        # Act
+        sp.artist(fake_server.make_id("artist"))
+
+        # Assert
+        self.assertNotEqual(provider.cache_scope, other.cache_scope)
+        self.assertNotIn("refresh_token", repr(list(etag_cache._entries)))
+
+
+class CatalogCacheSpec(FakeServerSpec):
+    def test_cached_item_is_not_requested_again(self):
+        # Arrange
+        sp = self.make_spotify(catalog_cache=cache.MemoryCache())
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(3)]
+        sp.track(track_ids[0])
+
+        # Act
+        tracks = sp.tracks(track_ids)
+
+        # Assert
+        self.assertEqual(track_ids, [track["id"] for track in tracks])
+        self.assertEqual(1, self.server.requests["GET", "tracks/{id}"])
+        self.assertEqual(1, self.server.requests["GET", "tracks"])
+
+    def test_items_of_the_market_of_the_token_are_cached_per_user(self):
+        # Arrange
+        catalog_cache = cache.MemoryCache()
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"), catalog_cache=catalog_cache)
+        other = spotipy.Spotify(auth.PlainAccessToken("other token"), catalog_cache=catalog_cache)
+        sp.base_api_url = other.base_api_url = self.server.api_url
+        track_id = fake_server.make_id("track")
+        sp.track(track_id, market="from_token")
+
+        # Act
+        other.track(track_id, market="from_token")
+        sp.track(track_id, market="from_token")
+
+        # Assert
+        self.assertEqual(2, self.server.requests["GET", "tracks/{id}"])
+
+
+class ClientCredentialsSpec(FakeServerSpec):
+    def test_access_token_is_requested_once(self):
+        # Arrange
+        with mock.patch.object(auth, "TOKEN_URL", self.server.token_url):
+            sp = spotipy.Spotify(auth.ClientCredentials("client_id", "client_secret"))
+            sp.base_api_url = self.server.api_url
+
+            # Act
+            sp.user("a")
+            sp.user("b")
+
+        # Assert
+        self.assertEqual(1, self.server.token_requests)
+
+    def test_concurrent_requests_of_an_expired_token_request_it_once(self):
+        # Arrange
+        provider = auth.AuthorizationCode("client_id", "client_secret", "refresh_token", "expired", int(time.time()))
+
+        # Act
+        with mock.patch.object(auth, "TOKEN_URL", self.server.token_url):
+            with futures.ThreadPoolExecutor(8) as executor:
+                headers = list(executor.map(lambda _: provider.make_authorization_headers(), range(32)))
+
+        # Assert
+        self.assertEqual(1, self.server.token_requests)
+        self.assertEqual([{"Authorization": "Bearer fake-access-token-1"}] * 32, headers)
+        self.assertEqual("fake-access-token-1", provider.access_token)
+
+
+class JSONDecoderSpec(FakeServerSpec):
+    def test_every_decoder_returns_the_same_audio_analysis(self):
+        # Arrange
+        track_id = fake_server.make_id("track")
+        expected = self.make_spotify(json_decoder="json").track_audio_analysis(track_id)
+
+        for name in decoders.DECODERS:
+            sp = self.make_spotify(json_decoder=name)
+
+            # Act
+            analysis = sp.track_audio_analysis(track_id)
+
+            # Assert
+            self.assertEqual(expected, analysis, name)
+
+
+class PlaylistCacheSpec(FakeServerSpec):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cached = self.make_spotify(playlist_cache=cache.MemoryCache())
+
+    def test_unchanged_playlist_is_not_read_again(self):
+        # Arrange
+        playlist_id = fake_server.make_id("cached playlist")
+        first = self.cached.playlist_all_tracks(playlist_id)
+        self.server.reset_counters()
+
+        # Act
+        second = self.cached.playlist_all_tracks(playlist_id)
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertEqual({("GET", "playlists/{id}"): 1}, dict(self.server.requests))
+
+    def test_changed_playlist_is_read_again(self):
+        # Arrange
+        playlist_id = fake_server.make_id("changed playlist")
+        self.cached.playlist_all_tracks(playlist_id)
+        self.sp.playlist_add_tracks(playlist_id, [fake_server.make_id("new")])
+
+        # Act
+        items = self.cached.playlist_all_tracks(playlist_id)
+
+        # Assert
+        self.assertEqual(self.sp.fetch_all(self.sp.playlist_tracks, playlist_id), items)
+
+    def test_own_changes_against_the_cached_snapshot_update_the_cache(self):
+        # Arrange
+        playlist_id = fake_server.make_id("edited playlist")
+        items = self.cached.playlist_all_tracks(playlist_id)
+        snapshot_id = self.cached.playlist(playlist_id, fields="snapshot_id")["snapshot_id"]
+
+        # Act
+        snapshot_id = self.cached.playlist_reorder_tracks(
+            playlist_id, range_start=0, insert_before=20, range_length=2, snapshot_id=snapshot_id
+        )
+        snapshot_id = self.cached.playlist_remove_all_occurrences_of_tracks(
+            playlist_id, [items[100]["track"]["id"]], snapshot_id
+        )
+        track_ids = self.server.playlist_track_ids(playlist_id)
+        self.cached.playlist_remove_specific_occurrences_of_tracks(
+            playlist_id, [{"uri": track_ids[150], "positions": [150]}], snapshot_id
+        )
+        self.server.reset_counters()
+        cached_items = self.cached.playlist_all_tracks(playlist_id)
+
+        # Assert
+        self.assertEqual({("GET", "playlists/{id}"): 1}, dict(self.server.requests))
+        self.assertEqual(self.sp.fetch_all(self.sp.playlist_tracks, playlist_id), cached_items)
+
+    def test_added_tracks_remove_the_cached_tracks(self):
+        # Arrange
+        playlist_id = fake_server.make_id("added playlist")
+        self.cached.playlist_all_tracks(playlist_id)
+        self.sp.playlist_add_tracks(playlist_id, [fake_server.make_id("other client")])
+
+        # Act
+        self.cached.playlist_add_tracks(playlist_id, [fake_server.make_id("new")])
+        items = self.cached.playlist_all_tracks(playlist_id)
+
+        # Assert
+        self.assertEqual(252, len(items))
+        self.assertEqual(self.sp.fetch_all(self.sp.playlist_tracks, playlist_id), items)
+
+    def test_change_of_another_client_is_not_overwritten(self):
+        # Arrange
+        playlist_id = fake_server.make_id("shared playlist")
+        items = self.cached.playlist_all_tracks(playlist_id)
+        snapshot_id = self.cached.playlist(playlist_id, fields="snapshot_id")["snapshot_id"]
+        self.sp.playlist_add_tracks(playlist_id, [fake_server.make_id("other client")], position=0)
+
+        # Act
+        self.cached.playlist_remove_all_occurrences_of_tracks(playlist_id, [items[10]["track"]["id"]])
+        self.cached.playlist_reorder_tracks(playlist_id, range_start=0, insert_before=5, snapshot_id=snapshot_id)
+        cached_items = self.cached.playlist_all_tracks(playlist_id)
+
+        # Assert
+        self.assertEqual(self.sp.fetch_all(self.sp.playlist_tracks, playlist_id), cached_items)
+
+    def test_concurrent_removals_keep_the_cache_consistent(self):
+        # Arrange
+        playlist_id = fake_server.make_id("bulk removed playlist")
+        items = self.cached.playlist_all_tracks(playlist_id)
+        snapshot_id = self.cached.playlist(playlist_id, fields="snapshot_id")["snapshot_id"]
+        removed = [item["track"]["id"] for item in items[::2]]
+
+        # Act
+        playlists.remove_all_occurrences(self.cached, playlist_id, removed, snapshot_id, max_concurrency=2)
+        cached_items = self.cached.playlist_all_tracks(playlist_id)
+
+        # Assert
+        self.assertEqual(self.sp.fetch_all(self.sp.playlist_tracks, playlist_id), cached_items)
+        self.assertEqual(125, len(cached_items))
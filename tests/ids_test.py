@@ -0,0 +1,100 @@
+import unittest
+
+import fake_server
+from spotipy import ids
+
+
+class IdsSpec(unittest.TestCase):
+    def setUp(self) -> None:
+        self.track_id = fake_server.make_id("track")
+
+    def test_to_id_accepts_uris_urls_and_ids(self):
+        # Arrange
+        values = [
+            self.track_id,
+            "spotify:track:{}".format(self.track_id),
+            "https://open.spotify.com/track/{}?si=4f3a2b".format(self.track_id),
+            "https://open.spotify.com/track/{}/".format(self.track_id),
+        ]
+
+        # Act
+        result = [ids.to_id("track", value) for value in values]
+
+        # Assert
+        self.assertEqual([self.track_id] * 4, result)
+
+    def test_to_id_of_another_type_raises(self):
+        # Arrange
+        uri = "spotify:album:{}".format(self.track_id)
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            ids.to_id("track", uri)
+
+    def test_bytes_round_trip(self):
+        # Arrange
+        values = [self.track_id, ids.decode(0), ids.decode(256), ids.decode((1 << 128) - 1)]
+
+        # Act
+        result = [ids.from_bytes(ids.to_bytes(value)) for value in values]
+
+        # Assert
+        self.assertEqual(values, result)
+        self.assertEqual(16, len(ids.to_bytes(self.track_id)))
+
+    def test_find_invalid_ids(self):
+        # Arrange
+        too_large = "z" * 22
+        values = [self.track_id, "short", "a" * 21 + "!", too_large, ids.decode((1 << 128) - 1)]
+
+        # Act
+        invalid = ids.find_invalid_ids(values)
+
+        # Assert
+        self.assertEqual(["short", "a" * 21 + "!", too_large], invalid)
+
+    def test_encode_ids_matches_to_bytes(self):
+        # Arrange
+        values = [fake_server.make_id("track {}".format(i)) for i in range(100)]
+
+        # Act
+        data = ids.encode_ids(values)
+
+        # Assert
+        self.assertEqual(b"".join(ids.to_bytes(value) for value in values), data)
+        self.assertEqual(values, ids.decode_ids(data))
+
+    def test_normalize_ids_lists_the_invalid_ids(self):
+        # Arrange
+        values = ["spotify:track:{}".format(self.track_id), "not an id"]
+
+        # Act & Assert
+        with self.assertRaisesRegex(ValueError, "not an id"):
+            ids.normalize_ids(values, "track")
+
+    def test_id_set_membership(self):
+        # Arrange
+        values = [fake_server.make_id("track {}".format(i)) for i in range(1000)] + [ids.decode(256)]
+
+        # Act
+        id_set = ids.IdSet(values + values[:10], "track")
+
+        # Assert
+        self.assertEqual(1001, len(id_set))
+        self.assertEqual(1001 * 16, id_set.nbytes)
+        self.assertIn(values[500], id_set)
+        self.assertIn("spotify:track:{}".format(values[0]), id_set)
+        self.assertIn(ids.decode(256), id_set)
+        self.assertNotIn(fake_server.make_id("other"), id_set)
+        self.assertNotIn("invalid", id_set)
+        self.assertEqual(sorted(values), sorted(id_set))
+
+    def test_parse_returns_the_type_of_uris_and_urls(self):
+        # Arrange
+        values = ["spotify:album:{}".format(self.track_id), "open.spotify.com/artist/{}".format(self.track_id)]
+
+        # Act
+        result = [ids.parse(value) for value in values + [self.track_id]]
+
+        # Assert
+        self.assertEqual([("album", self.track_id), ("artist", self.track_id), (None, self.track_id)], result)
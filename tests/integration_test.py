@@ -1,8 +1,12 @@
+import os
+import tempfile
 import unittest
+from concurrent import futures
 from http import HTTPStatus
 
 import spotipy
 from spotipy import auth
+from spotipy import cache
 from spotipy import exceptions
 
 USER_ID = "thetufik"
@@ -30,6 +34,39 @@ class ErrorSpec(BaseSpec):
         self.assertEqual(HTTPStatus.NOT_FOUND, context.exception.status)
 
 
+class ETagCacheSpec(BaseSpec):
+    def test_revalidated_response_is_returned_from_cache(self):
+        # Arrange
+        etag_cache = cache.ETagCache()
+        sp = spotipy.Spotify(self.auth_provider, etag_cache=etag_cache)
+        playlist_id = "spotify:playlist:37i9dQZF1DXcBWIGoYBM5M"
+        first = sp.playlist(playlist_id, fields="name,snapshot_id")
+
+        # Act
+        second = sp.playlist(playlist_id, fields="name,snapshot_id")
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(1, len(etag_cache))
+
+
+class CatalogCacheSpec(BaseSpec):
+    def test_get_tracks_from_sqlite_cache(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            catalog_cache = cache.SQLiteCache(os.path.join(directory, "cache.db"))
+            sp = spotipy.Spotify(self.auth_provider, catalog_cache=catalog_cache)
+            track = sp.track("spotify:track:2M7FKrVr8intZRw0JZ5BKi")
+
+            # Act
+            tracks = sp.tracks(["spotify:track:2M7FKrVr8intZRw0JZ5BKi", "spotify:track:5abyhgQ3lokXEAWTYMBWJd"])
+            catalog_cache.close()
+
+        # Assert
+        self.assertEqual(track, tracks[0])
+        self.assertEqual("Eruption", tracks[1]["name"])
+
+
 class AlbumSpec(BaseSpec):
     def test_get_album(self):
         # Arrange
@@ -73,6 +110,18 @@ class AlbumSpec(BaseSpec):
         self.assertEqual(limit, next_tracks["offset"])
         self.assertEqual(expected_tracks["href"], next_tracks["href"])
 
+    def test_fetch_all_album_tracks(self):
+        # Arrange
+        album_id = "spotify:album:6IH6co1QUS7uXoyPDv0rIr"
+
+        # Act
+        tracks = self.sp.fetch_all(self.sp.album_tracks, album_id, page_size=5)
+
+        # Assert
+        self.assertEqual(12, len(tracks))
+        self.assertEqual("The Heat", tracks[0]["name"])
+        self.assertEqual(list(range(1, 13)), [track["track_number"] for track in tracks])
+
     def test_get_albums(self):
         # Arrange
         albums_id = ["spotify:album:6IH6co1QUS7uXoyPDv0rIr", "spotify:album:7GjVWG39IOj4viyWplJV4H"]
@@ -176,6 +225,42 @@ class TrackSpec(BaseSpec):
         self.assertEqual("Un-Reborn Again", tracks[0]["name"])
         self.assertEqual("Eruption", tracks[1]["name"])
 
+    def test_get_tracks_more_than_max_ids(self):
+        # Arrange
+        tracks_id = ["spotify:track:2M7FKrVr8intZRw0JZ5BKi", "spotify:track:5abyhgQ3lokXEAWTYMBWJd"] * 60
+
+        # Act
+        tracks = self.sp.tracks(tracks_id)
+
+        # Assert
+        self.assertEqual(len(tracks_id), len(tracks))
+        self.assertEqual("Un-Reborn Again", tracks[100]["name"])
+        self.assertEqual("Eruption", tracks[119]["name"])
+
+    def test_get_track_coalesced(self):
+        # Arrange
+        sp = spotipy.Spotify(self.auth_provider, coalesce_window=0.1)
+        tracks_id = ["spotify:track:2M7FKrVr8intZRw0JZ5BKi", "spotify:track:5abyhgQ3lokXEAWTYMBWJd"]
+
+        # Act
+        with futures.ThreadPoolExecutor(len(tracks_id)) as executor:
+            tracks = list(executor.map(sp.track, tracks_id))
+
+        # Assert
+        self.assertEqual("Un-Reborn Again", tracks[0]["name"])
+        self.assertEqual("Eruption", tracks[1]["name"])
+
+    def test_get_track_coalesced_raises_for_non_existing_track(self):
+        # Arrange
+        sp = spotipy.Spotify(self.auth_provider, coalesce_window=0.01)
+
+        # Act
+        with self.assertRaises(exceptions.SpotifyRequestError) as context:
+            sp.track("spotify:track:2M7FKrVr8intZRw0JZ5Bab")
+
+        # Assert
+        self.assertIn(context.exception.status, (HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND))
+
     def test_get_track_audio_analysis(self):
         # Arrange
         track_id = "spotify:track:5abyhgQ3lokXEAWTYMBWJd"
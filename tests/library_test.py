@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import library
+
+
+class LibraryMirrorSpec(unittest.TestCase):
+    def setUp(self) -> None:
+        # the saved items are changed by the tests, every test gets a new library
+        self.server = fake_server.FakeSpotifyServer(library_size=230).start()
+        self.addCleanup(self.server.stop)
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        self.sp.base_api_url = self.server.api_url
+        self.addCleanup(self.sp.close)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.mirror = library.LibraryMirror(os.path.join(directory.name, "library.db"))
+        self.addCleanup(self.mirror.close)
+
+    def test_first_sync_mirrors_the_library(self):
+        # Act
+        results = self.mirror.sync(self.sp, "user")
+
+        # Assert
+        self.assertEqual(library.SyncResult(230, 0, 5), results["track"])
+        self.assertEqual(self.server.saved_ids("track"), self.mirror.ids("user", "track"))
+        self.assertEqual(self.server.saved_ids("album"), self.mirror.ids("user", "album"))
+        self.assertEqual(self.sp.fetch_all(self.sp.current_user_saved_tracks), list(self.mirror.items("user", "track")))
+
+    def test_unchanged_library_takes_one_request(self):
+        # Arrange
+        self.mirror.sync(self.sp, "user", ["track"])
+        self.server.reset_counters()
+
+        # Act
+        result = self.mirror.sync_kind(self.sp, "user", "track")
+
+        # Assert
+        self.assertEqual(library.SyncResult(0, 0, 1), result)
+        self.assertEqual({("GET", "me/tracks"): 1}, dict(self.server.requests))
+
+    def test_sync_reads_only_the_new_pages(self):
+        # Arrange
+        self.mirror.sync(self.sp, "user", ["track"])
+        saved_ids = self.server.saved_ids("track")
+        new_ids = [fake_server.make_id("new {}".format(i)) for i in range(60)]
+        self.server.save_items("track", new_ids + [saved_ids[200]])
+        self.server.reset_counters()
+
+        # Act
+        result = self.mirror.sync_kind(self.sp, "user", "track")
+
+        # Assert
+        self.assertEqual(library.SyncResult(61, 0, 2), result)
+        self.assertEqual({("GET", "me/tracks"): 2}, dict(self.server.requests))
+        self.assertEqual(self.server.saved_ids("track"), self.mirror.ids("user", "track"))
+
+    def test_removals_are_found_with_contains(self):
+        # Arrange
+        self.mirror.sync(self.sp, "user", ["album"])
+        saved_ids = self.server.saved_ids("album")
+        self.server.remove_saved_items("album", [saved_ids[3], saved_ids[150]])
+        self.server.save_items("album", [fake_server.make_id("new album")])
+        self.server.reset_counters()
+
+        # Act
+        result = self.mirror.sync_kind(self.sp, "user", "album")
+
+        # Assert
+        self.assertEqual(library.SyncResult(1, 2, 13), result)
+        self.assertEqual(12, self.server.requests["GET", "me/albums/contains"])
+        self.assertEqual(self.server.saved_ids("album"), self.mirror.ids("user", "album"))
+
+    def test_check_removals_rotates_over_the_items(self):
+        # Arrange
+        self.mirror.sync(self.sp, "user", ["track"])
+        self.server.reset_counters()
+
+        # Act
+        for _ in range(5):
+            self.mirror.sync_kind(self.sp, "user", "track", check_removals=50)
+
+        # Assert
+        self.assertEqual(5, self.server.requests["GET", "me/tracks/contains"])
+        checked_at = self.mirror._connection().execute("SELECT COUNT(DISTINCT checked_at) FROM saved").fetchone()[0]
+        self.assertEqual(5, checked_at)
+
+    def test_users_are_mirrored_separately(self):
+        # Arrange
+        self.mirror.sync(self.sp, "user", ["track"])
+
+        # Act
+        self.server.save_items("track", [fake_server.make_id("other")])
+        self.mirror.sync(self.sp, "other user", ["track"])
+
+        # Assert
+        self.assertEqual(230, self.mirror.count("user", "track"))
+        self.assertEqual(231, self.mirror.count("other user", "track"))
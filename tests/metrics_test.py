@@ -0,0 +1,188 @@
+import unittest
+from http import HTTPStatus
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import exceptions
+from spotipy import metrics
+
+
+class RecordingHook(metrics.RequestHook):
+    def __init__(self):
+        self.requests = []
+        self.events = []
+
+    def before_request(self, method: str, endpoint: str):
+        self.requests.append((method, endpoint))
+
+    def after_response(self, event: metrics.RequestEvent):
+        self.events.append(event)
+
+
+class InterruptedAccessToken(auth.SpotifyAuthProvider):
+    def make_authorization_headers(self) -> dict:
+        raise KeyboardInterrupt
+
+
+class NormalizeEndpointSpec(unittest.TestCase):
+    def test_ids_are_replaced(self):
+        # Arrange
+        url = "https://api.spotify.com/v1/playlists/37i9dQZF1DXcBWIGoYBM5M/tracks?offset=100"
+
+        # Act
+        endpoint = metrics.normalize_endpoint(url)
+
+        # Assert
+        self.assertEqual("playlists/{id}/tracks", endpoint)
+
+    def test_paths_under_me_are_kept(self):
+        # Act
+        endpoint = metrics.normalize_endpoint("https://api.spotify.com/v1/me/tracks/contains?ids=a,b")
+
+        # Assert
+        self.assertEqual("me/tracks/contains", endpoint)
+
+    def test_every_id_of_a_path_is_replaced(self):
+        # Act
+        endpoint = metrics.normalize_endpoint("http://127.0.0.1:8080/v1/users/fake_user/playlists")
+
+        # Assert
+        self.assertEqual("users/{id}/playlists", endpoint)
+
+
+class LatencyHistogramSpec(unittest.TestCase):
+    def test_percentiles_are_within_a_bucket(self):
+        # Arrange
+        histogram = metrics.LatencyHistogram()
+
+        # Act
+        for milliseconds in range(1, 101):
+            histogram.add(milliseconds / 1000)
+
+        # Assert
+        self.assertEqual(100, len(histogram))
+        self.assertEqual(0.1, histogram.max)
+        for percent in (50, 95, 99):
+            self.assertGreaterEqual(histogram.percentile(percent), percent / 1000)
+            self.assertLessEqual(histogram.percentile(percent), percent / 1000 * 1.2)
+        self.assertEqual(0.1, histogram.percentile(100))
+
+    def test_empty_histogram_percentile_is_zero(self):
+        # Act
+        histogram = metrics.LatencyHistogram()
+
+        # Assert
+        self.assertEqual(0.0, histogram.percentile(50))
+
+    def test_latencies_above_the_last_bucket_return_the_max(self):
+        # Arrange
+        histogram = metrics.LatencyHistogram(max_latency=1)
+
+        # Act
+        histogram.add(5)
+
+        # Assert
+        self.assertEqual(5, histogram.percentile(50))
+
+
+class MetricsCollectorSpec(unittest.TestCase):
+    def test_events_are_aggregated_per_method_and_endpoint(self):
+        # Arrange
+        collector = metrics.MetricsCollector()
+        events = [
+            metrics.RequestEvent("GET", "tracks/{id}", 200, 0.01, 100, 0, False),
+            metrics.RequestEvent("GET", "tracks/{id}", 304, 0.02, 0, 1, True),
+            metrics.RequestEvent("GET", "tracks/{id}", 404, 0.03, 50, 0, False),
+            metrics.RequestEvent("GET", "tracks/{id}", None, 0.04, 0, 2, False),
+            metrics.RequestEvent("POST", "playlists/{id}/tracks", 201, 0.05, 30, 0, False),
+        ]
+
+        # Act
+        for event in events:
+            collector.after_response(event)
+        snapshot = collector.snapshot()
+
+        # Assert
+        self.assertEqual({("GET", "tracks/{id}"), ("POST", "playlists/{id}/tracks")}, set(snapshot))
+        stats = snapshot["GET", "tracks/{id}"]
+        self.assertEqual((4, 2, 1, 3, 150), stats[:5])
+        self.assertEqual(0.04, stats.max)
+        self.assertEqual(1, snapshot["POST", "playlists/{id}/tracks"].requests)
+
+    def test_reset_clears_the_endpoints(self):
+        # Arrange
+        collector = metrics.MetricsCollector()
+        collector.after_response(metrics.RequestEvent("GET", "tracks/{id}", 200, 0.01, 100, 0, False))
+
+        # Act
+        collector.reset()
+
+        # Assert
+        self.assertEqual({}, collector.snapshot())
+
+
+class RequestHookSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.reset_counters()
+        self.server.missing_ids.clear()
+        self.hook = RecordingHook()
+        self.sp = self.make_spotify(auth.PlainAccessToken("token"))
+
+    def make_spotify(self, auth_provider) -> spotipy.Spotify:
+        sp = spotipy.Spotify(auth_provider, hooks=[self.hook])
+        sp.base_api_url = self.server.api_url
+        self.addCleanup(sp.close)
+        return sp
+
+    def test_hooks_are_called_on_success(self):
+        # Act
+        self.sp.track(fake_server.make_id("track"))
+
+        # Assert
+        self.assertEqual([("GET", "tracks/{id}")], self.hook.requests)
+        event = self.hook.events[0]
+        self.assertEqual(("GET", "tracks/{id}", HTTPStatus.OK), event[:3])
+        self.assertGreater(event.response_bytes, 0)
+        self.assertEqual(0, event.retries)
+
+    def test_hooks_are_called_on_error(self):
+        # Arrange
+        self.server.missing_ids.add(fake_server.make_id("track"))
+
+        # Act
+        with self.assertRaises(exceptions.SpotifyRequestError):
+            self.sp.track(fake_server.make_id("track"))
+
+        # Assert
+        self.assertEqual(HTTPStatus.NOT_FOUND, self.hook.events[0].status)
+
+    def test_retries_are_counted(self):
+        # Arrange
+        self.server.fail(2, HTTPStatus.SERVICE_UNAVAILABLE, retry_after=0)
+
+        # Act
+        self.sp.track(fake_server.make_id("track"))
+
+        # Assert
+        self.assertEqual(1, len(self.hook.events))
+        self.assertEqual((HTTPStatus.OK, 2), (self.hook.events[0].status, self.hook.events[0].retries))
+
+    def test_interrupted_request_is_reported_without_status(self):
+        # Arrange
+        sp = self.make_spotify(InterruptedAccessToken())
+
+        # Act
+        with self.assertRaises(KeyboardInterrupt):
+            sp.track(fake_server.make_id("track"))
+
+        # Assert
+        self.assertEqual([None], [event.status for event in self.hook.events])
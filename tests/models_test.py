@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+
+import fake_server
+from spotipy import models
+
+
+class ModelsSpec(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fixtures = fake_server.Fixtures("http://localhost/v1/")
+
+    def test_track_to_dict_returns_the_original_object(self):
+        # Arrange
+        track = self.fixtures.track(fake_server.make_id("track"))
+
+        # Act
+        model = models.Track.from_dict(track)
+
+        # Assert
+        self.assertEqual(track, model.to_dict())
+
+    def test_nested_album_is_built_on_first_access(self):
+        # Arrange
+        track = self.fixtures.track(fake_server.make_id("track"))
+        model = models.Track.from_dict(track)
+
+        # Act
+        album = model.album
+
+        # Assert
+        self.assertIsInstance(album, models.Album)
+        self.assertEqual(track["album"]["id"], album.id)
+        self.assertIs(album, model.album)
+
+    def test_available_markets_are_shared_between_tracks(self):
+        # Arrange
+        first = self.fixtures.track(fake_server.make_id("first"))
+        second = self.fixtures.track(fake_server.make_id("second"))
+
+        # Act
+        first_model = models.Track.from_dict(dict(first, available_markets=list(first["available_markets"])))
+        second_model = models.Track.from_dict(dict(second, available_markets=list(second["available_markets"])))
+
+        # Assert
+        self.assertIs(first_model.available_markets, second_model.available_markets)
+
+    def test_shared_tuples_are_bounded(self):
+        # Arrange
+        genres = [["genre {}".format(i)] for i in range(20)]
+
+        # Act
+        with mock.patch.object(models, "_MAX_SHARED_TUPLES", 10):
+            artists = [models.Artist.from_dict({"genres": list(item)}) for item in genres + genres[-5:]]
+
+        # Assert
+        self.assertLessEqual(len(models._shared_tuples), 10)
+        self.assertIs(artists[15].genres, artists[20].genres)
+        self.assertEqual(tuple(genres[0]), artists[0].genres)
+
+    def test_paging_items_are_models(self):
+        # Arrange
+        page = self.fixtures.playlist_tracks(fake_server.make_id("playlist"), 100, 0)
+
+        # Act
+        model = models.Paging.from_dict(page, models.PlaylistTrack)
+
+        # Assert
+        self.assertEqual(100, len(model.items))
+        self.assertEqual(page["items"][0]["track"]["id"], model.items[0].track.id)
+        self.assertEqual(page, model.to_dict())
@@ -0,0 +1,263 @@
+import os
+import tempfile
+import unittest
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import playlists
+
+
+def _apply(tracks: list, operations: list) -> list:
+    """ Applies the operations like the API does
+    """
+    tracks = list(tracks)
+    for operation in operations:
+        if isinstance(operation, playlists.Remove):
+            positions = {position for track in operation.tracks for position in track["positions"]}
+            tracks = [uri for i, uri in enumerate(tracks) if i not in positions]
+        elif isinstance(operation, playlists.Move):
+            playlists._move(tracks, operation)
+        elif isinstance(operation, playlists.Add):
+            position = len(tracks) if operation.position is None else operation.position
+            tracks[position:position] = operation.uris
+        else:
+            tracks = list(operation.uris)
+    return tracks
+
+
+class PlanSyncSpec(unittest.TestCase):
+    def setUp(self) -> None:
+        self.current = ["spotify:track:{}".format(fake_server.make_id("track {}".format(i))) for i in range(1000)]
+
+    def test_small_edit_of_a_large_playlist(self):
+        # Arrange
+        desired = list(self.current)
+        del desired[500:503]
+        desired.insert(2, "spotify:track:{}".format(fake_server.make_id("new")))
+        desired.append(desired.pop(10))
+
+        # Act
+        operations = playlists.plan_sync(self.current, desired)
+
+        # Assert
+        self.assertEqual([playlists.Remove, playlists.Move, playlists.Add], [type(op) for op in operations])
+        self.assertEqual(desired, _apply(self.current, operations))
+
+    def test_duplicates(self):
+        # Arrange
+        current = ["a", "b", "a", "c", "a"]
+        desired = ["a", "c", "a", "b", "b"]
+
+        # Act
+        operations = playlists.plan_sync(current, desired)
+
+        # Assert
+        self.assertEqual(desired, _apply(current, operations))
+
+    def test_difflib_fallback(self):
+        # Arrange
+        desired = self.current[::2] + self.current[1::2]
+
+        # Act
+        operations = playlists.plan_sync(self.current, desired, max_distance=10)
+
+        # Assert
+        self.assertEqual(desired, _apply(self.current, operations))
+
+    def test_rewrite_when_it_takes_fewer_requests(self):
+        # Arrange
+        desired = list(reversed(self.current))
+
+        # Act
+        operations = playlists.plan_sync(self.current, desired)
+
+        # Assert
+        self.assertIsInstance(operations[0], playlists.Replace)
+        self.assertEqual(10, len(operations))
+        self.assertEqual(desired, _apply(self.current, operations))
+
+
+    def test_playlist_with_pinned_items_is_not_rewritten(self):
+        # Arrange
+        current = self.current[:20]
+        current[3:3] = [None, "spotify:local:artist:album:title:180"]
+        desired = playlists._pin(current, list(reversed(self.current[:20])))
+
+        # Act
+        operations = playlists.plan_sync(current, desired)
+
+        # Assert
+        self.assertNotIn(playlists.Replace, [type(op) for op in operations])
+        self.assertEqual(desired, _apply(current, operations))
+
+
+class SyncPlaylistSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer(playlist_size=1000).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        self.sp.base_api_url = self.server.api_url
+        self.server.reset_counters()
+
+    def test_sync_writes_only_the_differences(self):
+        # Arrange
+        playlist_id = fake_server.make_id("sync")
+        desired = self.server.fixtures.playlist_track_ids(playlist_id)[:-1]
+        desired.insert(100, fake_server.make_id("new"))
+        desired.insert(0, desired.pop(700))
+
+        # Act
+        result = playlists.sync_playlist(self.sp, playlist_id, desired)
+
+        # Assert
+        self.assertEqual(desired, self.server.playlist_track_ids(playlist_id))
+        self.assertEqual(result.snapshot_id, self.sp.playlist(playlist_id)["snapshot_id"])
+        self.assertEqual(1, self.server.requests["DELETE", "playlists/{id}/tracks"])
+        self.assertEqual(1, self.server.requests["PUT", "playlists/{id}/tracks"])
+        self.assertEqual(1, self.server.requests["POST", "playlists/{id}/tracks"])
+
+    def test_sync_keeps_the_unavailable_and_local_items(self):
+        # Arrange
+        playlist_id = fake_server.make_id("pinned")
+        track_ids = self.server.fixtures.playlist_track_ids(playlist_id)[:20]
+        local_uri = "spotify:local:artist:album:title:180"
+        self.server.set_playlist(playlist_id, track_ids[:3] + [None] + track_ids[3:10] + [local_uri] + track_ids[10:])
+        desired = list(reversed(track_ids))
+
+        # Act
+        playlists.sync_playlist(self.sp, playlist_id, desired)
+
+        # Assert
+        expected = desired[:3] + [None] + desired[3:10] + [local_uri] + desired[10:]
+        self.assertEqual(expected, self.server.playlist_track_ids(playlist_id))
+
+    def test_sync_of_a_synced_playlist_writes_nothing(self):
+        # Arrange
+        playlist_id = fake_server.make_id("synced")
+        desired = self.server.fixtures.playlist_track_ids(playlist_id)
+
+        # Act
+        result = playlists.sync_playlist(self.sp, playlist_id, desired)
+
+        # Assert
+        self.assertEqual([], result.operations)
+        self.assertEqual({"GET"}, {method for method, _ in self.server.requests})
+
+
+class BulkWriteSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer(playlist_size=300).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        self.sp.base_api_url = self.server.api_url
+        self.server.reset_counters()
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, "checkpoint.json")
+        self.new_ids = [fake_server.make_id("new {}".format(i)) for i in range(250)]
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _interrupt_add_tracks(self, playlist_id: str):
+        """ Runs add_tracks with the checkpoint and interrupts it after the first chunk
+        """
+        playlist_add_tracks = self.sp.playlist_add_tracks
+
+        def interrupted(*args, **kwargs):
+            if self.server.requests["POST", "playlists/{id}/tracks"] == 1:
+                raise KeyboardInterrupt()
+            return playlist_add_tracks(*args, **kwargs)
+
+        self.sp.playlist_add_tracks = interrupted
+        with self.assertRaises(KeyboardInterrupt):
+            playlists.add_tracks(self.sp, playlist_id, self.new_ids, checkpoint=self.checkpoint)
+        del self.sp.playlist_add_tracks
+
+    def test_add_tracks_in_chunks_at_a_position(self):
+        # Arrange
+        playlist_id = fake_server.make_id("bulk add")
+        expected = self.server.playlist_track_ids(playlist_id)
+        expected[10:10] = self.new_ids
+
+        # Act
+        snapshot_id = playlists.add_tracks(self.sp, playlist_id, self.new_ids, position=10)
+
+        # Assert
+        self.assertEqual(expected, self.server.playlist_track_ids(playlist_id))
+        self.assertEqual(snapshot_id, self.sp.playlist(playlist_id)["snapshot_id"])
+        self.assertEqual(3, self.server.requests["POST", "playlists/{id}/tracks"])
+
+    def test_replace_tracks(self):
+        # Arrange
+        playlist_id = fake_server.make_id("bulk replace")
+
+        # Act
+        playlists.replace_tracks(self.sp, playlist_id, self.new_ids)
+
+        # Assert
+        self.assertEqual(self.new_ids, self.server.playlist_track_ids(playlist_id))
+        self.assertEqual(1, self.server.requests["PUT", "playlists/{id}/tracks"])
+        self.assertEqual(2, self.server.requests["POST", "playlists/{id}/tracks"])
+
+    def test_remove_all_occurrences_concurrently(self):
+        # Arrange
+        playlist_id = fake_server.make_id("bulk remove all")
+        track_ids = self.server.playlist_track_ids(playlist_id)
+
+        # Act
+        snapshot_id = playlists.remove_all_occurrences(self.sp, playlist_id, track_ids[:150] + track_ids[:10])
+
+        # Assert
+        self.assertEqual(track_ids[150:], self.server.playlist_track_ids(playlist_id))
+        self.assertEqual(snapshot_id, self.sp.playlist(playlist_id)["snapshot_id"])
+        self.assertEqual(2, self.server.requests["DELETE", "playlists/{id}/tracks"])
+
+    def test_remove_specific_occurrences(self):
+        # Arrange
+        playlist_id = fake_server.make_id("bulk remove specific")
+        track_ids = self.server.playlist_track_ids(playlist_id)
+        tracks = [{"uri": track_id, "positions": [i]} for i, track_id in enumerate(track_ids) if i % 2 == 0]
+
+        # Act
+        playlists.remove_specific_occurrences(self.sp, playlist_id, tracks)
+
+        # Assert
+        self.assertEqual(track_ids[1::2], self.server.playlist_track_ids(playlist_id))
+        self.assertEqual(2, self.server.requests["DELETE", "playlists/{id}/tracks"])
+
+    def test_interrupted_write_resumes_after_the_last_applied_chunk(self):
+        # Arrange
+        playlist_id = fake_server.make_id("bulk resume")
+        expected = self.server.playlist_track_ids(playlist_id) + self.new_ids
+        self._interrupt_add_tracks(playlist_id)
+
+        # Act
+        playlists.add_tracks(self.sp, playlist_id, self.new_ids, checkpoint=self.checkpoint)
+
+        # Assert
+        self.assertEqual(expected, self.server.playlist_track_ids(playlist_id))
+        self.assertEqual(3, self.server.requests["POST", "playlists/{id}/tracks"])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume_fails_if_the_playlist_changed(self):
+        # Arrange
+        playlist_id = fake_server.make_id("bulk changed")
+        self._interrupt_add_tracks(playlist_id)
+        self.sp.playlist_add_tracks(playlist_id, self.new_ids[:1])
+
+        # Act & Assert
+        with self.assertRaises(spotipy.SpotifyError):
+            playlists.add_tracks(self.sp, playlist_id, self.new_ids, checkpoint=self.checkpoint)
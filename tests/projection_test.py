@@ -0,0 +1,96 @@
+import unittest
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import exceptions
+from spotipy import models
+from spotipy import projection
+
+
+class ProjectionSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        self.sp.base_api_url = self.server.api_url
+        self.playlist_id = fake_server.make_id("playlist")
+
+    def test_compile_paths(self):
+        # Arrange
+        paths = ["name", "tracks.total", "tracks.items.added_at", "tracks.items.track.id", "owner", "owner.id"]
+
+        # Act
+        result = projection.Projection(paths)
+
+        # Assert
+        self.assertEqual("name,tracks(total,items(added_at,track.id)),owner", result.expression)
+
+    def test_page_of_a_model(self):
+        # Arrange
+        model = models.PlaylistTrack
+
+        # Act
+        result = projection.Projection.page(model)
+
+        # Assert
+        self.assertTrue(result.expression.startswith("items(added_at,added_by,is_local,track(id,name,"))
+        self.assertIn("album(id,", result.expression)
+        self.assertTrue(result.expression.endswith("),href,limit,offset,total,next,previous"))
+
+    def test_iter_all_with_projection(self):
+        # Arrange
+        fields = projection.Projection.page(["added_at", "track.id"])
+
+        # Act
+        items = self.sp.fetch_all(self.sp.playlist_tracks, self.playlist_id, fields=fields)
+
+        # Assert
+        expected = [
+            {"added_at": item["added_at"], "track": {"id": item["track"]["id"]}}
+            for item in self.sp.fetch_all(self.sp.playlist_tracks, self.playlist_id)
+        ]
+        self.assertEqual(expected, items)
+
+    def test_playlist_with_projection(self):
+        # Arrange
+        fields = projection.Projection(["snapshot_id", "tracks.total"])
+
+        # Act
+        playlist = self.sp.playlist(self.playlist_id, fields=fields)
+
+        # Assert
+        self.assertEqual({"snapshot_id", "tracks"}, set(playlist))
+        self.assertEqual({"total": 250}, playlist["tracks"])
+
+    def test_validate_reports_unexpected_and_missing_keys(self):
+        # Arrange
+        fields = projection.Projection.page(["added_at", "track.id", "track.unknown"])
+        page = self.sp.playlist_tracks(
+            self.playlist_id, fields="items(added_at,added_by.id),href,limit,offset,total,next,previous"
+        )
+
+        # Act
+        with self.assertRaises(exceptions.ProjectionError) as context:
+            fields.validate(page)
+
+        # Assert
+        self.assertEqual(["unexpected items.added_by", "missing items.track"], context.exception.errors)
+
+    def test_none_values_are_accepted(self):
+        # Arrange
+        fields = projection.Projection.page(["added_at", "track.id"])
+        page = {name: None for name in projection.PAGING_FIELDS}
+        page["items"] = [{"added_at": "2020-01-01T00:00:00Z", "track": None}]
+
+        # Act
+        result = fields.validate(page)
+
+        # Assert
+        self.assertIs(page, result)
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from urllib3.util import retry
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import exceptions
+from spotipy import rate_limit
+from spotipy import transport
+
+
+class RateLimiterSpec(unittest.TestCase):
+    def test_burst_is_available_at_once(self):
+        # Arrange
+        limiter = rate_limit.RateLimiter(rate=10, burst=3)
+
+        # Act
+        acquired = [limiter.try_acquire() for _ in range(4)]
+
+        # Assert
+        self.assertEqual([True, True, True, False], acquired)
+
+    def test_waiting_callers_are_served_at_the_rate(self):
+        # Arrange
+        limiter = rate_limit.RateLimiter(rate=20, burst=1)
+        acquired_at = []
+
+        def acquire():
+            limiter.acquire()
+            acquired_at.append(time.monotonic())
+
+        threads = [threading.Thread(target=acquire) for _ in range(5)]
+        started_at = time.monotonic()
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        acquired_at.sort()
+        self.assertAlmostEqual(0.2, acquired_at[-1] - started_at, delta=0.1)
+        self.assertTrue(all(b - a >= 0.04 for a, b in zip(acquired_at, acquired_at[1:])))
+
+    def test_acquire_gives_up_without_taking_a_token(self):
+        # Arrange
+        limiter = rate_limit.RateLimiter(rate=10, burst=1)
+        limiter.acquire()
+
+        # Act
+        not_blocking = limiter.acquire(blocking=False)
+        timed_out = limiter.acquire(timeout=0.01)
+        started_at = time.monotonic()
+        acquired = limiter.acquire(timeout=0.5)
+
+        # Assert
+        self.assertFalse(not_blocking)
+        self.assertFalse(timed_out)
+        self.assertTrue(acquired)
+        self.assertLess(time.monotonic() - started_at, 0.15)
+
+    def test_acquire_async_waits_for_the_rate(self):
+        # Arrange
+        limiter = rate_limit.RateLimiter(rate=20, burst=1)
+
+        async def acquire_all():
+            return await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+
+        started_at = time.monotonic()
+
+        # Act
+        acquired = asyncio.run(acquire_all())
+
+        # Assert
+        self.assertEqual([True] * 5, acquired)
+        self.assertAlmostEqual(0.2, time.monotonic() - started_at, delta=0.1)
+
+    def test_pause_stops_every_caller(self):
+        # Arrange
+        limiter = rate_limit.RateLimiter(rate=100, burst=10)
+        started_at = time.monotonic()
+
+        # Act
+        limiter.pause(0.2)
+
+        # Assert
+        self.assertFalse(limiter.try_acquire())
+        self.assertGreater(limiter.paused_for, 0)
+        self.assertTrue(limiter.acquire())
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.2)
+
+
+class RateLimitedSpotifySpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.reset_counters()
+        self.limiter = rate_limit.RateLimiter(rate=100)
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"), rate_limiter=self.limiter)
+        self.sp.base_api_url = self.server.api_url
+        self.addCleanup(self.sp.close)
+
+    def test_too_many_requests_pauses_and_retries(self):
+        # Arrange
+        self.server.rate_limit(1, retry_after=1)
+        started_at = time.monotonic()
+
+        # Act
+        track = self.sp.track(fake_server.make_id("track"))
+
+        # Assert
+        self.assertEqual(fake_server.make_id("track"), track["id"])
+        self.assertEqual(2, self.server.requests["GET", "tracks/{id}"])
+        self.assertGreaterEqual(time.monotonic() - started_at, 1)
+
+    def test_too_many_requests_after_the_retries_are_raised(self):
+        # Arrange
+        self.sp.max_retries = 1
+        self.server.rate_limit(2, retry_after=0)
+
+        # Act
+        with self.assertRaises(exceptions.RateLimitReached):
+            self.sp.track(fake_server.make_id("track"))
+
+        # Assert
+        self.assertEqual(2, self.server.requests["GET", "tracks/{id}"])
+
+    def test_transport_which_retries_too_many_requests_is_refused(self):
+        # Arrange
+        shared_transport = transport.Transport(max_retries=retry.Retry(3))
+        self.addCleanup(shared_transport.session.close)
+
+        # Act
+        with self.assertRaises(ValueError):
+            spotipy.Spotify(auth.PlainAccessToken("token"), transport=shared_transport, rate_limiter=self.limiter)
+
+    def test_too_many_requests_are_retried_by_the_client_with_a_transport(self):
+        # Arrange
+        shared_transport = transport.Transport()
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"), transport=shared_transport, rate_limiter=self.limiter)
+        sp.base_api_url = self.server.api_url
+        self.addCleanup(sp.close)
+        self.server.rate_limit(1, retry_after=0)
+
+        # Act
+        track = sp.track(fake_server.make_id("track"))
+
+        # Assert
+        self.assertEqual(fake_server.make_id("track"), track["id"])
+        self.assertEqual(2, self.server.requests["GET", "tracks/{id}"])
@@ -0,0 +1,86 @@
+import unittest
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import resolver
+
+
+class ResolverSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.sp = spotipy.Spotify(auth.PlainAccessToken("token"))
+        self.sp.base_api_url = self.server.api_url
+        self.server.reset_counters()
+        self.server.missing_ids.clear()
+
+    def test_classify_mixed_links(self):
+        # Arrange
+        track_id = fake_server.make_id("track")
+        album_id = fake_server.make_id("album")
+        values = [
+            "spotify:track:{}".format(track_id),
+            "https://open.spotify.com/album/{}?si=4f3a2b".format(album_id),
+            track_id,
+            "spotify:user:someone",
+            "spotify:track:invalid",
+            "spotify:episode:{}".format(track_id),
+        ]
+
+        # Act
+        links = resolver.classify(values)
+
+        # Assert
+        expected = [
+            resolver.Link("track", track_id),
+            resolver.Link("album", album_id),
+            resolver.Link("track", track_id),
+            resolver.Link("user", "someone"),
+            None,
+            None,
+        ]
+        self.assertEqual(expected, [links[value] for value in values])
+
+    def test_resolve_groups_the_ids_into_batch_requests(self):
+        # Arrange
+        track_ids = [fake_server.make_id("track {}".format(i)) for i in range(120)]
+        album_ids = [fake_server.make_id("album {}".format(i)) for i in range(30)]
+        playlist_id = fake_server.make_id("playlist")
+        values = (
+            ["spotify:track:{}".format(track_id) for track_id in track_ids[:80]]
+            + ["https://open.spotify.com/track/{}".format(track_id) for track_id in track_ids[40:]]
+            + ["spotify:album:{}".format(album_id) for album_id in album_ids]
+            + ["spotify:playlist:{}".format(playlist_id), "spotify:user:someone"]
+        )
+
+        # Act
+        result = resolver.resolve(self.sp, values)
+
+        # Assert
+        self.assertEqual(set(values), set(result))
+        self.assertEqual(track_ids[50], result["https://open.spotify.com/track/{}".format(track_ids[50])]["id"])
+        self.assertEqual(playlist_id, result["spotify:playlist:{}".format(playlist_id)]["id"])
+        self.assertEqual(3, self.server.requests["GET", "tracks"])
+        self.assertEqual(2, self.server.requests["GET", "albums"])
+        self.assertEqual(1, self.server.requests["GET", "playlists/{id}"])
+        self.assertEqual(1, self.server.requests["GET", "users/{id}"])
+
+    def test_resolve_not_found_and_invalid_links_are_none(self):
+        # Arrange
+        track_id = fake_server.make_id("missing track")
+        playlist_id = fake_server.make_id("missing playlist")
+        self.server.missing_ids.update([track_id, playlist_id])
+        values = ["spotify:track:{}".format(track_id), "spotify:playlist:{}".format(playlist_id), "not a link:x"]
+
+        # Act
+        result = resolver.resolve(self.sp, values)
+
+        # Assert
+        self.assertEqual(dict.fromkeys(values), result)
@@ -0,0 +1,79 @@
+import threading
+import unittest
+from concurrent import futures
+
+import fake_server
+import spotipy
+from spotipy import auth
+from spotipy import transport
+
+
+class TransportSpec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = fake_server.FakeSpotifyServer().start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.latency = 0
+
+    def make_spotify(self, **kwargs) -> spotipy.Spotify:
+        sp = spotipy.Spotify(auth.PlainAccessToken("token"), **kwargs)
+        sp.base_api_url = self.server.api_url
+        self.addCleanup(sp.close)
+        return sp
+
+    def test_max_workers_default_to_the_pool_size(self):
+        # Act
+        sp = self.make_spotify(transport=transport.Transport(pool_maxsize=7))
+
+        # Assert
+        self.assertEqual(7, sp.transport.pool_maxsize)
+        self.assertEqual(7, sp.max_workers)
+
+    def test_sequential_requests_reuse_one_connection(self):
+        # Arrange
+        sp = self.make_spotify(transport=transport.Transport())
+
+        # Act
+        for i in range(5):
+            sp.user("user {}".format(i))
+
+        # Assert
+        self.assertEqual(transport.PoolStats(0, 1, 1, 0), sp.transport.pool_stats())
+
+    def test_connections_beyond_the_pool_size_are_discarded(self):
+        # Arrange
+        self.server.latency = 0.1
+        sp = self.make_spotify(transport=transport.Transport(pool_maxsize=2))
+        barrier = threading.Barrier(6)
+
+        def get_user(i):
+            barrier.wait()
+            sp.user("user {}".format(i))
+
+        threads = [threading.Thread(target=get_user, args=(i,)) for i in range(6)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(transport.PoolStats(0, 6, 6, 4), sp.transport.pool_stats())
+
+    def test_blocking_pool_waits_for_a_connection(self):
+        # Arrange
+        self.server.latency = 0.05
+        sp = self.make_spotify(transport=transport.Transport(pool_maxsize=2, pool_block=True))
+
+        # Act
+        with futures.ThreadPoolExecutor(6) as executor:
+            list(executor.map(sp.user, ["user {}".format(i) for i in range(6)]))
+
+        # Assert
+        self.assertEqual(transport.PoolStats(0, 2, 2, 0), sp.transport.pool_stats())